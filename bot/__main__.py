@@ -1,7 +1,6 @@
 import asyncio
 import logging
 
-import aiohttp
 import discord
 from async_rediscache import RedisSession
 from botcore import StartupError
@@ -12,6 +11,7 @@ import bot
 from bot import constants
 from bot.bot import Bot
 from bot.utils.decorators import whitelist_check
+from bot.utils.http_client import HostLimiter, create_http_session
 
 log = logging.getLogger(__name__)
 
@@ -22,7 +22,7 @@ async def _create_redis_session() -> RedisSession:
         host=constants.RedisConfig.host,
         port=constants.RedisConfig.port,
         password=constants.RedisConfig.password,
-        max_connections=20,
+        max_connections=constants.RedisConfig.max_connections,
         use_fakeredis=constants.RedisConfig.use_fakeredis,
         global_namespace="bot",
         decode_responses=True,
@@ -60,10 +60,12 @@ async def main() -> None:
     intents.typing = False
     intents.webhooks = False
 
-    async with aiohttp.ClientSession() as session:
+    host_limiter = HostLimiter(constants.HTTPClient.host_limits)
+    async with create_http_session(host_limiter) as session:
         bot.instance = Bot(
             guild_id=constants.Client.guild,
             http_session=session,
+            host_limiter=host_limiter,
             redis_session=await _create_redis_session(),
             command_prefix=commands.when_mentioned_or(constants.Client.prefix),
             activity=discord.Game(name=f"Commands: {constants.Client.prefix}help"),
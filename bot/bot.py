@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from typing import Optional
+from typing import Any, Callable, Coroutine, Optional
 
 import discord
 from botcore import BotBase
@@ -8,6 +9,11 @@ from discord import DiscordException, Embed
 from discord.ext import commands
 
 from bot import constants, exts
+from bot.utils.http_cache import ResponseCache
+from bot.utils.http_client import HostLimiter
+from bot.utils.listener_filters import ListenerStats
+from bot.utils.ui_updates import UIUpdateScheduler
+from bot.utils.waiters import WaiterRegistry
 
 log = logging.getLogger(__name__)
 
@@ -21,10 +27,32 @@ class Bot(BotBase):
     While in debug mode, the asset upload methods (avatar, banner, ...) will not
     perform the upload, and will instead only log the passed download urls and pretend
     that the upload was successful. See the `mock_in_debug` decorator for further details.
+
+    Cogs can make cached GET requests through `http_cache`, which wraps `http_session`.
+    Requests to slow hosts made with `http_session` are throttled by `host_limiter`, if one is given.
+    Games and paginators should wait for messages and reactions through `waiters` rather than `wait_for`,
+    and update their messages through `ui_updates`.
+    Listeners decorated with `listener_filter` aren't scheduled at all for events their filter rejects.
+    An `extensions_changed` event is dispatched whenever an extension is loaded, unloaded or reloaded.
     """
 
     name = constants.Client.name
 
+    def __init__(self, *args, host_limiter: Optional[HostLimiter] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.host_limiter = host_limiter
+        self.waiters = WaiterRegistry(self)
+        self.ui_updates = UIUpdateScheduler()
+        self.listener_stats = ListenerStats()
+
+        self.http_cache = ResponseCache(
+            self.http_session,
+            max_bytes=constants.HTTPCache.max_bytes,
+            default_ttl=constants.HTTPCache.default_ttl,
+            redis_session=self.redis_session if constants.HTTPCache.use_redis else None,
+        )
+
     @property
     def member(self) -> Optional[discord.Member]:
         """Retrieves the guild member object for the bot."""
@@ -33,6 +61,37 @@ class Bot(BotBase):
             return None
         return guild.me
 
+    def _schedule_event(
+        self,
+        coro: Callable[..., Coroutine[Any, Any, Any]],
+        event_name: str,
+        *args: Any,
+        **kwargs: Any
+    ) -> Optional[asyncio.Task]:
+        """Schedule a listener for an event, unless the listener has a filter which rejects the event."""
+        listener_filter = getattr(coro, "__listener_filter__", None)
+        skipped = listener_filter is not None and not listener_filter.allows(event_name, args)
+        self.listener_stats.record(getattr(coro, "__qualname__", event_name), skipped)
+
+        if skipped:
+            return None
+        return super()._schedule_event(coro, event_name, *args, **kwargs)
+
+    async def load_extension(self, name: str, *, package: Optional[str] = None) -> None:
+        """Load an extension, then dispatch `extensions_changed`."""
+        await super().load_extension(name, package=package)
+        self.dispatch("extensions_changed")
+
+    async def unload_extension(self, name: str, *, package: Optional[str] = None) -> None:
+        """Unload an extension, then dispatch `extensions_changed`."""
+        await super().unload_extension(name, package=package)
+        self.dispatch("extensions_changed")
+
+    async def reload_extension(self, name: str, *, package: Optional[str] = None) -> None:
+        """Reload an extension, then dispatch `extensions_changed`."""
+        await super().reload_extension(name, package=package)
+        self.dispatch("extensions_changed")
+
     async def on_command_error(self, context: commands.Context, exception: DiscordException) -> None:
         """Check command errors for UserInputError and reset the cooldown if thrown."""
         if isinstance(exception, commands.UserInputError):
@@ -4,11 +4,14 @@ from os import environ
 from typing import NamedTuple
 
 __all__ = (
+    "AvatarEffects",
     "Branding",
     "Cats",
     "Channels",
     "Categories",
     "Client",
+    "HTTPClient",
+    "HTTPCache",
     "Logging",
     "Colours",
     "Emojis",
@@ -36,6 +39,16 @@ log = logging.getLogger(__name__)
 PYTHON_PREFIX = "!"
 
 
+class AvatarEffects(NamedTuple):
+    executor_backend = environ.get("AVATAR_EXECUTOR_BACKEND", "thread")  # "thread" or "process"
+    executor_workers = int(environ.get("AVATAR_EXECUTOR_WORKERS", 10))
+    # How many effects may wait for a free worker, and for how long a request waits once that is full
+    executor_queue_size = int(environ.get("AVATAR_EXECUTOR_QUEUE_SIZE", 20))
+    executor_queue_timeout = float(environ.get("AVATAR_EXECUTOR_QUEUE_TIMEOUT", 5))
+    render_cache_bytes = int(environ.get("AVATAR_RENDER_CACHE_BYTES", 64 * 1024 * 1024))
+    render_cache_redis_ttl = int(environ.get("AVATAR_RENDER_CACHE_REDIS_TTL", 0))  # 0 disables the Redis tier
+
+
 class Branding:
     cycle_frequency = int(environ.get("CYCLE_FREQUENCY", 3))  # 0: never, 1: every day, 2: every other day, ...
 
@@ -87,6 +100,27 @@ class Client(NamedTuple):
     month_override = int(environ["MONTH_OVERRIDE"]) if "MONTH_OVERRIDE" in environ else None
 
 
+class HTTPClient(NamedTuple):
+    limit = int(environ.get("HTTP_CONNECTION_LIMIT", 100))
+    limit_per_host = int(environ.get("HTTP_CONNECTION_LIMIT_PER_HOST", 10))
+    keepalive_timeout = float(environ.get("HTTP_KEEPALIVE_TIMEOUT", 30))
+    dns_cache_ttl = int(environ.get("HTTP_DNS_CACHE_TTL", 5 * 60))
+    total_timeout = float(environ.get("HTTP_TOTAL_TIMEOUT", 30))
+    connect_timeout = float(environ.get("HTTP_CONNECT_TIMEOUT", 10))
+    # Slow APIs, with how many requests each may have in flight at once so they can't starve the pool
+    host_limits = {
+        "api.wolframalpha.com": 4,
+        "api.igdb.com": 4,
+        "id.twitch.tv": 2,
+    }
+
+
+class HTTPCache(NamedTuple):
+    max_bytes = int(environ.get("HTTP_CACHE_BYTES", 32 * 1024 * 1024))
+    default_ttl = float(environ.get("HTTP_CACHE_DEFAULT_TTL", 5 * 60))
+    use_redis = environ.get("HTTP_CACHE_USE_REDIS", "false").lower() == "true"
+
+
 class Logging(NamedTuple):
     debug = Client.debug
     file_logs = environ.get("FILE_LOGS", "false").lower() == "true"
@@ -263,6 +297,8 @@ class RedisConfig(NamedTuple):
     port = environ.get("REDIS_PORT", 6379)
     password = environ.get("REDIS_PASSWORD")
     use_fakeredis = environ.get("USE_FAKEREDIS", "false").lower() == "true"
+    max_connections = int(environ.get("REDIS_MAX_CONNECTIONS", 20))
+    batch_window = float(environ.get("REDIS_BATCH_WINDOW", 1))  # Seconds that batched writes are buffered for
 
 
 class Source:
@@ -0,0 +1,42 @@
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+FLAGS_DIRECTORY = Path("bot/resources/holidays/pride/flags")
+CHOCOLATE_BUNNY = Path("bot/resources/holidays/easter/chocolate_bunny.png")
+
+# All of these images are shared between calls, so they must be treated as read-only.
+# Anything that needs to modify one, such as with `putalpha`, should make a copy of it first.
+
+
+@lru_cache(maxsize=None)
+def pride_flag(flag: str) -> Image.Image:
+    """Returns the given pride flag, resized to 1024x1024 and converted to RGBA."""
+    with Image.open(FLAGS_DIRECTORY / f"{flag}.png") as image:
+        return image.resize((1024, 1024)).convert("RGBA")
+
+
+@lru_cache(maxsize=None)
+def chocolate_bunny() -> Image.Image:
+    """Returns the chocolate bunny overlay used by the easter effect."""
+    with Image.open(CHOCOLATE_BUNNY) as image:
+        return image.convert("RGBA")
+
+
+@lru_cache(maxsize=8)
+def circle_mask(size: tuple[int, int]) -> Image.Image:
+    """Returns a mask of a circle filling an image of the given size."""
+    mask = Image.new("L", size, 0)
+    draw = ImageDraw.Draw(mask)
+    draw.ellipse((0, 0) + size, fill=255)
+    return mask
+
+
+@lru_cache(maxsize=32)
+def ring_mask(size: tuple[int, int], px: int) -> Image.Image:
+    """Returns a mask of a ring `px` pixels thick, around the edge of a 1024x1024 circle."""
+    mask = circle_mask(size).copy()
+    draw = ImageDraw.Draw(mask)
+    draw.ellipse((px, px, 1024-px, 1024-px), fill=0)
+    return mask
@@ -0,0 +1,90 @@
+import base64
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+from async_rediscache import RedisSession
+from redis import RedisError
+
+log = logging.getLogger(__name__)
+
+
+class RenderCache:
+    """
+    A cache of rendered avatar effects, keyed by the content they were rendered from.
+
+    Renders are kept in memory in least recently used order, evicting the oldest once `max_bytes` is exceeded.
+    If a `redis_ttl` is given, renders are also stored in Redis for that many seconds, so that they can be
+    shared between restarts. Redis is only ever used on a best effort basis, errors are logged and ignored.
+    """
+
+    def __init__(self, max_bytes: int, redis_session: Optional[RedisSession] = None, redis_ttl: int = 0):
+        self.max_bytes = max_bytes
+        self.redis_session = redis_session if redis_ttl > 0 else None
+        self.redis_ttl = redis_ttl
+
+        self._renders: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def make_key(avatar_key: str, size: int, effect: str, *args) -> str:
+        """Create a key for a render of the avatar with the hash `avatar_key` at the given `size`."""
+        content = repr((avatar_key, size, effect, args)).encode()
+        return hashlib.sha256(content).hexdigest()
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.redis_session.global_namespace}.AvatarModify.renders:{key}"
+
+    def _store(self, key: str, image: bytes) -> None:
+        """Store a render in memory, evicting the least recently used ones until it fits."""
+        if len(image) > self.max_bytes:
+            return
+
+        if key in self._renders:
+            self._size -= len(self._renders.pop(key))
+
+        self._renders[key] = image
+        self._size += len(image)
+        while self._size > self.max_bytes:
+            _, evicted = self._renders.popitem(last=False)
+            self._size -= len(evicted)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a render from memory, falling back to Redis, returning None if it isn't cached."""
+        if key in self._renders:
+            self._renders.move_to_end(key)
+            return self._renders[key]
+
+        if not self.redis_session:
+            return None
+
+        try:
+            encoded = await self.redis_session.client.get(self._redis_key(key))
+        except RedisError:
+            log.exception(f"Failed to get render {key} from Redis.")
+            return None
+
+        if encoded is None:
+            return None
+
+        image = base64.b64decode(encoded)
+        self._store(key, image)
+        return image
+
+    async def set(self, key: str, image: bytes) -> None:
+        """Cache a render in memory, and in Redis if enabled."""
+        self._store(key, image)
+
+        if not self.redis_session:
+            return
+
+        # Responses are decoded as text by the session, so the PNG is stored as base64.
+        try:
+            await self.redis_session.client.set(
+                self._redis_key(key),
+                base64.b64encode(image).decode(),
+                ex=self.redis_ttl,
+            )
+        except RedisError:
+            log.exception(f"Failed to store render {key} in Redis.")
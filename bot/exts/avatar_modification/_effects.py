@@ -1,13 +1,12 @@
 import math
 import random
 from io import BytesIO
-from pathlib import Path
 from typing import Callable, Optional
 
-import discord
-from PIL import Image, ImageDraw, ImageOps
+from PIL import Image, ImageChops, ImageMath, ImageOps
 
 from bot.constants import Colours
+from bot.exts.avatar_modification import _assets
 
 
 class PfpEffects:
@@ -18,8 +17,12 @@ class PfpEffects:
     """
 
     @staticmethod
-    def apply_effect(image_bytes: bytes, effect: Callable, filename: str, *args) -> discord.File:
-        """Applies the given effect to the image passed to it."""
+    def apply_effect(image_bytes: bytes, effect: Callable, *args) -> bytes:
+        """
+        Applies the given effect to the image passed to it, returning the result as PNG bytes.
+
+        Only bytes go in and out, so that this can be ran in a process pool.
+        """
         im = Image.open(BytesIO(image_bytes))
         im = im.convert("RGBA")
         im = im.resize((1024, 1024))
@@ -27,9 +30,8 @@ class PfpEffects:
 
         bufferedio = BytesIO()
         im.save(bufferedio, format="PNG")
-        bufferedio.seek(0)
 
-        return discord.File(bufferedio, filename=filename)
+        return bufferedio.getvalue()
 
     @staticmethod
     def closest(x: tuple[int, int, int]) -> tuple[int, int, int]:
@@ -53,23 +55,50 @@ class PfpEffects:
 
         return r, g, b
 
+    @staticmethod
+    def closest_image(image: Image.Image) -> Image.Image:
+        """
+        Applies `closest` to every pixel of the given RGB image at once.
+
+        Rather than looking up each pixel in Python, the squared distance to each "easter" colour is computed
+        over whole channels with ImageMath. A running minimum keeps the index of the nearest colour so far,
+        only replacing it when a later colour is strictly closer, which matches the stable sort in `closest`.
+        The nearest colours are then mapped back to channels with a lookup table and averaged with the original.
+        """
+        red, green, blue = image.split()
+        nearest_index = Image.new("L", image.size, 0)
+        nearest_distance = None
+
+        for index, (r2, g2, b2) in enumerate(Colours.easter_like_colours):
+            distance = ImageMath.eval(
+                "(r - r2) * (r - r2) + (g - g2) * (g - g2) + (b - b2) * (b - b2)",
+                r=red, g=green, b=blue, r2=r2, g2=g2, b2=b2
+            )
+            if nearest_distance is None:
+                nearest_distance = distance
+                continue
+
+            closer = ImageMath.eval("convert((d < nearest) * 255, 'L')", d=distance, nearest=nearest_distance)
+            nearest_index.paste(index, mask=closer)
+            nearest_distance = ImageMath.eval("min(d, nearest)", d=distance, nearest=nearest_distance)
+
+        channels = []
+        for channel, palette_channel in zip((red, green, blue), zip(*Colours.easter_like_colours)):
+            lut = list(palette_channel) + [0] * (256 - len(palette_channel))
+            channels.append(ImageChops.add(channel, nearest_index.point(lut), scale=2))
+
+        return Image.merge("RGB", channels)
+
     @staticmethod
     def crop_avatar_circle(avatar: Image.Image) -> Image.Image:
         """This crops the avatar given into a circle."""
-        mask = Image.new("L", avatar.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse((0, 0) + avatar.size, fill=255)
-        avatar.putalpha(mask)
+        avatar.putalpha(_assets.circle_mask(avatar.size))
         return avatar
 
     @staticmethod
     def crop_ring(ring: Image.Image, px: int) -> Image.Image:
         """This crops the given ring into a circle."""
-        mask = Image.new("L", ring.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse((0, 0) + ring.size, fill=255)
-        draw.ellipse((px, px, 1024-px, 1024-px), fill=0)
-        ring.putalpha(mask)
+        ring.putalpha(_assets.ring_mask(ring.size, px))
         return ring
 
     @staticmethod
@@ -77,9 +106,8 @@ class PfpEffects:
         """Applies the given pride effect to the given image."""
         image = PfpEffects.crop_avatar_circle(image)
 
-        ring = Image.open(Path(f"bot/resources/holidays/pride/flags/{flag}.png")).resize((1024, 1024))
-        ring = ring.convert("RGBA")
-        ring = PfpEffects.crop_ring(ring, pixels)
+        # The flag is shared between calls, so it is copied before its alpha is replaced.
+        ring = PfpEffects.crop_ring(_assets.pride_flag(flag).copy(), pixels)
 
         image.alpha_composite(ring, (0, 0))
         return image
@@ -125,26 +153,14 @@ class PfpEffects:
             ))
             overlay_image = overlay_image.convert("RGBA")
         else:
-            overlay_image = Image.open(Path("bot/resources/holidays/easter/chocolate_bunny.png"))
+            overlay_image = _assets.chocolate_bunny()
 
-        alpha = image.getchannel("A").getdata()
+        alpha = image.getchannel("A")
         image = image.convert("RGB")
         image = ImageOps.posterize(image, 6)
 
-        data = image.getdata()
-        data_set = set(data)
-        easterified_data_set = {}
-
-        for x in data_set:
-            easterified_data_set[x] = PfpEffects.closest(x)
-        new_pixel_data = [
-            (*easterified_data_set[x], alpha[i])
-            if x in easterified_data_set else x
-            for i, x in enumerate(data)
-        ]
-
-        im = Image.new("RGBA", image.size)
-        im.putdata(new_pixel_data)
+        im = PfpEffects.closest_image(image)
+        im.putalpha(alpha)
         im.alpha_composite(
             overlay_image,
             (im.width - overlay_image.width, (im.height - overlay_image.height) // 2)
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from bot.utils.exceptions import ExecutorSaturatedError
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _thread_pool(workers: int) -> Executor:
+    """Create a thread pool, which shares the GIL with the bot but needs no pickling."""
+    return ThreadPoolExecutor(workers, thread_name_prefix="avatar-effect")
+
+
+def _process_pool(workers: int) -> Executor:
+    """
+    Create a process pool, so that effects can run on more than one core.
+
+    The fork start method is used, since spawned workers re-import `bot.__main__`, which starts the bot.
+    Arguments and results are pickled, so only plain data such as image bytes should be sent to it.
+    """
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"))
+
+
+BACKENDS: dict[str, Callable[[int], Executor]] = {
+    "thread": _thread_pool,
+    "process": _process_pool,
+}
+
+
+class EffectExecutor:
+    """
+    Runs blocking image effects in a pool of workers, with a bounded queue.
+
+    At most `workers + queue_size` calls are admitted at once. Further calls wait up to `queue_timeout`
+    seconds for a slot, after which they are rejected with an `ExecutorSaturatedError`.
+    """
+
+    def __init__(self, backend: str, workers: int, queue_size: int, queue_timeout: float):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown executor backend {backend!r}, expected one of {', '.join(BACKENDS)}.")
+
+        self.backend = backend
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(workers + queue_size)
+        self._pool = BACKENDS[backend](workers)
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Run `func` with `args` in the pool, waiting for a free slot first if the queue is full."""
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            log.info(f"Rejecting {func.__name__}, the {self.backend} executor is saturated.")
+            raise ExecutorSaturatedError()
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, func, *args)
+        except BrokenExecutor:
+            # A process pool can't recover from a worker dying, so replace it for future calls.
+            log.exception(f"The {self.backend} executor broke while running {func.__name__}, recreating it.")
+            self._pool = BACKENDS[self.backend](self.workers)
+            raise
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        """Shut down the pool, cancelling any calls that haven't started yet."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
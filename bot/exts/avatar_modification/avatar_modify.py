@@ -1,10 +1,9 @@
-import asyncio
 import json
 import logging
 import math
 import string
 import unicodedata
-from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from pathlib import Path
 from typing import Callable, Optional, TypeVar, Union
 
@@ -12,13 +11,20 @@ import discord
 from discord.ext import commands
 
 from bot.bot import Bot
-from bot.constants import Colours, Emojis
+from bot.constants import AvatarEffects, Colours, Emojis
+from bot.exts.avatar_modification._cache import RenderCache
 from bot.exts.avatar_modification._effects import PfpEffects
+from bot.exts.avatar_modification._executor import EffectExecutor
 from bot.utils.halloween import spookifications
 
 log = logging.getLogger(__name__)
 
-_EXECUTOR = ThreadPoolExecutor(10)
+_EXECUTOR = EffectExecutor(
+    AvatarEffects.executor_backend,
+    AvatarEffects.executor_workers,
+    AvatarEffects.executor_queue_size,
+    AvatarEffects.executor_queue_timeout,
+)
 
 FILENAME_STRING = "{effect}_{author}.png"
 
@@ -37,8 +43,7 @@ async def in_executor(func: Callable[..., T], *args) -> T:
     functions, so that they don't block the bot.
     """
     log.trace(f"Running {func.__name__} in an executor.")
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(_EXECUTOR, func, *args)
+    return await _EXECUTOR.run(func, *args)
 
 
 def file_safe_name(effect: str, display_name: str) -> str:
@@ -63,6 +68,15 @@ class AvatarModify(commands.Cog):
 
     def __init__(self, bot: Bot):
         self.bot = bot
+        self.render_cache = RenderCache(
+            AvatarEffects.render_cache_bytes,
+            bot.redis_session,
+            AvatarEffects.render_cache_redis_ttl,
+        )
+
+    def cog_unload(self) -> None:
+        """Shut down the executor, as a new one is created if the extension is reloaded."""
+        _EXECUTOR.shutdown()
 
     async def _fetch_user(self, user_id: int) -> Optional[discord.User]:
         """
@@ -84,6 +98,36 @@ class AvatarModify(commands.Cog):
 
         return user
 
+    async def render_avatar(
+        self,
+        user: discord.User,
+        effect: Callable,
+        filename: str,
+        *args,
+        size: int = 1024,
+        cache: bool = True
+    ) -> discord.File:
+        """
+        Applies `effect` to the user's avatar in an executor, returning the result as a file called `filename`.
+
+        Renders are cached by the avatar's hash, the effect and its arguments, so a cache hit skips both
+        downloading the avatar and running the effect. Effects which depend on more than their arguments,
+        such as a random choice, should pass `cache=False`.
+        """
+        avatar = user.display_avatar.replace(size=size)
+        key = RenderCache.make_key(avatar.key, size, effect.__qualname__, *args)
+
+        image = await self.render_cache.get(key) if cache else None
+        if image is None:
+            image_bytes = await avatar.read()
+            image = await in_executor(PfpEffects.apply_effect, image_bytes, effect, *args)
+            if cache:
+                await self.render_cache.set(key, image)
+        else:
+            log.trace(f"Using cached {effect.__qualname__} render for {user.id}.")
+
+        return discord.File(BytesIO(image), filename=filename)
+
     @commands.group(aliases=("avatar_mod", "pfp_mod", "avatarmod", "pfpmod"))
     async def avatar_modify(self, ctx: commands.Context) -> None:
         """Groups all of the pfp modifying commands to allow a single concurrency limit."""
@@ -99,12 +143,10 @@ class AvatarModify(commands.Cog):
                 await ctx.send(f"{Emojis.cross_mark} Could not get user info.")
                 return
 
-            image_bytes = await user.display_avatar.replace(size=1024).read()
             file_name = file_safe_name("eightbit_avatar", ctx.author.display_name)
 
-            file = await in_executor(
-                PfpEffects.apply_effect,
-                image_bytes,
+            file = await self.render_avatar(
+                user,
                 PfpEffects.eight_bitify_effect,
                 file_name
             )
@@ -136,12 +178,10 @@ class AvatarModify(commands.Cog):
                 await ctx.send(f"{Emojis.cross_mark} Could not get user info.")
                 return
 
-            image_bytes = await user.display_avatar.replace(size=1024).read()
             filename = file_safe_name("reverse_avatar", ctx.author.display_name)
 
-            file = await in_executor(
-                PfpEffects.apply_effect,
-                image_bytes,
+            file = await self.render_avatar(
+                user,
                 PfpEffects.flip_effect,
                 filename
             )
@@ -192,15 +232,16 @@ class AvatarModify(commands.Cog):
                     return
                 ctx.send = send_message  # Reassigns ctx.send
 
-            image_bytes = await user.display_avatar.replace(size=256).read()
             file_name = file_safe_name("easterified_avatar", ctx.author.display_name)
 
-            file = await in_executor(
-                PfpEffects.apply_effect,
-                image_bytes,
+            # A custom egg has a random design, so only the default bunny can be cached.
+            file = await self.render_avatar(
+                user,
                 PfpEffects.easterify_effect,
                 file_name,
-                egg
+                egg,
+                size=256,
+                cache=egg is None
             )
 
             embed = discord.Embed(
@@ -212,10 +253,10 @@ class AvatarModify(commands.Cog):
 
         await ctx.send(file=file, embed=embed)
 
-    @staticmethod
     async def send_pride_image(
+        self,
         ctx: commands.Context,
-        image_bytes: bytes,
+        user: discord.User,
         pixels: int,
         flag: str,
         option: str
@@ -224,9 +265,8 @@ class AvatarModify(commands.Cog):
         async with ctx.typing():
             file_name = file_safe_name("pride_avatar", ctx.author.display_name)
 
-            file = await in_executor(
-                PfpEffects.apply_effect,
-                image_bytes,
+            file = await self.render_avatar(
+                user,
                 PfpEffects.pridify_effect,
                 file_name,
                 pixels,
@@ -267,8 +307,7 @@ class AvatarModify(commands.Cog):
             if not user:
                 await ctx.send(f"{Emojis.cross_mark} Could not get user info.")
                 return
-            image_bytes = await user.display_avatar.replace(size=1024).read()
-            await self.send_pride_image(ctx, image_bytes, pixels, flag, option)
+            await self.send_pride_image(ctx, user, pixels, flag, option)
 
     @prideavatar.command()
     async def flags(self, ctx: commands.Context) -> None:
@@ -295,15 +334,13 @@ class AvatarModify(commands.Cog):
             return
 
         async with ctx.typing():
-            image_bytes = await user.display_avatar.replace(size=1024).read()
-
             file_name = file_safe_name("spooky_avatar", ctx.author.display_name)
 
-            file = await in_executor(
-                PfpEffects.apply_effect,
-                image_bytes,
+            file = await self.render_avatar(
+                user,
                 spookifications.get_random_effect,
-                file_name
+                file_name,
+                cache=False
             )
 
             embed = discord.Embed(
@@ -334,14 +371,12 @@ class AvatarModify(commands.Cog):
 
             file_name = file_safe_name("mosaic_avatar", ctx.author.display_name)
 
-            img_bytes = await user.display_avatar.replace(size=1024).read()
-
-            file = await in_executor(
-                PfpEffects.apply_effect,
-                img_bytes,
+            file = await self.render_avatar(
+                user,
                 PfpEffects.mosaic_effect,
                 file_name,
                 squares,
+                cache=False
             )
 
             if squares == 1:
@@ -12,7 +12,7 @@ from bot.bot import Bot
 from bot.constants import Channels, Colours, ERROR_REPLIES, NEGATIVE_REPLIES, RedirectOutput
 from bot.utils.commands import get_command_suggestions
 from bot.utils.decorators import InChannelCheckFailure, InMonthCheckFailure
-from bot.utils.exceptions import APIError, MovedCommandError, UserNotPlayingError
+from bot.utils.exceptions import APIError, ExecutorSaturatedError, MovedCommandError, UserNotPlayingError
 
 log = logging.getLogger(__name__)
 
@@ -131,6 +131,15 @@ class CommandErrorHandler(commands.Cog):
             )
             return
 
+        if isinstance(error, ExecutorSaturatedError):
+            await ctx.send(
+                embed=self.error_embed(
+                    "I'm a bit overwhelmed with work right now, please try again in a little while.",
+                    NEGATIVE_REPLIES
+                )
+            )
+            return
+
         if isinstance(error, MovedCommandError):
             description = (
                 f"This command, `{ctx.prefix}{ctx.command.qualified_name}` has moved to `{error.new_command_name}`.\n"
@@ -2,6 +2,7 @@
 import asyncio
 import itertools
 import logging
+from collections.abc import Iterable
 from contextlib import suppress
 from typing import NamedTuple, Optional, Union
 
@@ -12,12 +13,16 @@ from discord.ext.commands import CheckFailure, Cog as DiscordCog, Command, Conte
 from bot import constants
 from bot.bot import Bot
 from bot.constants import Emojis
+from bot.utils import resolve_current_month
 from bot.utils.commands import get_command_suggestions
 from bot.utils.decorators import whitelist_override
 from bot.utils.pagination import FIRST_EMOJI, LAST_EMOJI, LEFT_EMOJI, LinePaginator, RIGHT_EMOJI
 
 DELETE_EMOJI = Emojis.trashcan
 
+# How many sets of rendered pages are kept, across all queries and permission profiles
+PAGE_CACHE_SIZE = 256
+
 REACTIONS = {
     FIRST_EMOJI: "first",
     LEFT_EMOJI: "back",
@@ -56,6 +61,161 @@ class HelpQueryNotFound(ValueError):
         self.parent_command = parent_command
 
 
+def _category_key(cmd: Command) -> str:
+    """
+    Returns a cog name of a given command for use as a key for `sorted` and `groupby`.
+
+    A zero width space is used as a prefix for results with no cogs to force them last in ordering.
+    """
+    if cmd.cog:
+        try:
+            if cmd.cog.category:
+                return f"**{cmd.cog.category}**"
+        except AttributeError:
+            pass
+
+        return f"**{cmd.cog_name}**"
+    else:
+        return "**\u200bNo Category:**"
+
+
+def _channel_class(ctx: Context, whitelisted: set[int]) -> tuple:
+    """
+    Return what whitelist and permission checks can tell about the channel of `ctx`.
+
+    Channels and categories which aren't in `whitelisted` are told apart only by the bot's permissions in them.
+    """
+    if ctx.guild is None:
+        return ("dm",)
+
+    category_id = getattr(ctx.channel, "category_id", None)
+    category = getattr(ctx.channel, "category", None)
+    return (
+        ctx.channel.id if ctx.channel.id in whitelisted else None,
+        category_id if category_id in whitelisted else None,
+        category is not None and category.name == constants.codejam_categories_name,
+        ctx.channel.permissions_for(ctx.me).value,
+    )
+
+
+class HelpIndex:
+    """
+    The bot's commands and cogs arranged for help sessions, along with the pages they've rendered.
+
+    The index is built the first time it's used, and cleared whenever an extension is loaded, unloaded or
+    reloaded. Rendered pages are cached by query and permission profile, so that showing the same help again
+    doesn't need every command's checks to be run.
+    """
+
+    def __init__(self, bot: Bot):
+        self._bot = bot
+        self._built = False
+
+        self._categories: list[tuple[str, list[Command]]] = []
+        self._cogs: dict[str, Cog] = {}
+        self._folded: dict[str, Union[Command, Cog]] = {}
+        self._names: list[str] = []
+        self._whitelisted: set[int] = set()
+        self._stateful: set[Command] = set()
+        self._pages: dict[tuple, list[str]] = {}
+
+    def invalidate(self) -> None:
+        """Clear the index and all rendered pages, so they're built again from the commands loaded now."""
+        self._built = False
+        self._pages.clear()
+
+    def _build(self) -> None:
+        # Every command, grouped into categories, which are sorted along with the commands in them
+        commands_ = sorted(self._bot.commands, key=lambda c: (_category_key(c), c.name))
+        self._categories = [
+            (category, list(cmds)) for category, cmds in itertools.groupby(commands_, key=_category_key)
+        ]
+
+        categories: dict[str, list[DiscordCog]] = {}
+        self._cogs = {}
+        for cog in self._bot.cogs.values():
+            if hasattr(cog, "category"):
+                categories.setdefault(cog.category, []).append(cog)
+            else:
+                self._cogs[cog.qualified_name] = Cog(cog.qualified_name, cog.description, tuple(cog.get_commands()))
+
+        # Categories take precedence over a cog with the same name.
+        for category, cogs in categories.items():
+            descriptions = [cog.category_description for cog in cogs if hasattr(cog, "category_description")]
+            self._cogs[category] = Cog(
+                name=category,
+                description=descriptions[-1] if descriptions else cogs[0].description,
+                commands=tuple(itertools.chain.from_iterable(cog.get_commands() for cog in cogs))
+            )
+
+        # Cogs are matched without regard to case after commands, so they're added last to take precedence.
+        self._folded = {}
+        # Every channel and category which any command is whitelisted in, as other ones are all alike to checks
+        self._whitelisted = {*constants.WHITELISTED_CHANNELS, constants.Channels.sir_lancebot_playground}
+        self._stateful = set()
+        for command in self._bot.walk_commands():
+            for alias in (command.name, *command.aliases):
+                parent = f"{command.full_parent_name} " if command.parent else ""
+                self._folded[f"{parent}{alias}".casefold()] = command
+
+            override = getattr(command.callback, "override", {})
+            self._whitelisted.update(override.get("channels", ()), override.get("categories", ()))
+            if any(getattr(check, "stateful", False) for check in command.checks):
+                self._stateful.add(command)
+        self._folded.update((name.casefold(), cog) for name, cog in self._cogs.items())
+
+        self._names = [*self._bot.all_commands, *self._cogs]
+        self._built = True
+
+    @property
+    def categories(self) -> list[tuple[str, list[Command]]]:
+        """Every top-level command, grouped by category, with both sorted."""
+        if not self._built:
+            self._build()
+        return self._categories
+
+    def find(self, query: str) -> Optional[Union[Command, Cog]]:
+        """Return the command, category or cog named by `query`, matched exactly and then ignoring case."""
+        if not self._built:
+            self._build()
+        return self._bot.get_command(query) or self._cogs.get(query) or self._folded.get(query.casefold())
+
+    def suggest(self, query: str) -> list[str]:
+        """Return the names of commands, categories and cogs similar to `query`."""
+        if not self._built:
+            self._build()
+        return get_command_suggestions(self._names, query)
+
+    def permission_profile(self, ctx: Context) -> tuple:
+        """
+        Return what decides which commands can be run from `ctx`: the author's roles, the channel and the month.
+
+        Only what checks can tell apart is included of the channel, so that pages are shared between channels.
+        Help pages rendered for one context are shown as they are to any other with the same profile, other than
+        for stateful checks, whose results have to be added to it.
+        """
+        if not self._built:
+            self._build()
+        roles = frozenset(role.id for role in getattr(ctx.author, "roles", ()))
+        return roles, _channel_class(ctx, self._whitelisted), resolve_current_month()
+
+    def stateful_commands(self, commands_: Iterable[Command]) -> list[Command]:
+        """Return those of `commands_` with checks marked by `stateful_check`, sorted by name."""
+        if not self._built:
+            self._build()
+        return sorted((command for command in commands_ if command in self._stateful), key=lambda c: c.qualified_name)
+
+    def get_pages(self, key: tuple) -> Optional[list[str]]:
+        """Return the pages rendered for `key`, if they're cached."""
+        return self._pages.get(key)
+
+    def cache_pages(self, key: tuple, pages: list[str]) -> None:
+        """Cache the pages rendered for `key`, dropping the oldest cached pages if there's no room."""
+        if len(self._pages) >= PAGE_CACHE_SIZE:
+            del self._pages[next(iter(self._pages))]
+        self._pages[key] = pages
+
+
 class HelpSession:
     """
     An interactive session for bot and command help output.
@@ -77,12 +237,15 @@ class HelpSession:
     as a class attribute named `category`. A description can also be specified with the attribute
     `category_description`. If a description is not found in at least one cog, the default will be
     the regular description (class docstring) of the first cog found in the category.
+
+    Queries are looked up in, and pages are cached by, the given `HelpIndex`.
     """
 
     def __init__(
         self,
         ctx: Context,
         *command,
+        index: HelpIndex,
         cleanup: bool = False,
         only_can_run: bool = True,
         show_hidden: bool = False,
@@ -91,6 +254,7 @@ class HelpSession:
         """Creates an instance of the HelpSession class."""
         self._ctx = ctx
         self._bot = ctx.bot
+        self._index = index
         self.title = "Command Help"
 
         # set the query details for the session
@@ -114,41 +278,15 @@ class HelpSession:
         self._pages = None
         self._current_page = 0
         self.message = None
+        self._listeners = []
         self._timeout_task = None
         self.reset_timeout()
 
     def _get_query(self, query: str) -> Union[Command, Cog]:
         """Attempts to match the provided query with a valid command or cog."""
-        command = self._bot.get_command(query)
-        if command:
-            return command
-
-        # Find all cog categories that match.
-        cog_matches = []
-        description = None
-        for cog in self._bot.cogs.values():
-            if hasattr(cog, "category") and cog.category == query:
-                cog_matches.append(cog)
-                if hasattr(cog, "category_description"):
-                    description = cog.category_description
-
-        # Try to search by cog name if no categories match.
-        if not cog_matches:
-            cog = self._bot.cogs.get(query)
-
-            # Don't consider it a match if the cog has a category.
-            if cog and not hasattr(cog, "category"):
-                cog_matches = [cog]
-
-        if cog_matches:
-            cog = cog_matches[0]
-            cmds = (cog.get_commands() for cog in cog_matches)  # Commands of all cogs
-
-            return Cog(
-                name=cog.category if hasattr(cog, "category") else cog.qualified_name,
-                description=description or cog.description,
-                commands=tuple(itertools.chain.from_iterable(cmds))  # Flatten the list
-            )
+        match = self._index.find(query)
+        if match:
+            return match
 
         self._handle_not_found(query)
 
@@ -166,7 +304,7 @@ class HelpSession:
             if parent_command:
                 raise HelpQueryNotFound('Invalid Subcommand.', parent_command=parent_command)
 
-        similar_commands = get_command_suggestions(list(self._bot.all_commands.keys()), query)
+        similar_commands = self._index.suggest(query)
 
         raise HelpQueryNotFound(f'Query "{query}" not found.', similar_commands)
 
@@ -222,8 +360,12 @@ class HelpSession:
         await self.build_pages()
         await self.update_page()
 
-        self._bot.add_listener(self.on_reaction_add)
-        self._bot.add_listener(self.on_message_delete)
+        self._listeners = [
+            self._bot.waiters.subscribe(
+                "reaction_add", self.on_reaction_add, message_id=self.message.id, user_id=self.author.id
+            ),
+            self._bot.waiters.subscribe("message_delete", self.on_message_delete, message_id=self.message.id),
+        ]
 
         self.add_reactions()
 
@@ -238,23 +380,6 @@ class HelpSession:
         else:
             self._bot.loop.create_task(self.message.add_reaction(DELETE_EMOJI))
 
-    def _category_key(self, cmd: Command) -> str:
-        """
-        Returns a cog name of a given command for use as a key for `sorted` and `groupby`.
-
-        A zero width space is used as a prefix for results with no cogs to force them last in ordering.
-        """
-        if cmd.cog:
-            try:
-                if cmd.cog.category:
-                    return f"**{cmd.cog.category}**"
-            except AttributeError:
-                pass
-
-            return f"**{cmd.cog_name}**"
-        else:
-            return "**\u200bNo Category:**"
-
     def _get_command_params(self, cmd: Command) -> str:
         """
         Returns the command usage signature.
@@ -290,7 +415,40 @@ class HelpSession:
         return f"{cmd.qualified_name} {' '.join(results)}"
 
     async def build_pages(self) -> None:
-        """Builds the list of content pages to be paginated through in the help message, as a list of str."""
+        """
+        Builds the list of content pages to be paginated through in the help message, as a list of str.
+
+        Pages already rendered for the same query and permission profile are taken from the index instead. Stateful
+        checks of the commands shown are run first, as their results are part of the profile.
+        """
+        if isinstance(self.query, commands.Command):
+            query_key = self.query.qualified_name
+        elif isinstance(self.query, Cog):
+            query_key = ("cog", self.query.name)
+        else:
+            query_key = None
+
+        shown = []
+        if isinstance(self.query, commands.Command):
+            shown.append(self.query)
+        if isinstance(self.query, (commands.GroupMixin, Cog)):
+            shown.extend(self.query.commands)
+        stateful = tuple([await self._can_run(command) for command in self._index.stateful_commands(shown)])
+
+        key = (
+            query_key,
+            self._index.permission_profile(self._ctx),
+            stateful,
+            self._only_can_run,
+            self._show_hidden,
+            self._max_lines
+        )
+        self._pages = self._index.get_pages(key)
+        if self._pages is None:
+            await self._render_pages()
+            self._index.cache_pages(key, self._pages)
+
+    async def _render_pages(self) -> None:
         # Use LinePaginator to restrict embed line height
         paginator = LinePaginator(prefix="", suffix="", max_lines=self._max_lines)
 
@@ -343,13 +501,12 @@ class HelpSession:
         elif isinstance(self.query, commands.Command):
             grouped = (("**Subcommands:**", self.query.commands),)
 
-        # otherwise sort and organise all commands into categories
+        # otherwise use the index's categories, which are already sorted and grouped
         else:
-            cat_sort = sorted(filtered, key=self._category_key)
-            grouped = itertools.groupby(cat_sort, key=self._category_key)
+            grouped = self._index.categories
 
         for category, cmds in grouped:
-            await self._format_command_category(paginator, category, list(cmds))
+            await self._format_command_category(paginator, category, cmds)
 
     async def _format_command_category(self, paginator: LinePaginator, category: str, cmds: list[Command]) -> None:
         cmds = sorted(cmds, key=lambda c: c.name)
@@ -381,22 +538,23 @@ class HelpSession:
 
             paginator.add_line(details)
 
-    async def _format_command(self, command: Command) -> list[str]:
-        # skip if hidden and hide if session is set to
-        if command.hidden and not self._show_hidden:
-            return []
-
+    async def _can_run(self, command: Command) -> bool:
         # Patch to make the !help command work outside of #bot-commands again
         # This probably needs a proper rewrite, but this will make it work in
         # the mean time.
         try:
-            can_run = await command.can_run(self._ctx)
+            return await command.can_run(self._ctx)
         except CheckFailure:
-            can_run = False
+            return False
+
+    async def _format_command(self, command: Command) -> list[str]:
+        # skip if hidden and hide if session is set to
+        if command.hidden and not self._show_hidden:
+            return []
 
         # see if the user can run the command
         strikeout = ""
-        if not can_run:
+        if not await self._can_run(command):
             # skip if we don't show commands they can't run
             if self._only_can_run:
                 return []
@@ -448,6 +606,8 @@ class HelpSession:
         Create and begin a help session based on the given command context.
 
         Available options kwargs:
+            * index: HelpIndex
+                The index to look up the query in and cache the pages with.
             * cleanup: Optional[bool]
                 Set to `True` to have the message deleted on session end. Defaults to `False`.
             * only_can_run: Optional[bool]
@@ -464,8 +624,8 @@ class HelpSession:
 
     async def stop(self) -> None:
         """Stops the help session, removes event listeners and attempts to delete the help message."""
-        self._bot.remove_listener(self.on_reaction_add)
-        self._bot.remove_listener(self.on_message_delete)
+        for listener in self._listeners:
+            self._bot.waiters.remove(listener)
 
         # ignore if permission issue, or the message doesn't exist
         with suppress(HTTPException, AttributeError):
@@ -512,12 +672,20 @@ class HelpSession:
 class Help(DiscordCog):
     """Custom Embed Pagination Help feature."""
 
+    def __init__(self, bot: Bot):
+        self.index = HelpIndex(bot)
+
+    @DiscordCog.listener()
+    async def on_extensions_changed(self) -> None:
+        """Clear the help index, since commands may have been added or removed."""
+        self.index.invalidate()
+
     @commands.command("help")
     @whitelist_override(allow_dm=True)
     async def new_help(self, ctx: Context, *commands) -> None:
         """Shows Command Help."""
         try:
-            await HelpSession.start(ctx, *commands)
+            await HelpSession.start(ctx, *commands, index=self.index)
         except HelpQueryNotFound as error:
 
             # Send help message of parent command if subcommand is invalid.
@@ -562,7 +730,7 @@ async def setup(bot: Bot) -> None:
     bot.remove_command("help")
 
     try:
-        await bot.add_cog(Help())
+        await bot.add_cog(Help(bot))
     except Exception:
         unload(bot)
         raise
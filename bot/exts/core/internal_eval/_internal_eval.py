@@ -1,16 +1,21 @@
 import logging
+import pprint
 import re
 import textwrap
-from typing import Optional
+from collections.abc import Awaitable
+from typing import Callable, Optional
 
 import discord
 from discord.ext import commands
 
 from bot.bot import Bot
 from bot.constants import Client, Roles
+from bot.utils.checks import stateful_check
 from bot.utils.decorators import with_role
+from bot.utils.http_client import pool_stats
 
-from ._helpers import EvalContext
+from ._helpers import EvalContext, Namespace
+from ._profiling import profile_eval, time_eval, trace_eval_allocations
 
 __all__ = ["InternalEval"]
 
@@ -35,6 +40,11 @@ RAW_CODE_REGEX = re.compile(
 
 MAX_LENGTH = 99980
 
+# The most times `internal timeit` will run code, so that it can't hold up the event loop for too long
+MAX_TIMEIT_RUNS = 10_000
+
+Profiler = Callable[[EvalContext], Awaitable[tuple[Namespace, str]]]
+
 
 class InternalEval(commands.Cog):
     """Top secret code evaluation for admins and owners."""
@@ -44,7 +54,7 @@ class InternalEval(commands.Cog):
         self.locals = {}
 
         if Client.debug:
-            self.internal_group.add_check(commands.is_owner().predicate)
+            self.internal_group.add_check(stateful_check(commands.is_owner().predicate))
 
     @staticmethod
     def shorten_output(
@@ -116,8 +126,29 @@ class InternalEval(commands.Cog):
 
         await ctx.send(f"```py\n{output}\n```{upload_message}")
 
-    async def _eval(self, ctx: commands.Context, code: str) -> None:
-        """Evaluate the `code` in the current evaluation context."""
+    @staticmethod
+    def _extract_code(code: str) -> str:
+        """Extract the code to evaluate from any code block markup around it."""
+        if match := list(FORMATTED_CODE_REGEX.finditer(code)):
+            blocks = [block for block in match if block.group("block")]
+
+            if len(blocks) > 1:
+                code = "\n".join(block.group("code") for block in blocks)
+            else:
+                match = match[0] if len(blocks) == 0 else blocks[0]
+                code, block, lang, delim = match.group("code", "block", "lang", "delim")
+
+        else:
+            code = RAW_CODE_REGEX.fullmatch(code).group("code")
+
+        return textwrap.dedent(code)
+
+    async def _eval(self, ctx: commands.Context, code: str, profiler: Optional[Profiler] = None) -> None:
+        """
+        Evaluate the `code` in the current evaluation context.
+
+        If a `profiler` is given, it runs the evaluation instead, and its report is sent after the output.
+        """
         context_vars = {
             "message": ctx.message,
             "author": ctx.author,
@@ -140,13 +171,18 @@ class InternalEval(commands.Cog):
             return
 
         log.trace("Evaluate the AST we've generated for the evaluation")
-        new_locals = await eval_context.run_eval()
+        if profiler is None:
+            new_locals = await eval_context.run_eval()
+            output = eval_context.format_output()
+        else:
+            new_locals, report = await profiler(eval_context)
+            output = f"{eval_context.format_output()}\n\n{report}"
 
         log.trace("Updating locals with those set during evaluation")
         self.locals.update(new_locals)
 
         log.trace("Sending the formatted output back to the context")
-        await self._send_output(ctx, eval_context.format_output())
+        await self._send_output(ctx, output)
 
     @commands.group(name="internal", aliases=("int",))
     @with_role(Roles.admins)
@@ -159,20 +195,31 @@ class InternalEval(commands.Cog):
     @with_role(Roles.admins)
     async def eval(self, ctx: commands.Context, *, code: str) -> None:
         """Run eval in a REPL-like format."""
-        if match := list(FORMATTED_CODE_REGEX.finditer(code)):
-            blocks = [block for block in match if block.group("block")]
+        await self._eval(ctx, self._extract_code(code))
 
-            if len(blocks) > 1:
-                code = "\n".join(block.group("code") for block in blocks)
-            else:
-                match = match[0] if len(blocks) == 0 else blocks[0]
-                code, block, lang, delim = match.group("code", "block", "lang", "delim")
+    @internal_group.command(name="profile", aliases=("prof",))
+    @with_role(Roles.admins)
+    async def profile(self, ctx: commands.Context, limit: Optional[int] = 20, *, code: str) -> None:
+        """Run eval under cProfile, and show the `limit` entries with the highest cumulative time."""
+        await self._eval(ctx, self._extract_code(code), lambda eval_context: profile_eval(eval_context, limit))
 
-        else:
-            code = RAW_CODE_REGEX.fullmatch(code).group("code")
+    @internal_group.command(name="memory", aliases=("mem", "tracemalloc"))
+    @with_role(Roles.admins)
+    async def memory(self, ctx: commands.Context, limit: Optional[int] = 10, *, code: str) -> None:
+        """Run eval with tracemalloc, and show the `limit` lines whose allocations changed the most."""
+        await self._eval(
+            ctx, self._extract_code(code), lambda eval_context: trace_eval_allocations(eval_context, limit)
+        )
+
+    @internal_group.command(name="timeit", aliases=("time",))
+    @with_role(Roles.admins)
+    async def timeit(self, ctx: commands.Context, number: Optional[int] = 100, *, code: str) -> None:
+        """Run eval `number` times, and show percentiles of how long the runs took, awaiting anything awaitable."""
+        if not 0 < number <= MAX_TIMEIT_RUNS:
+            await ctx.send(f":x: The code can only be run between 1 and {MAX_TIMEIT_RUNS} times.")
+            return
 
-        code = textwrap.dedent(code)
-        await self._eval(ctx, code)
+        await self._eval(ctx, self._extract_code(code), lambda eval_context: time_eval(eval_context, number))
 
     @internal_group.command(name="reset", aliases=("clear", "exit", "r", "c"))
     @with_role(Roles.admins)
@@ -180,3 +227,42 @@ class InternalEval(commands.Cog):
         """Reset the context and locals of the eval session."""
         self.locals = {}
         await ctx.send("The evaluation context was reset.")
+
+    @internal_group.command(name="http")
+    @with_role(Roles.admins)
+    async def http_stats(self, ctx: commands.Context) -> None:
+        """Show how much of the HTTP connection pool is in use, and how effective the response cache has been."""
+        stats = {
+            "pool": pool_stats(self.bot.http_session, self.bot.host_limiter),
+            "cache": self.bot.http_cache.stats,
+        }
+        await self._send_output(ctx, pprint.pformat(stats, sort_dicts=False))
+
+    @internal_group.command(name="waiters")
+    @with_role(Roles.admins)
+    async def waiter_stats(self, ctx: commands.Context) -> None:
+        """Show how many listeners are waiting on events, and how many were looked at per event."""
+        await self._send_output(ctx, pprint.pformat(self.bot.waiters.stats, sort_dicts=False))
+
+    @internal_group.command(name="ui")
+    @with_role(Roles.admins)
+    async def ui_update_stats(self, ctx: commands.Context) -> None:
+        """Show how many message edits were combined, and how many reactions were added by games."""
+        await self._send_output(ctx, pprint.pformat(self.bot.ui_updates.stats, sort_dicts=False))
+
+    @internal_group.command(name="listeners")
+    @with_role(Roles.admins)
+    async def listener_stats(self, ctx: commands.Context) -> None:
+        """Show how many events each listener was dispatched, and how many its filter skipped."""
+        await self._send_output(ctx, pprint.pformat(self.bot.listener_stats.summary, sort_dicts=False))
+
+    @internal_group.command(name="latex")
+    @with_role(Roles.admins)
+    async def latex_stats(self, ctx: commands.Context) -> None:
+        """Show how effective the LaTeX render cache has been, and how long renders take."""
+        latex = self.bot.get_cog("Latex")
+        if latex is None:
+            await ctx.send(":x: The Latex cog isn't loaded.")
+            return
+
+        await self._send_output(ctx, pprint.pformat(latex.cache.stats, sort_dicts=False))
@@ -0,0 +1,126 @@
+import asyncio
+import cProfile
+import io
+import logging
+import math
+import pstats
+import time
+import tracemalloc
+
+from ._helpers import EvalContext, Namespace
+
+log = logging.getLogger(__name__)
+
+# Only one evaluation can be profiled at a time, as the profilers are global to the interpreter
+_profiling_lock = asyncio.Lock()
+
+# Allocations made by these files are the profiler's own, so they're left out of the report
+_TRACEMALLOC_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+PERCENTILES = (50, 90, 99)
+
+
+def _format_duration(seconds: float) -> str:
+    """Format `seconds` with the largest unit which keeps it at least 1."""
+    for unit, scale in (("s", 1), ("ms", 1e3), ("µs", 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:.3g} {unit}"
+    return f"{seconds * 1e9:.3g} ns"
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    """Return the `percent`th percentile of the sorted `ordered`, by the nearest-rank method."""
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+async def profile_eval(eval_context: EvalContext, limit: int) -> tuple[Namespace, str]:
+    """
+    Run the evaluation under `cProfile`, returning the updated locals and the `limit` highest cumulative entries.
+
+    Everything the event loop runs while the evaluation awaits is profiled too, not only the evaluation itself.
+    """
+    profiler = cProfile.Profile()
+    async with _profiling_lock:
+        profiler.enable()
+        try:
+            new_locals = await eval_context.run_eval()
+        finally:
+            profiler.disable()
+
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return new_locals, stream.getvalue().strip()
+
+
+async def trace_eval_allocations(eval_context: EvalContext, limit: int) -> tuple[Namespace, str]:
+    """
+    Run the evaluation with `tracemalloc`, returning the updated locals and the `limit` largest allocation changes.
+
+    Allocations made by anything else the event loop runs while the evaluation awaits are included too.
+    """
+    async with _profiling_lock:
+        # Tracing may have been started when the bot was, in which case it's left running
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+        try:
+            before = tracemalloc.take_snapshot().filter_traces(_TRACEMALLOC_FILTERS)
+            start_size, _ = tracemalloc.get_traced_memory()
+
+            new_locals = await eval_context.run_eval()
+
+            after = tracemalloc.take_snapshot().filter_traces(_TRACEMALLOC_FILTERS)
+            end_size, peak_size = tracemalloc.get_traced_memory()
+        finally:
+            if started:
+                tracemalloc.stop()
+
+    differences = after.compare_to(before, "lineno")[:limit]
+    report = [
+        f"Net change: {(end_size - start_size) / 1024:+.1f} KiB, peak: {(peak_size - start_size) / 1024:.1f} KiB",
+        *(str(difference) for difference in differences),
+    ]
+    return new_locals, "\n".join(report)
+
+
+async def time_eval(eval_context: EvalContext, number: int) -> tuple[Namespace, str]:
+    """
+    Run the evaluation `number` times, returning the updated locals and percentiles of how long each run took.
+
+    The code is compiled and run once beforehand as a warm up, so only running it is timed. Timing stops at the
+    first run which raises, and only the warm up's output is kept.
+    """
+    new_locals = await eval_context.run_eval()
+    if eval_context.exc_info:
+        return new_locals, "Not timed, as the warm up run raised an exception."
+
+    stdout = eval_context.stdout
+    output_length = stdout.tell()
+
+    timings = []
+    for _ in range(number):
+        start = time.perf_counter()
+        await eval_context.function()
+        timings.append(time.perf_counter() - start)
+
+        # Output from the timed runs is dropped, so it isn't repeated `number` times
+        stdout.truncate(output_length)
+        stdout.seek(output_length)
+
+        if eval_context.exc_info:
+            break
+
+    ordered = sorted(timings)
+    report = [
+        f"{len(timings)} run{'s' if len(timings) != 1 else ''}, {_format_duration(sum(timings))} in total",
+        f"min: {_format_duration(ordered[0])}, mean: {_format_duration(sum(timings) / len(timings))}, "
+        f"max: {_format_duration(ordered[-1])}",
+        ", ".join(f"p{percent}: {_format_duration(_percentile(ordered, percent))}" for percent in PERCENTILES),
+    ]
+    return new_locals, "\n".join(report)
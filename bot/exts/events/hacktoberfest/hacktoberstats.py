@@ -1,7 +1,10 @@
+import asyncio
+import json
 import logging
 import random
 import re
 from collections import Counter
+from collections.abc import Iterable
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from urllib.parse import quote_plus
@@ -9,6 +12,7 @@ from urllib.parse import quote_plus
 import discord
 from async_rediscache import RedisCache
 from discord.ext import commands
+from redis import RedisError
 
 from bot.bot import Bot
 from bot.constants import Colours, Month, NEGATIVE_REPLIES, Tokens
@@ -27,6 +31,14 @@ if GITHUB_TOKEN := Tokens.github:
     REQUEST_HEADERS["Authorization"] = f"token {GITHUB_TOKEN}"
     GITHUB_TOPICS_ACCEPT_HEADER["Authorization"] = f"token {GITHUB_TOKEN}"
 
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+# How many repositories' topics are looked up in one GraphQL query
+TOPICS_BATCH_SIZE = 50
+# How long whether a repository has the hacktoberfest topic is cached for, in seconds
+TOPICS_CACHE_TTL = 60 * 60
+# The most requests which will be made to GitHub at once, across every invocation of the command
+MAX_CONCURRENT_REQUESTS = 10
+
 GITHUB_NONEXISTENT_USER_MESSAGE = (
     "The listed users cannot be searched either because the users do not exist "
     "or you do not have permission to view the users."
@@ -41,6 +53,9 @@ class HacktoberStats(commands.Cog):
 
     def __init__(self, bot: Bot):
         self.bot = bot
+        self._request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # Topic lookups in progress, by repository, so that concurrent invocations share them
+        self._topic_lookups: dict[str, asyncio.Task] = {}
 
     @in_month(Month.SEPTEMBER, Month.OCTOBER, Month.NOVEMBER)
     @commands.group(name="hacktoberstats", aliases=("hackstats",), invoke_without_command=True)
@@ -55,8 +70,7 @@ class HacktoberStats(commands.Cog):
         if not github_username:
             author_id, author_mention = self._author_mention_from_context(ctx)
 
-            if await self.linked_accounts.contains(author_id):
-                github_username = await self.linked_accounts.get(author_id)
+            if github_username := await self.linked_accounts.get(author_id):
                 logging.info(f"Getting stats for {author_id} linked GitHub account '{github_username}'")
             else:
                 msg = (
@@ -79,8 +93,7 @@ class HacktoberStats(commands.Cog):
         """
         author_id, author_mention = self._author_mention_from_context(ctx)
         if github_username:
-            if await self.linked_accounts.contains(author_id):
-                old_username = await self.linked_accounts.get(author_id)
+            if old_username := await self.linked_accounts.get(author_id):
                 log.info(f"{author_id} has changed their github link from '{old_username}' to '{github_username}'")
                 await ctx.send(f"{author_mention}, your GitHub username has been updated to: '{github_username}'")
             else:
@@ -245,9 +258,10 @@ class HacktoberStats(commands.Cog):
             return []
 
         logging.info(f"Found {len(jsonresp['items'])} Hacktoberfest PRs for GitHub user: '{github_username}'")
-        outlist = []  # list of pr information dicts that will get returned
         oct3 = datetime(int(CURRENT_YEAR), 10, 3, 23, 59, 59, tzinfo=None)
-        hackto_topics = {}  # cache whether each repo has the appropriate topic (bool values)
+        checks = []  # each PR, along with whether it needs to be approved and be in a repo with the topic
+        needs_approval = []  # PRs which must be merged or approved to be included
+        needs_topic = set()  # repos which must have the 'hacktoberfest' topic for some PRs to be included
         for item in jsonresp["items"]:
             shortname = self._get_shortname(item["repository_url"])
             itemdict = {
@@ -261,45 +275,160 @@ class HacktoberStats(commands.Cog):
 
             # If the PR has 'invalid' or 'spam' labels, the PR must be
             # either merged or approved for it to be included
-            if self._has_label(item, ["invalid", "spam"]):
-                if not await self._is_accepted(itemdict):
-                    continue
-
-            # PRs before oct 3 no need to check for topics
-            # continue the loop if 'hacktoberfest-accepted' is labelled then
-            # there is no need to check for its topics
-            if itemdict["created_at"] < oct3:
-                outlist.append(itemdict)
-                continue
+            approval_needed = self._has_label(item, ["invalid", "spam"])
+            if approval_needed:
+                needs_approval.append(itemdict)
+
+            # PRs after oct 3 that don't have the 'hacktoberfest-accepted' label
+            # must be in a repo with the 'hacktoberfest' topic
+            topic_needed = itemdict["created_at"] >= oct3 and not self._has_label(item, "hacktoberfest-accepted")
+            if topic_needed:
+                needs_topic.add(shortname)
+
+            checks.append((itemdict, approval_needed, topic_needed))
+
+        # Every check is made at once, rather than one PR at a time
+        approved, hacktoberfest_repos = await asyncio.gather(
+            asyncio.gather(*(self._is_accepted(itemdict) for itemdict in needs_approval)),
+            self._get_hacktoberfest_repos(needs_topic),
+        )
+        approved = iter(approved)
 
-            # Checking PR's labels for "hacktoberfest-accepted"
-            if self._has_label(item, "hacktoberfest-accepted"):
-                outlist.append(itemdict)
+        outlist = []  # list of pr information dicts that will get returned
+        for itemdict, approval_needed, topic_needed in checks:
+            if approval_needed and not next(approved):
                 continue
-
-            # No need to query GitHub if repo topics are fetched before already
-            if hackto_topics.get(shortname):
-                outlist.append(itemdict)
+            if topic_needed and itemdict["repo_shortname"] not in hacktoberfest_repos:
                 continue
-            # Fetch topics for the PR's repo
-            topics_query_url = f"https://api.github.com/repos/{shortname}/topics"
-            log.debug(f"Fetching repo topics for {shortname} with url: {topics_query_url}")
-            jsonresp2 = await self._fetch_url(topics_query_url, GITHUB_TOPICS_ACCEPT_HEADER)
-            if jsonresp2.get("names") is None:
-                log.error(f"Error fetching topics for {shortname}: {jsonresp2['message']}")
-                continue  # Assume the repo doesn't have the `hacktoberfest` topic if API  request errored
-
-            # PRs after oct 3 that doesn't have 'hacktoberfest-accepted' label
-            # must be in repo with 'hacktoberfest' topic
-            if "hacktoberfest" in jsonresp2["names"]:
-                hackto_topics[shortname] = True  # Cache result in the dict for later use if needed
-                outlist.append(itemdict)
+            outlist.append(itemdict)
         return outlist
 
-    async def _fetch_url(self, url: str, headers: dict, params: dict) -> dict:
-        """Retrieve API response from URL."""
-        async with self.bot.http_session.get(url, headers=headers, params=params) as resp:
-            return await resp.json()
+    async def _get_hacktoberfest_repos(self, shortnames: set[str]) -> set[str]:
+        """
+        Return which of the repositories in `shortnames` have the 'hacktoberfest' topic.
+
+        Whether each repository has the topic is cached in Redis for `TOPICS_CACHE_TTL`. The rest are looked up in
+        batches, which concurrent invocations share. A repository whose topics couldn't be fetched is assumed not to
+        have the topic, and isn't cached.
+        """
+        if not shortnames:
+            return set()
+
+        results = await self._get_cached_topics(shortnames)
+
+        missing = [shortname for shortname in shortnames if shortname not in results]
+        new = [shortname for shortname in missing if shortname not in self._topic_lookups]
+        if new:
+            task = asyncio.create_task(self._fetch_topics(new))
+            for shortname in new:
+                self._topic_lookups[shortname] = task
+            task.add_done_callback(lambda _: self._finish_topic_lookup(new, task))
+
+        # Shielded so that one invocation being cancelled doesn't cancel the lookup for the others.
+        lookups = {self._topic_lookups[shortname] for shortname in missing}
+        for fetched in await asyncio.gather(*(asyncio.shield(lookup) for lookup in lookups)):
+            results.update(fetched)
+
+        return {shortname for shortname, has_topic in results.items() if has_topic}
+
+    def _finish_topic_lookup(self, shortnames: list[str], task: asyncio.Task) -> None:
+        for shortname in shortnames:
+            if self._topic_lookups.get(shortname) is task:
+                del self._topic_lookups[shortname]
+
+    def _topics_key(self, shortname: str) -> str:
+        return f"{self.bot.redis_session.global_namespace}.HacktoberStats.topics:{shortname.casefold()}"
+
+    async def _get_cached_topics(self, shortnames: Iterable[str]) -> dict[str, bool]:
+        """Return whether each repository in `shortnames` which is cached in Redis has the 'hacktoberfest' topic."""
+        shortnames = list(shortnames)
+        try:
+            values = await self.bot.redis_session.client.mget([self._topics_key(name) for name in shortnames])
+        except RedisError:
+            log.exception("Failed to get cached repository topics from Redis.")
+            return {}
+
+        return {name: bool(int(value)) for name, value in zip(shortnames, values) if value is not None}
+
+    async def _fetch_topics(self, shortnames: list[str]) -> dict[str, bool]:
+        """
+        Fetch whether each repository in `shortnames` has the 'hacktoberfest' topic, and cache the results.
+
+        With a GitHub token, the topics are fetched in batches with GraphQL. Otherwise, each repository's topics
+        are fetched from the REST API, concurrently.
+        """
+        if GITHUB_TOKEN:
+            batches = [
+                shortnames[start:start + TOPICS_BATCH_SIZE] for start in range(0, len(shortnames), TOPICS_BATCH_SIZE)
+            ]
+            fetched = {}
+            for batch in await asyncio.gather(*(self._fetch_topics_batch(batch) for batch in batches)):
+                fetched.update(batch)
+        else:
+            has_topics = await asyncio.gather(*(self._fetch_repo_topics(shortname) for shortname in shortnames))
+            fetched = {
+                shortname: has_topic
+                for shortname, has_topic in zip(shortnames, has_topics)
+                if has_topic is not None
+            }
+
+        if fetched:
+            try:
+                async with self.bot.redis_session.client.pipeline() as pipe:
+                    for shortname, has_topic in fetched.items():
+                        pipe.set(self._topics_key(shortname), int(has_topic), ex=TOPICS_CACHE_TTL)
+                    await pipe.execute()
+            except RedisError:
+                log.exception("Failed to cache repository topics in Redis.")
+
+        return fetched
+
+    async def _fetch_topics_batch(self, shortnames: list[str]) -> dict[str, bool]:
+        """Fetch whether each repository in `shortnames` has the 'hacktoberfest' topic in one GraphQL query."""
+        fields = []
+        for index, shortname in enumerate(shortnames):
+            owner, name = shortname.split("/", 1)
+            fields.append(
+                f"r{index}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+                "{ repositoryTopics(first: 100) { nodes { topic { name } } } }"
+            )
+        query = "query { " + " ".join(fields) + " }"
+
+        log.debug(f"Fetching repo topics for {len(shortnames)} repos with GraphQL")
+        async with self._request_slots:
+            async with self.bot.http_session.post(
+                GITHUB_GRAPHQL_URL, headers=REQUEST_HEADERS, json={"query": query}
+            ) as resp:
+                jsonresp = await resp.json()
+
+        data = jsonresp.get("data") or {}
+        if errors := jsonresp.get("errors"):
+            log.error(f"Error fetching topics with GraphQL: {errors[0].get('message')}")
+
+        fetched = {}
+        for index, shortname in enumerate(shortnames):
+            # Repositories which couldn't be fetched, such as ones which were deleted, are null
+            if repository := data.get(f"r{index}"):
+                topics = {node["topic"]["name"] for node in repository["repositoryTopics"]["nodes"]}
+                fetched[shortname] = "hacktoberfest" in topics
+        return fetched
+
+    async def _fetch_repo_topics(self, shortname: str) -> Optional[bool]:
+        """Fetch whether the repository has the 'hacktoberfest' topic, or None if its topics can't be fetched."""
+        topics_query_url = f"https://api.github.com/repos/{shortname}/topics"
+        log.debug(f"Fetching repo topics for {shortname} with url: {topics_query_url}")
+        jsonresp = await self._fetch_url(topics_query_url, GITHUB_TOPICS_ACCEPT_HEADER)
+        if jsonresp.get("names") is None:
+            log.error(f"Error fetching topics for {shortname}: {jsonresp['message']}")
+            return None
+
+        return "hacktoberfest" in jsonresp["names"]
+
+    async def _fetch_url(self, url: str, headers: dict, params: Optional[dict] = None) -> dict:
+        """Retrieve API response from URL, waiting if too many requests are already being made."""
+        async with self._request_slots:
+            async with self.bot.http_session.get(url, headers=headers, params=params) as resp:
+                return await resp.json()
 
     @staticmethod
     def _has_label(pr: dict, labels: Union[list[str], str]) -> bool:
@@ -351,7 +480,7 @@ class HacktoberStats(commands.Cog):
 
         # loop through reviews and check for approval
         for item in jsonresp2:
-            if item.get("status") == "APPROVED":
+            if item.get("state") == "APPROVED":
                 return True
         return False
 
@@ -381,12 +510,16 @@ class HacktoberStats(commands.Cog):
         now = datetime.now()
         oct3 = datetime(CURRENT_YEAR, 10, 3, 23, 59, 59, tzinfo=None)
         in_review = []
-        accepted = []
+        matured = []
         for pr in prs:
             if (pr["created_at"] + timedelta(REVIEW_DAYS)) > now:
                 in_review.append(pr)
-            elif (pr["created_at"] <= oct3) or await self._is_accepted(pr):
-                accepted.append(pr)
+            else:
+                matured.append(pr)
+
+        # PRs after oct 3 are checked all at once, rather than one at a time
+        checked = iter(await asyncio.gather(*(self._is_accepted(pr) for pr in matured if pr["created_at"] > oct3)))
+        accepted = [pr for pr in matured if pr["created_at"] <= oct3 or next(checked)]
 
         return in_review, accepted
 
@@ -1,3 +1,4 @@
+import logging
 from random import choice
 from string import ascii_uppercase
 
@@ -10,6 +11,8 @@ from bot.constants import Colours, NEGATIVE_REPLIES
 from ._game import AlreadyUpdated, Question, QuestionClosed
 from ._scoreboard import Scoreboard
 
+log = logging.getLogger(__name__)
+
 
 class AnswerButton(Button):
     """Button subclass that's used to guess on a particular answer."""
@@ -119,6 +122,16 @@ class QuestionView(View):
 
         labels = ascii_uppercase[:len(self.question.answers)]
 
+        # The correct answer is given as text rather than a letter, so it's looked up once rather than per guess
+        correct_label = next(
+            (label for label, answer in self.question.answers if answer == self.question.correct), None
+        )
+        if correct_label is None:
+            log.warning(
+                f"The correct answer to question {self.question.number}, {self.question.correct!r}, "
+                "isn't one of its options."
+            )
+
         answer_embed = Embed(
             title=f"The correct answer for Question {self.question.number} was...",
             description=self.question.correct
@@ -137,7 +150,7 @@ class QuestionView(View):
             )
 
             for answer, people_answered in answers_chosen.items():
-                is_correct_answer = dict(self.question.answers)[answer[0]] == self.question.correct
+                is_correct_answer = answer[0] == correct_label
 
                 # Setting the color of answer_embed to the % of people that got it correct via the mapping
                 if is_correct_answer:
@@ -159,7 +172,7 @@ class QuestionView(View):
 
             # Assign points to users
             for user_id, answer in guesses.items():
-                if dict(self.question.answers)[answer[0]] == self.question.correct:
+                if answer[0] == correct_label:
                     scoreboard.assign_points(
                         int(user_id),
                         points=(1 - (answer[-1] / self.question.time) / 2) * self.question.max_points,
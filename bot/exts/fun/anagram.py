@@ -9,6 +9,7 @@ from discord.ext import commands
 
 from bot.bot import Bot
 from bot.constants import Colours
+from bot.utils.listener_filters import listener_filter
 
 log = logging.getLogger(__name__)
 
@@ -91,12 +92,10 @@ class Anagram(commands.Cog):
         # Game is finished, let's remove it from the dict
         self.games.pop(ctx.channel.id)
 
+    @listener_filter(ignore_bots=True, ignore_dms=True)
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
         """Check a message for an anagram attempt and pass to an ongoing game."""
-        if message.author.bot or not message.guild:
-            return
-
         game = self.games.get(message.channel.id)
         if not game:
             return
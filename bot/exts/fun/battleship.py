@@ -4,7 +4,8 @@ import random
 import re
 from dataclasses import dataclass
 from functools import partial
-from typing import Optional
+from itertools import product
+from typing import Optional, Union
 
 import discord
 from discord.ext import commands
@@ -26,16 +27,7 @@ class Square:
 Grid = list[list[Square]]
 EmojiSet = dict[tuple[bool, bool], str]
 
-
-@dataclass
-class Player:
-    """Each player in the game - their messages for the boards and their current grid."""
-
-    user: Optional[discord.Member]
-    board: Optional[discord.Message]
-    opponent_board: discord.Message
-    grid: Grid
-
+GRID_SIZE = 10
 
 # The name of the ship and its size
 SHIPS = {
@@ -90,6 +82,144 @@ NUMBERS = [
 CROSS_EMOJI = "\u274e"
 HAND_RAISED_EMOJI = "\U0001f64b"
 
+# How much more likely the AI thinks a ship placement is for each unsunk hit it covers
+HIT_WEIGHT = 50
+
+# How long the AI pretends to think for before taking its shot, in seconds
+AI_DELAY = 1.5
+
+
+class Fleet:
+    """
+    A player's grid and the ships placed on it.
+
+    The number of squares left to hit on each ship is kept as shots land, so checking whether a ship or the whole
+    fleet has sunk doesn't need to look at the grid. Each row is rendered once per emoji set, and only rendered
+    again after being shot at.
+    """
+
+    def __init__(self):
+        self.grid: Grid = [[Square(None, False) for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.remaining: dict[str, int] = {}
+        self.ships_afloat = 0
+
+        # Rendered rows for each emoji set, keyed by its id, where None is a row which needs rendering again
+        self._rows: dict[int, list[Optional[str]]] = {}
+
+    @property
+    def all_sunk(self) -> bool:
+        """Whether every ship in the fleet has been sunk."""
+        return self.ships_afloat == 0
+
+    def is_sunk(self, boat: str) -> bool:
+        """Whether every square of the boat has been hit."""
+        return self.remaining[boat] == 0
+
+    def place_ships(self) -> None:
+        """Places the boats randomly on the grid."""
+        for name, size in SHIPS.items():
+            while True:  # Repeats if about to overwrite another boat
+                coord1 = random.randint(0, GRID_SIZE - 1)
+                coord2 = random.randint(0, GRID_SIZE - size)
+
+                if random.choice((True, False)):  # Vertical or Horizontal
+                    coords = [(coord1, coord2 + i) for i in range(size)]
+                else:
+                    coords = [(coord2 + i, coord1) for i in range(size)]
+
+                # If not overwriting any other boat spaces, break loop
+                if not any(self.grid[x][y].boat for x, y in coords):
+                    break
+
+            for x, y in coords:
+                self.grid[x][y].boat = name
+            self.remaining[name] = size
+            self.ships_afloat += 1
+
+    def aim(self, row: int, column: int) -> Optional[str]:
+        """Fire at a square, returning the name of the boat hit if there was one."""
+        square = self.grid[row][column]
+        square.aimed = True
+        for rows in self._rows.values():
+            rows[row] = None
+
+        if square.boat:
+            self.remaining[square.boat] -= 1
+            if self.is_sunk(square.boat):
+                self.ships_afloat -= 1
+        return square.boat
+
+    def render(self, emojiset: EmojiSet) -> str:
+        """
+        Gets and formats the grid as a string to be output to the DM.
+
+        Also adds the Letter and Number indexes.
+        """
+        rows = self._rows.setdefault(id(emojiset), [None] * GRID_SIZE)
+        for index, row in enumerate(rows):
+            if row is None:
+                rows[index] = NUMBERS[index] + "".join(
+                    emojiset[bool(square.boat), square.aimed] for square in self.grid[index]
+                )
+        return "\n".join([LETTERS, *rows])
+
+
+def choose_target(fleet: Fleet) -> tuple[int, int]:
+    """
+    Pick the square to fire at on the opposing fleet, by how many ways the ships still afloat could cover it.
+
+    Only what a player could know is used: where they've aimed, which shots hit, and which ships have sunk. Placements
+    covering hits on ships which haven't sunk yet are weighted much more heavily, so the AI finishes off ships it
+    has found before hunting for more.
+    """
+    # Squares which can't be part of a ship still afloat, being misses or parts of sunk ships
+    blocked = set()
+    hits = set()
+    for x, row in enumerate(fleet.grid):
+        for y, square in enumerate(row):
+            if square.aimed:
+                if square.boat and not fleet.is_sunk(square.boat):
+                    hits.add((x, y))
+                else:
+                    blocked.add((x, y))
+
+    density = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
+    for name, size in SHIPS.items():
+        if fleet.is_sunk(name):
+            continue
+        for x, y in product(range(GRID_SIZE), range(GRID_SIZE - size + 1)):
+            for coords in ([(x, y + i) for i in range(size)], [(y + i, x) for i in range(size)]):
+                if any(coord in blocked for coord in coords):
+                    continue
+                weight = HIT_WEIGHT ** sum(coord in hits for coord in coords)
+                for x_, y_ in coords:
+                    density[x_][y_] += weight
+
+    targets = [
+        (density[x][y], (x, y))
+        for x, y in product(range(GRID_SIZE), repeat=2)
+        if not fleet.grid[x][y].aimed
+    ]
+    best = max(score for score, _ in targets)
+    return random.choice([coords for score, coords in targets if score == best])
+
+
+@dataclass
+class Player:
+    """Each player in the game - their messages for the boards and their fleet, and whether they're the AI."""
+
+    user: Union[discord.Member, discord.ClientUser]
+    board: Optional[discord.Message]
+    opponent_board: Optional[discord.Message]
+    fleet: Fleet
+    ai: bool = False
+
+    async def send(self, *args, **kwargs) -> Optional[discord.Message]:
+        """Send a DM to the player, unless they're the AI."""
+        if self.ai:
+            return None
+        return await self.user.send(*args, **kwargs)
+
 
 class Game:
     """A Battleship Game."""
@@ -99,14 +229,17 @@ class Game:
         bot: Bot,
         channel: discord.TextChannel,
         player1: discord.Member,
-        player2: discord.Member
+        player2: Optional[discord.Member]
     ):
-
+        """Set up a game between two players, or against the AI if `player2` is None."""
         self.bot = bot
         self.public_channel = channel
 
-        self.p1 = Player(player1, None, None, self.generate_grid())
-        self.p2 = Player(player2, None, None, self.generate_grid())
+        self.p1 = Player(player1, None, None, Fleet())
+        if player2:
+            self.p2 = Player(player2, None, None, Fleet())
+        else:
+            self.p2 = Player(bot.user, None, None, Fleet(), ai=True)
 
         self.gameover: bool = False
 
@@ -114,37 +247,24 @@ class Game:
         self.next: Optional[Player] = None
 
         self.match: Optional[re.Match] = None
+        # The square aimed at this turn, as typed
+        self.target: Optional[str] = None
         self.surrender: bool = False
 
         self.setup_grids()
 
     @staticmethod
-    def generate_grid() -> Grid:
-        """Generates a grid by instantiating the Squares."""
-        return [[Square(None, False) for _ in range(10)] for _ in range(10)]
-
-    @staticmethod
-    def format_grid(player: Player, emojiset: EmojiSet) -> str:
-        """
-        Gets and formats the grid as a list into a string to be output to the DM.
-
-        Also adds the Letter and Number indexes.
-        """
-        grid = [
-            [emojiset[bool(square.boat), square.aimed] for square in row]
-            for row in player.grid
-        ]
-
-        rows = ["".join([number] + row) for number, row in zip(NUMBERS, grid)]
-        return "\n".join([LETTERS] + rows)
-
-    @staticmethod
-    def get_square(grid: Grid, square: str) -> Square:
-        """Grabs a square from a grid with an inputted key."""
+    def get_coordinates(square: str) -> tuple[int, int]:
+        """Get the row and column of a square from an inputted key."""
         index = ord(square[0].upper()) - ord("A")
         number = int(square[1:])
 
-        return grid[number-1][index]  # -1 since lists are indexed from 0
+        return number - 1, index  # -1 since lists are indexed from 0
+
+    @staticmethod
+    def get_label(row: int, column: int) -> str:
+        """Get the key of a square from its row and column."""
+        return f"{chr(ord('A') + column)}{row + 1}"
 
     async def game_over(
         self,
@@ -156,56 +276,20 @@ class Game:
         await self.public_channel.send(f"Game Over! {winner.mention} won against {loser.mention}")
 
         for player in (self.p1, self.p2):
-            grid = self.format_grid(player, SHIP_EMOJIS)
+            grid = player.fleet.render(SHIP_EMOJIS)
             await self.public_channel.send(f"{player.user}'s Board:\n{grid}")
 
-    @staticmethod
-    def check_sink(grid: Grid, boat: str) -> bool:
-        """Checks if all squares containing a given boat have sunk."""
-        return all(square.aimed for row in grid for square in row if square.boat == boat)
-
-    @staticmethod
-    def check_gameover(grid: Grid) -> bool:
-        """Checks if all boats have been sunk."""
-        return all(square.aimed for row in grid for square in row if square.boat)
-
     def setup_grids(self) -> None:
         """Places the boats on the grids to initialise the game."""
         for player in (self.p1, self.p2):
-            for name, size in SHIPS.items():
-                while True:  # Repeats if about to overwrite another boat
-                    ship_collision = False
-                    coords = []
-
-                    coord1 = random.randint(0, 9)
-                    coord2 = random.randint(0, 10 - size)
-
-                    if random.choice((True, False)):  # Vertical or Horizontal
-                        x, y = coord1, coord2
-                        xincr, yincr = 0, 1
-                    else:
-                        x, y = coord2, coord1
-                        xincr, yincr = 1, 0
-
-                    for i in range(size):
-                        new_x = x + (xincr * i)
-                        new_y = y + (yincr * i)
-                        if player.grid[new_x][new_y].boat:  # Check if there's already a boat
-                            ship_collision = True
-                            break
-                        coords.append((new_x, new_y))
-                    if not ship_collision:  # If not overwriting any other boat spaces, break loop
-                        break
-
-                for x, y in coords:
-                    player.grid[x][y].boat = name
+            player.fleet.place_ships()
 
     async def print_grids(self) -> None:
-        """Prints grids to the DM channels."""
+        """Prints grids to the DM channels, only editing the boards which have changed."""
         # Convert squares into Emoji
 
         boards = [
-            self.format_grid(player, emojiset)
+            player.fleet.render(emojiset)
             for emojiset in (HIDDEN_EMOJIS, SHIP_EMOJIS)
             for player in (self.p1, self.p2)
         ]
@@ -217,8 +301,11 @@ class Game:
 
         for board, location in zip(boards, locations):
             player, attr = location
-            if getattr(player, attr):
-                await getattr(player, attr).edit(content=board)
+            if player.ai:
+                continue
+            if message := getattr(player, attr):
+                if message.content != board:
+                    setattr(player, attr, await message.edit(content=board))
             else:
                 setattr(player, attr, await player.user.send(board))
 
@@ -233,20 +320,38 @@ class Game:
                 self.bot.loop.create_task(message.add_reaction(CROSS_EMOJI))
             return bool(self.match)
 
-    async def take_turn(self) -> Optional[Square]:
-        """Lets the player who's turn it is choose a square."""
-        square = None
+    async def take_ai_turn(self) -> tuple[int, int]:
+        """Lets the AI choose a square."""
+        await self.next.send("Their turn", delete_after=3.0)
+        await asyncio.sleep(AI_DELAY)
+
+        row, column = choose_target(self.next.fleet)
+        self.target = self.get_label(row, column)
+        return row, column
+
+    async def take_turn(self) -> Optional[tuple[int, int]]:
+        """Lets the player who's turn it is choose a square, returning its row and column."""
+        if self.turn.ai:
+            return await self.take_ai_turn()
+
+        coordinates = None
         turn_message = await self.turn.user.send(
             "It's your turn! Type the square you want to fire at. Format it like this: A1\n"
             "Type `surrender` to give up."
         )
-        await self.next.user.send("Their turn", delete_after=3.0)
+        await self.next.send("Their turn", delete_after=3.0)
         while True:
             try:
-                await self.bot.wait_for("message", check=self.predicate, timeout=60.0)
+                await self.bot.waiters.wait_for(
+                    "message",
+                    check=self.predicate,
+                    timeout=60.0,
+                    channel_id=turn_message.channel.id,
+                    user_id=self.turn.user.id,
+                )
             except asyncio.TimeoutError:
                 await self.turn.user.send("You took too long. Game over!")
-                await self.next.user.send(f"{self.turn.user} took too long. Game over!")
+                await self.next.send(f"{self.turn.user} took too long. Game over!")
                 await self.public_channel.send(
                     f"Game over! {self.turn.user.mention} timed out so {self.next.user.mention} wins!"
                 )
@@ -254,37 +359,39 @@ class Game:
                 break
             else:
                 if self.surrender:
-                    await self.next.user.send(f"{self.turn.user} surrendered. Game over!")
+                    await self.next.send(f"{self.turn.user} surrendered. Game over!")
                     await self.public_channel.send(
                         f"Game over! {self.turn.user.mention} surrendered to {self.next.user.mention}!"
                     )
                     self.gameover = True
                     break
-                square = self.get_square(self.next.grid, self.match.string)
-                if square.aimed:
+                row, column = self.get_coordinates(self.match.string)
+                if self.next.fleet.grid[row][column].aimed:
                     await self.turn.user.send("You've already aimed at this square!", delete_after=3.0)
                 else:
+                    coordinates = row, column
+                    self.target = self.match.string
                     break
         await turn_message.delete()
-        return square
+        return coordinates
 
-    async def hit(self, square: Square, alert_messages: list[discord.Message]) -> None:
+    async def hit(self, boat: str, alert_messages: list[discord.Message]) -> None:
         """Occurs when a player successfully aims for a ship."""
-        await self.turn.user.send("Hit!", delete_after=3.0)
-        alert_messages.append(await self.next.user.send("Hit!"))
-        if self.check_sink(self.next.grid, square.boat):
-            await self.turn.user.send(f"You've sunk their {square.boat} ship!", delete_after=3.0)
-            alert_messages.append(await self.next.user.send(f"Oh no! Your {square.boat} ship sunk!"))
-            if self.check_gameover(self.next.grid):
-                await self.turn.user.send("You win!")
-                await self.next.user.send("You lose!")
+        await self.turn.send("Hit!", delete_after=3.0)
+        alert_messages.append(await self.next.send("Hit!"))
+        if self.next.fleet.is_sunk(boat):
+            await self.turn.send(f"You've sunk their {boat} ship!", delete_after=3.0)
+            alert_messages.append(await self.next.send(f"Oh no! Your {boat} ship sunk!"))
+            if self.next.fleet.all_sunk:
+                await self.turn.send("You win!")
+                await self.next.send("You lose!")
                 self.gameover = True
                 await self.game_over(winner=self.turn.user, loser=self.next.user)
 
     async def start_game(self) -> None:
         """Begins the game."""
-        await self.p1.user.send(f"You're playing battleship with {self.p2.user}.")
-        await self.p2.user.send(f"You're playing battleship with {self.p1.user}.")
+        await self.p1.send(f"You're playing battleship with {self.p2.user}.")
+        await self.p2.send(f"You're playing battleship with {self.p1.user}.")
 
         alert_messages = []
 
@@ -297,24 +404,25 @@ class Game:
             if self.gameover:
                 return
 
-            square = await self.take_turn()
-            if not square:
+            coordinates = await self.take_turn()
+            if not coordinates:
                 return
-            square.aimed = True
+            boat = self.next.fleet.aim(*coordinates)
 
             for message in alert_messages:
-                await message.delete()
+                if message:
+                    await message.delete()
 
             alert_messages = []
-            alert_messages.append(await self.next.user.send(f"{self.turn.user} aimed at {self.match.string}!"))
+            alert_messages.append(await self.next.send(f"{self.turn.user} aimed at {self.target}!"))
 
-            if square.boat:
-                await self.hit(square, alert_messages)
+            if boat:
+                await self.hit(boat, alert_messages)
                 if self.gameover:
                     return
             else:
-                await self.turn.user.send("Miss!", delete_after=3.0)
-                alert_messages.append(await self.next.user.send("Miss!"))
+                await self.turn.send("Miss!", delete_after=3.0)
+                alert_messages.append(await self.next.send("Miss!"))
 
             self.turn, self.next = self.next, self.turn
 
@@ -395,10 +503,11 @@ class Battleship(commands.Cog):
         await announcement.add_reaction(CROSS_EMOJI)
 
         try:
-            reaction, user = await self.bot.wait_for(
+            reaction, user = await self.bot.waiters.wait_for(
                 "reaction_add",
                 check=partial(self.predicate, ctx, announcement),
-                timeout=60.0
+                timeout=60.0,
+                message_id=announcement.id,
             )
         except asyncio.TimeoutError:
             self.waiting.remove(ctx.author)
@@ -416,23 +525,46 @@ class Battleship(commands.Cog):
         self.waiting.remove(ctx.author)
         if self.already_playing(ctx.author):
             return
+        await self._play_game(ctx, user)
+
+    async def _play_game(self, ctx: commands.Context, user: Optional[discord.Member]) -> None:
+        """Play a game against `user`, or the AI if they're None, ending it if anything goes wrong."""
         game = Game(self.bot, ctx.channel, ctx.author, user)
+        mentions = " ".join(player.user.mention for player in (game.p1, game.p2) if not player.ai)
         self.games.append(game)
         try:
             await game.start_game()
             self.games.remove(game)
         except discord.Forbidden:
             await ctx.send(
-                f"{ctx.author.mention} {user.mention} "
+                f"{mentions} "
                 "Game failed. This is likely due to you not having your DMs open. Check and try again."
             )
             self.games.remove(game)
         except Exception:
             # End the game in the event of an unforseen error so the players aren't stuck in a game
-            await ctx.send(f"{ctx.author.mention} {user.mention} An error occurred. Game failed.")
+            await ctx.send(f"{mentions} An error occurred. Game failed.")
             self.games.remove(game)
             raise
 
+    @battleship.command(name="ai", aliases=("bot", "computer", "cpu"))
+    async def battleship_ai(self, ctx: commands.Context) -> None:
+        """
+        Play a game of Battleship against the computer.
+
+        The computer aims where the ships it hasn't sunk yet are most likely to be.
+        The game takes place entirely in DMs.
+        """
+        if self.already_playing(ctx.author):
+            await ctx.send("You're already playing a game!")
+            return
+
+        if ctx.author in self.waiting:
+            await ctx.send("You've already sent out a request for a player 2.")
+            return
+
+        await self._play_game(ctx, None)
+
     @battleship.command(name="ships", aliases=("boats",))
     async def battleship_ships(self, ctx: commands.Context) -> None:
         """Lists the ships that are found on the battleship grid."""
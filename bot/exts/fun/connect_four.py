@@ -1,7 +1,8 @@
 import asyncio
 import random
+import time
 from functools import partial
-from typing import Optional, Union
+from typing import Literal, NamedTuple, Optional, Union
 
 import discord
 import emojis
@@ -17,6 +18,220 @@ CROSS_EMOJI = Emojis.incident_unactioned
 Coordinate = Optional[tuple[int, int]]
 EMOJI_CHECK = Union[discord.Emoji, str]
 
+# Scores at least this far from 0 mean a forced win or loss was found, rather than a heuristic guess
+WIN_SCORE = 100_000
+# The transposition table is cleared once it grows past this many positions, to keep memory bounded
+TABLE_LIMIT = 500_000
+
+
+class Difficulty(NamedTuple):
+    """How hard the AI tries, as a search depth (None for no limit), a time budget and a chance of a random move."""
+
+    max_depth: Optional[int]
+    time_budget: float
+    mistake_chance: float
+
+
+DIFFICULTIES = {
+    "easy": Difficulty(max_depth=2, time_budget=0.5, mistake_chance=0.2),
+    "medium": Difficulty(max_depth=5, time_budget=1.0, mistake_chance=0.05),
+    "hard": Difficulty(max_depth=None, time_budget=3.0, mistake_chance=0),
+}
+
+
+def _is_win(bitboard: int, column_bits: int) -> bool:
+    """Check if a player's bitboard has four in a row, in any direction."""
+    for shift in (1, column_bits - 1, column_bits, column_bits + 1):
+        pairs = bitboard & (bitboard >> shift)
+        if pairs & (pairs >> 2 * shift):
+            return True
+    return False
+
+
+def _winning_squares(bitboard: int, column_bits: int) -> int:
+    """Return a bitboard of every square that would complete four in a row, whether it's free or not."""
+    squares = (bitboard << 1) & (bitboard << 2) & (bitboard << 3)
+    for shift in (column_bits - 1, column_bits, column_bits + 1):
+        pairs = (bitboard << shift) & (bitboard << 2 * shift)
+        squares |= pairs & (bitboard << 3 * shift)
+        squares |= pairs & (bitboard >> shift)
+        pairs = (bitboard >> shift) & (bitboard >> 2 * shift)
+        squares |= pairs & (bitboard << shift)
+        squares |= pairs & (bitboard >> 3 * shift)
+    return squares
+
+
+class Board:
+    """
+    A Connect Four board, stored as one bitboard per player.
+
+    Each column takes `size + 1` bits from the bottom row upwards, with an extra bit on top that's always empty
+    so that lines can't wrap from one column into the next. A win can then be checked with a few shifts.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.column_bits = size + 1
+        self.players = [0, 0]
+        # The next free bit in each column
+        self.heights = [column * self.column_bits for column in range(size)]
+        self.moves = 0
+
+    @property
+    def mask(self) -> int:
+        """A bitboard of every counter on the board."""
+        return self.players[0] | self.players[1]
+
+    def can_play(self, column: int) -> bool:
+        """Check whether `column` has room for another counter."""
+        return self.heights[column] % self.column_bits < self.size
+
+    def playable_columns(self) -> list[int]:
+        """Return every column that has room for another counter."""
+        return [column for column in range(self.size) if self.can_play(column)]
+
+    def play(self, column: int, player_num: int) -> int:
+        """Drop a counter for `player_num` into `column`, returning the row it landed in counted from the top."""
+        bit = self.heights[column]
+        self.players[player_num - 1] |= 1 << bit
+        self.heights[column] += 1
+        self.moves += 1
+        return self.size - 1 - bit % self.column_bits
+
+    def has_won(self, player_num: int) -> bool:
+        """Check whether `player_num` has four in a row."""
+        return _is_win(self.players[player_num - 1], self.column_bits)
+
+    def is_full(self) -> bool:
+        """Check whether every square has been played."""
+        return self.moves == self.size ** 2
+
+    def rows(self) -> list[list[int]]:
+        """Return the board as rows from the top down, with 0 for an empty square or else the player's number."""
+        rows = []
+        for row in reversed(range(self.size)):
+            squares = []
+            for column in range(self.size):
+                bit = 1 << (column * self.column_bits + row)
+                squares.append(1 if self.players[0] & bit else 2 if self.players[1] & bit else 0)
+            rows.append(squares)
+        return rows
+
+
+class _OutOfTime(Exception):
+    """Raised to abandon a search once its time budget runs out."""
+
+
+class Engine:
+    """
+    Picks moves using a negamax search with alpha-beta pruning and a transposition table.
+
+    The search deepens iteratively, and the move from the deepest search completed within the time budget is used.
+    Positions are given from the point of view of the player to move, as a bitboard of their counters along with
+    a bitboard of every counter.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.column_bits = size + 1
+        self.cells = size ** 2
+
+        self.bottom = [1 << (column * self.column_bits) for column in range(size)]
+        self.top = [1 << (column * self.column_bits + size - 1) for column in range(size)]
+        self.columns = [((1 << size) - 1) << (column * self.column_bits) for column in range(size)]
+        self.board_mask = sum(self.columns)
+        self.centre_mask = self.columns[size // 2]
+        # Moves near the centre tend to be better, so searching them first prunes more
+        self.order = sorted(range(size), key=lambda column: abs(size // 2 - column))
+
+        # Maps a position's key to (depth, flag, score, best column), where the flag is -1, 0 or 1
+        # for an upper bound, an exact score or a lower bound respectively
+        self.table: dict[int, tuple[int, int, int, int]] = {}
+        self.deadline = 0
+        self.nodes = 0
+
+    def _moves(self, mask: int, first: Optional[int] = None) -> list[tuple[int, int]]:
+        """Return each playable column with the bit a counter played there would take, in search order."""
+        order = self.order if first is None else [first, *(column for column in self.order if column != first)]
+        return [
+            (column, (mask + self.bottom[column]) & self.columns[column])
+            for column in order
+            if not mask & self.top[column]
+        ]
+
+    def evaluate(self, position: int, mask: int) -> int:
+        """Score a position for the player to move, by how many open squares would win for each player."""
+        opponent = position ^ mask
+        empty = self.board_mask & ~mask
+        threats = (_winning_squares(position, self.column_bits) & empty).bit_count()
+        opponent_threats = (_winning_squares(opponent, self.column_bits) & empty).bit_count()
+        centre = (position & self.centre_mask).bit_count() - (opponent & self.centre_mask).bit_count()
+        return 4 * (threats - opponent_threats) + centre
+
+    def negamax(self, position: int, mask: int, moves: int, depth: int, alpha: int, beta: int) -> tuple[int, int]:
+        """Return the score of a position for the player to move, along with the best column to play."""
+        self.nodes += 1
+        if not self.nodes % 1024 and time.monotonic() > self.deadline:
+            raise _OutOfTime
+
+        key = position + mask
+        entry = self.table.get(key)
+        candidates = self._moves(mask, entry[3] if entry else None)
+
+        for column, move in candidates:
+            if _is_win(position | move, self.column_bits):
+                return WIN_SCORE - moves, column
+        if moves + 1 >= self.cells:
+            return 0, candidates[0][0]
+        if depth == 0:
+            return self.evaluate(position, mask), candidates[0][0]
+
+        if entry and entry[0] >= depth:
+            _, flag, score, column = entry
+            if flag == 0 or (flag > 0 and score >= beta) or (flag < 0 and score <= alpha):
+                return score, column
+
+        original_alpha = alpha
+        best_score, best_column = -2 * WIN_SCORE, candidates[0][0]
+        for column, move in candidates:
+            # The opponent's counters are every counter that isn't ours, before this move is added
+            score = -self.negamax(position ^ mask, mask | move, moves + 1, depth - 1, -beta, -alpha)[0]
+            if score > best_score:
+                best_score, best_column = score, column
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = -1
+        elif best_score >= beta:
+            flag = 1
+        else:
+            flag = 0
+        self.table[key] = (depth, flag, best_score, best_column)
+
+        return best_score, best_column
+
+    def best_move(self, position: int, mask: int, moves: int, difficulty: Difficulty) -> int:
+        """Find the best column to play, searching deeper until the depth limit or time budget is reached."""
+        if len(self.table) > TABLE_LIMIT:
+            self.table.clear()
+
+        self.deadline = time.monotonic() + difficulty.time_budget
+        max_depth = min(difficulty.max_depth or self.cells, self.cells - moves)
+
+        best_column = self._moves(mask)[0][0]
+        for depth in range(1, max_depth + 1):
+            try:
+                score, best_column = self.negamax(position, mask, moves, depth, -2 * WIN_SCORE, 2 * WIN_SCORE)
+            except _OutOfTime:
+                break
+            if abs(score) >= WIN_SCORE - self.cells:
+                # The result is forced, so searching any deeper won't change it
+                break
+
+        return best_column
+
 
 class Game:
     """A Connect 4 Game."""
@@ -28,17 +243,19 @@ class Game:
         player1: discord.Member,
         player2: Optional[discord.Member],
         tokens: list[str],
-        size: int = 7
+        size: int = 7,
+        difficulty: str = "medium"
     ):
         self.bot = bot
         self.channel = channel
-        self.player1 = player1
-        self.player2 = player2 or AI(self.bot, game=self)
         self.tokens = tokens
 
-        self.grid = self.generate_board(size)
+        self.board = Board(size)
         self.grid_size = size
 
+        self.player1 = player1
+        self.player2 = player2 or AI(self.bot, game=self, difficulty=difficulty)
+
         self.unicode_numbers = NUMBERS[:self.grid_size]
 
         self.message = None
@@ -46,11 +263,6 @@ class Game:
         self.player_active = None
         self.player_inactive = None
 
-    @staticmethod
-    def generate_board(size: int) -> list[list[int]]:
-        """Generate the connect 4 board."""
-        return [[0 for _ in range(size)] for _ in range(size)]
-
     async def print_grid(self) -> None:
         """Formats and outputs the Connect Four grid to the channel."""
         title = (
@@ -58,18 +270,16 @@ class Game:
             f" VS {self.bot.user.display_name if isinstance(self.player2, AI) else self.player2.display_name}"
         )
 
-        rows = [" ".join(self.tokens[s] for s in row) for row in self.grid]
+        rows = [" ".join(self.tokens[s] for s in row) for row in self.board.rows()]
         first_row = " ".join(x for x in NUMBERS[:self.grid_size])
         formatted_grid = "\n".join([first_row] + rows)
         embed = discord.Embed(title=title, description=formatted_grid)
 
         if self.message:
-            await self.message.edit(embed=embed)
+            self.bot.ui_updates.edit(self.message, embed=embed)
         else:
             self.message = await self.channel.send(content="Loading...")
-            for emoji in self.unicode_numbers:
-                await self.message.add_reaction(emoji)
-            await self.message.add_reaction(CROSS_EMOJI)
+            await self.bot.ui_updates.add_reactions(self.message, [*self.unicode_numbers, CROSS_EMOJI])
             await self.message.edit(content=None, embed=embed)
 
     async def game_over(
@@ -92,7 +302,7 @@ class Game:
             await self.print_grid()
 
             if isinstance(self.player_active, AI):
-                coords = self.player_active.play()
+                coords = await self.player_active.play()
                 if not coords:
                     await self.game_over(
                         "draw",
@@ -105,7 +315,7 @@ class Game:
             if not coords:
                 return
 
-            if self.check_win(coords, 1 if self.player_active == self.player1 else 2):
+            if self.board.has_won(1 if self.player_active == self.player1 else 2):
                 await self.game_over(
                     "win",
                     self.bot.user if isinstance(self.player_active, AI) else self.player_active,
@@ -113,6 +323,14 @@ class Game:
                 )
                 return
 
+            if self.board.is_full():
+                await self.game_over(
+                    "draw",
+                    self.bot.user if isinstance(self.player_active, AI) else self.player_active,
+                    self.bot.user if isinstance(self.player_inactive, AI) else self.player_inactive,
+                )
+                return
+
             self.player_active, self.player_inactive = self.player_inactive, self.player_active
 
     def predicate(self, reaction: discord.Reaction, user: discord.Member) -> bool:
@@ -131,7 +349,13 @@ class Game:
         player_num = 1 if self.player_active == self.player1 else 2
         while True:
             try:
-                reaction, user = await self.bot.wait_for("reaction_add", check=self.predicate, timeout=30.0)
+                reaction, user = await self.bot.waiters.wait_for(
+                    "reaction_add",
+                    check=self.predicate,
+                    timeout=30.0,
+                    message_id=self.message.id,
+                    user_id=self.player_active.id,
+                )
             except asyncio.TimeoutError:
                 await self.channel.send(f"{self.player_active.mention}, you took too long. Game over!")
                 return
@@ -144,114 +368,44 @@ class Game:
                 await self.message.remove_reaction(reaction, user)
 
                 column_num = self.unicode_numbers.index(str(reaction.emoji))
-                column = [row[column_num] for row in self.grid]
-
-                for row_num, square in reversed(list(enumerate(column))):
-                    if not square:
-                        self.grid[row_num][column_num] = player_num
-                        return row_num, column_num
+                if self.board.can_play(column_num):
+                    return self.board.play(column_num, player_num), column_num
                 message = await self.channel.send(f"Column {column_num + 1} is full. Try again")
 
-    def check_win(self, coords: Coordinate, player_num: int) -> bool:
-        """Check that placing a counter here would cause the player to win."""
-        vertical = [(-1, 0), (1, 0)]
-        horizontal = [(0, 1), (0, -1)]
-        forward_diag = [(-1, 1), (1, -1)]
-        backward_diag = [(-1, -1), (1, 1)]
-        axes = [vertical, horizontal, forward_diag, backward_diag]
-
-        for axis in axes:
-            counters_in_a_row = 1  # The initial counter that is compared to
-            for (row_incr, column_incr) in axis:
-                row, column = coords
-                row += row_incr
-                column += column_incr
-
-                while 0 <= row < self.grid_size and 0 <= column < self.grid_size:
-                    if self.grid[row][column] == player_num:
-                        counters_in_a_row += 1
-                        row += row_incr
-                        column += column_incr
-                    else:
-                        break
-            if counters_in_a_row >= 4:
-                return True
-        return False
-
 
 class AI:
     """The Computer Player for Single-Player games."""
 
-    def __init__(self, bot: Bot, game: Game):
+    def __init__(self, bot: Bot, game: Game, difficulty: str = "medium"):
         self.game = game
         self.mention = bot.user.mention
+        self.difficulty = DIFFICULTIES[difficulty]
+        self.engine = Engine(game.grid_size)
 
-    def get_possible_places(self) -> list[Coordinate]:
-        """Gets all the coordinates where the AI could possibly place a counter."""
-        possible_coords = []
-        for column_num in range(self.game.grid_size):
-            column = [row[column_num] for row in self.game.grid]
-            for row_num, square in reversed(list(enumerate(column))):
-                if not square:
-                    possible_coords.append((row_num, column_num))
-                    break
-        return possible_coords
-
-    def check_ai_win(self, coord_list: list[Coordinate]) -> Optional[Coordinate]:
+    def choose_column(self) -> Optional[int]:
         """
-        Check AI win.
+        Choose the column to play in, or None if the board is full.
 
-        Check if placing a counter in any possible coordinate would cause the AI to win
-        with 10% chance of not winning and returning None
+        This searches for the best move, occasionally making a random one instead depending on the difficulty.
+        The search can take up to the difficulty's time budget, so this should be run in an executor.
         """
-        if random.randint(1, 10) == 1:
-            return
-        for coords in coord_list:
-            if self.game.check_win(coords, 2):
-                return coords
+        board = self.game.board
+        columns = board.playable_columns()
+        if not columns:
+            return None
 
-    def check_player_win(self, coord_list: list[Coordinate]) -> Optional[Coordinate]:
-        """
-        Check Player win.
+        if random.random() < self.difficulty.mistake_chance:
+            return random.choice(columns)
 
-        Check if placing a counter in possible coordinates would stop the player
-        from winning with 25% of not blocking them  and returning None.
-        """
-        if random.randint(1, 4) == 1:
-            return
-        for coords in coord_list:
-            if self.game.check_win(coords, 1):
-                return coords
+        return self.engine.best_move(board.players[1], board.mask, board.moves, self.difficulty)
 
-    @staticmethod
-    def random_coords(coord_list: list[Coordinate]) -> Coordinate:
-        """Picks a random coordinate from the possible ones."""
-        return random.choice(coord_list)
-
-    def play(self) -> Union[Coordinate, bool]:
-        """
-        Plays for the AI.
-
-        Gets all possible coords, and determins the move:
-        1. coords where it can win.
-        2. coords where the player can win.
-        3. Random coord
-        The first possible value is choosen.
-        """
-        possible_coords = self.get_possible_places()
-
-        if not possible_coords:
+    async def play(self) -> Union[Coordinate, bool]:
+        """Plays for the AI, choosing the column in an executor so that the search doesn't block the bot."""
+        column = await self.game.bot.loop.run_in_executor(None, self.choose_column)
+        if column is None:
             return False
 
-        coords = (
-            self.check_ai_win(possible_coords)
-            or self.check_player_win(possible_coords)
-            or self.random_coords(possible_coords)
-        )
-
-        row, column = coords
-        self.game.grid[row][column] = 2
-        return coords
+        return self.game.board.play(column, 2), column
 
 
 class ConnectFour(commands.Cog):
@@ -345,14 +499,15 @@ class ConnectFour(commands.Cog):
         user: Optional[discord.Member],
         board_size: int,
         emoji1: str,
-        emoji2: str
+        emoji2: str,
+        difficulty: str = "medium"
     ) -> None:
         """Helper for playing a game of connect four."""
         self.tokens = [":white_circle:", str(emoji1), str(emoji2)]
         game = None  # if game fails to intialize in try...except
 
         try:
-            game = Game(self.bot, ctx.channel, ctx.author, user, self.tokens, size=board_size)
+            game = Game(self.bot, ctx.channel, ctx.author, user, self.tokens, size=board_size, difficulty=difficulty)
             self.games.append(game)
             await game.start_game()
             self.games.remove(game)
@@ -400,10 +555,11 @@ class ConnectFour(commands.Cog):
         await announcement.add_reaction(CROSS_EMOJI)
 
         try:
-            reaction, user = await self.bot.wait_for(
+            reaction, user = await self.bot.waiters.wait_for(
                 "reaction_add",
                 check=partial(self.get_player, ctx, announcement),
-                timeout=60.0
+                timeout=60.0,
+                message_id=announcement.id,
             )
         except asyncio.TimeoutError:
             self.waiting.remove(ctx.author)
@@ -431,11 +587,16 @@ class ConnectFour(commands.Cog):
     async def ai(
         self,
         ctx: commands.Context,
+        difficulty: Optional[Literal["easy", "medium", "hard"]] = "medium",
         board_size: int = 7,
         emoji1: EMOJI_CHECK = "\U0001f535",
         emoji2: EMOJI_CHECK = "\U0001f534"
     ) -> None:
-        """Play Connect Four against a computer player."""
+        """
+        Play Connect Four against a computer player.
+
+        The difficulty can be easy, medium or hard, and can be left out to play on medium.
+        """
         check, emoji = self.check_emojis(emoji1, emoji2)
         if not check:
             raise commands.EmojiNotFound(emoji)
@@ -444,7 +605,7 @@ class ConnectFour(commands.Cog):
         if not check_author_result:
             return
 
-        await self._play_game(ctx, None, board_size, str(emoji1), str(emoji2))
+        await self._play_game(ctx, None, board_size, str(emoji1), str(emoji2), difficulty)
 
 
 async def setup(bot: Bot) -> None:
@@ -1,7 +1,10 @@
 import asyncio
+import logging
 import random
 import re
+import time
 from collections import defaultdict
+from functools import cache
 from io import BytesIO
 from itertools import product
 from pathlib import Path
@@ -14,7 +17,11 @@ from discord.ext import commands
 from bot.bot import Bot
 from bot.constants import MODERATION_ROLES
 from bot.utils.decorators import with_role
+from bot.utils.listener_filters import listener_filter
 
+log = logging.getLogger(__name__)
+
+# Cards are listed in order of their index, i.e. their features read as trinary
 DECK = list(product(*[(0, 1, 2)]*4))
 
 GAME_DURATION = 180
@@ -67,25 +74,21 @@ The second flight is valid because there are no 2:1 splits; each feature is eith
 
 
 def assemble_board_image(board: list[tuple[int]], rows: int, columns: int) -> Image:
-    """Cut and paste images representing the given cards into an image representing the board."""
+    """Paste the images representing the given cards, and their labels, into an image representing the board."""
     new_im = Image.new("RGBA", (CARD_WIDTH*columns, CARD_HEIGHT*rows))
-    draw = ImageDraw.Draw(new_im)
     for idx, card in enumerate(board):
-        card_image = get_card_image(card)
         row, col = divmod(idx, columns)
         top, left = row * CARD_HEIGHT, col * CARD_WIDTH
-        new_im.paste(card_image, (left, top))
-        draw.text(
-            xy=(left+5, top+5),  # magic numbers are buffers for the card labels
-            text=str(idx),
-            fill=(0, 0, 0),
-            font=LABEL_FONT,
-        )
+        new_im.paste(get_card_image(card), (left, top))
+
+        label = get_label_image(idx)
+        new_im.paste(label, (left+5, top+5), label)  # magic numbers are buffers for the card labels
     return new_im
 
 
+@cache
 def get_card_image(card: tuple[int]) -> Image:
-    """Slice the image containing all the cards to get just this card."""
+    """Slice the image containing all the cards to get just this card, which is only done once per card."""
     # The master card image file should have 9x9 cards,
     # arranged such that their features can be interpreted as ordered trinary.
     row, col = divmod(as_trinary(card), 9)
@@ -96,11 +99,90 @@ def get_card_image(card: tuple[int]) -> Image:
     return ALL_CARDS.crop((x1, y1, x2, y2))
 
 
+@cache
+def get_label_image(idx: int) -> Image:
+    """Draw the label for the card at position `idx` on a transparent image, which is only done once per label."""
+    text = str(idx)
+    left, top, right, bottom = LABEL_FONT.getbbox(text)
+    label = Image.new("RGBA", (right, bottom))
+    ImageDraw.Draw(label).text(xy=(0, 0), text=text, fill=(0, 0, 0), font=LABEL_FONT)
+    return label
+
+
 def as_trinary(card: tuple[int]) -> int:
     """Find the card's unique index by interpreting its features as trinary."""
     return int(''.join(str(x) for x in card), base=3)
 
 
+def _completion(card_a: int, card_b: int) -> int:
+    """Find the index of the only card which makes a flight with the cards at indices `card_a` and `card_b`."""
+    # Two points determine a line, and there are exactly 3 points per line in {0,1,2}^4.
+    # The completion of a line will only be a duplicate point if the other two points are the same.
+    return as_trinary(tuple(
+        feat_a if feat_a == feat_b else 3-feat_a-feat_b
+        for feat_a, feat_b in zip(DECK[card_a], DECK[card_b])
+    ))
+
+
+# COMPLETIONS[a][b] is the index of the card which makes a flight with the cards at indices a and b
+COMPLETIONS = [[_completion(card_a, card_b) for card_b in range(len(DECK))] for card_a in range(len(DECK))]
+
+
+def generate_board(size: int, minimum_solutions: int) -> list[int]:
+    """
+    Pick the indices of `size` distinct cards, making at least `minimum_solutions` flights if that many can fit.
+
+    Rather than resampling boards until one has enough solutions, cards completing a flight with two cards already
+    on the board are added until there are enough, and the rest of the board is then filled with random cards.
+    The cards on the board are kept as a bitset of their indices, so checking whether a card is on it is cheap.
+    """
+    board = []
+    on_board = 0
+    solutions = 0
+
+    def add(card: int) -> None:
+        nonlocal on_board, solutions
+        # Each flight this card completes is found twice, once from either of the other two cards.
+        solutions += sum(on_board >> COMPLETIONS[card][other] & 1 for other in board) // 2
+        board.append(card)
+        on_board |= 1 << card
+
+    while len(board) < size and solutions < minimum_solutions:
+        completions = [
+            completion
+            for idx, card_a in enumerate(board)
+            for card_b in board[idx+1:]
+            if not on_board >> (completion := COMPLETIONS[card_a][card_b]) & 1
+        ]
+        if completions:
+            add(random.choice(completions))
+        else:
+            add(random.choice([card for card in range(len(DECK)) if not on_board >> card & 1]))
+
+    for card in random.sample([card for card in range(len(DECK)) if not on_board >> card & 1], size - len(board)):
+        add(card)
+
+    random.shuffle(board)
+    return board
+
+
+def find_solutions(board: list[tuple[int]]) -> set[tuple[int, int, int]]:
+    """Find every flight on `board`, as the sorted indices of its three cards."""
+    solutions = set()
+    cards = [as_trinary(card) for card in board]
+    positions = {card: idx for idx, card in enumerate(cards)}
+    for idx_a, card_a in enumerate(cards):
+        for idx_b, card_b in enumerate(cards[idx_a+1:], start=idx_a+1):
+            idx_c = positions.get(COMPLETIONS[card_a][card_b])
+            if idx_c is None:
+                continue
+
+            # Indices within the solution are sorted to detect duplicate solutions modulo order.
+            solutions.add(tuple(sorted((idx_a, idx_b, idx_c))))
+
+    return solutions
+
+
 class DuckGame:
     """A class for a single game."""
 
@@ -127,9 +209,11 @@ class DuckGame:
         self.scores = defaultdict(int)
         self.editing_embed = asyncio.Lock()
 
-        self.board = random.sample(DECK, size)
-        while len(self.solutions) < minimum_solutions:
-            self.board = random.sample(DECK, size)
+        start = time.perf_counter()
+        self.board = [DECK[card] for card in generate_board(size, minimum_solutions)]
+        # Solutions are found straight away, so that they're included in the generation time
+        self._solutions = find_solutions(self.board)
+        self.generation_time = time.perf_counter() - start
 
         self.board_msg = None
         self.found_msg = None
@@ -146,27 +230,10 @@ class DuckGame:
         self._board = val
 
     @property
-    def solutions(self) -> None:
+    def solutions(self) -> set[tuple[int, int, int]]:
         """Calculate valid solutions and cache to avoid redoing work."""
         if self._solutions is None:
-            self._solutions = set()
-            for idx_a, card_a in enumerate(self.board):
-                for idx_b, card_b in enumerate(self.board[idx_a+1:], start=idx_a+1):
-                    # Two points determine a line, and there are exactly 3 points per line in {0,1,2}^4.
-                    # The completion of a line will only be a duplicate point if the other two points are the same,
-                    # which is prevented by the triangle iteration.
-                    completion = tuple(
-                        feat_a if feat_a == feat_b else 3-feat_a-feat_b
-                        for feat_a, feat_b in zip(card_a, card_b)
-                    )
-                    try:
-                        idx_c = self.board.index(completion)
-                    except ValueError:
-                        continue
-
-                    # Indices within the solution are sorted to detect duplicate solutions modulo order.
-                    solution = tuple(sorted((idx_a, idx_b, idx_c)))
-                    self._solutions.add(solution)
+            self._solutions = find_solutions(self.board)
 
         return self._solutions
 
@@ -208,12 +275,10 @@ class DuckGamesDirector(commands.Cog):
             except KeyError:
                 pass
 
+    @listener_filter(ignore_bots=True)
     @commands.Cog.listener()
     async def on_message(self, msg: discord.Message) -> None:
         """Listen for messages and process them as answers if appropriate."""
-        if msg.author.bot:
-            return
-
         channel = msg.channel
         if channel.id not in self.current_games:
             return
@@ -259,8 +324,13 @@ class DuckGamesDirector(commands.Cog):
         image = assemble_board_image(game.board, game.rows, game.columns)
         with BytesIO() as image_stream:
             image.save(image_stream, format="png")
+            image_size = image_stream.tell()
             image_stream.seek(0)
             file = discord.File(fp=image_stream, filename="board.png")
+        log.debug(
+            f"Generated a board with {len(game.solutions)} solutions in {game.generation_time * 1000:.2f}ms, "
+            f"and a {image_size / 1024:.1f}KiB image of it."
+        )
         embed = discord.Embed(
             title="Duck Duck Duck Goose!",
             color=discord.Color.dark_purple(),
@@ -109,10 +109,12 @@ class Hangman(commands.Cog):
             await original_message.edit(embed=self.create_embed(tries, user_guess))
 
             try:
-                message = await self.bot.wait_for(
+                message = await self.bot.waiters.wait_for(
                     "message",
                     timeout=60.0,
-                    check=check
+                    check=check,
+                    channel_id=ctx.channel.id,
+                    user_id=ctx.author.id,
                 )
             except TimeoutError:
                 timeout_embed = Embed(
@@ -1,10 +1,17 @@
+import asyncio
 import hashlib
+import logging
 import os
 import re
 import string
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable
+from contextlib import suppress
 from io import BytesIO
 from pathlib import Path
-from typing import BinaryIO, Optional
+from typing import BinaryIO, Callable, Optional, Union
 
 import discord
 from PIL import Image
@@ -14,6 +21,8 @@ from bot.bot import Bot
 from bot.constants import Channels, WHITELISTED_CHANNELS
 from bot.utils.decorators import whitelist_override
 
+log = logging.getLogger(__name__)
+
 FORMATTED_CODE_REGEX = re.compile(
     r"(?P<delim>(?P<block>```)|``?)"        # code delimiter: 1-3 backticks; (?P=block) only matches if it's a block
     r"(?(block)(?:(?P<lang>[a-z]+)\n)?)"    # if we're in a block, match optional language (only letters plus newline)
@@ -30,10 +39,17 @@ PASTEBIN_URL = "https://paste.pythondiscord.com"
 THIS_DIR = Path(__file__).parent
 CACHE_DIRECTORY = THIS_DIR / "_latex_cache"
 CACHE_DIRECTORY.mkdir(exist_ok=True)
+# The most space rendered images can take up in the cache, after which the least recently used are removed
+CACHE_MAX_BYTES = int(os.getenv("LATEX_CACHE_BYTES", 64 * 1024 * 1024))
+# How many queries can be rendered at once
+MAX_CONCURRENT_RENDERS = 4
 TEMPLATE = string.Template(Path("bot/resources/fun/latex_template.txt").read_text())
 
 PAD = 10
 
+# Every complete PNG file ends with this IEND chunk
+PNG_END = b"IEND\xaeB`\x82"
+
 LATEX_ALLOWED_CHANNNELS = WHITELISTED_CHANNELS + (
     Channels.data_science_and_ai,
     Channels.algos_and_data_structs,
@@ -61,6 +77,156 @@ def _process_image(data: bytes, out_file: BinaryIO) -> None:
     background.save(out_file)
 
 
+def _is_complete_png(path: Path) -> bool:
+    """Whether the file at `path` ends like a PNG should, rather than having been cut off while being written."""
+    try:
+        with open(path, "rb") as file:
+            file.seek(-len(PNG_END), os.SEEK_END)
+            return file.read() == PNG_END
+    except OSError:
+        return False
+
+
+class RenderCache:
+    """
+    Rendered images kept on disk, within a budget on their total size enforced by removing the least recently used.
+
+    Images are written to a temporary file first and then moved into place, so a crash can never leave a partly
+    written image to be served. Concurrent requests for a key which isn't cached yet share a single render.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.renders = 0
+        self.render_time = 0.0
+        self.max_render_time = 0.0
+
+        self._load()
+
+    @property
+    def stats(self) -> dict[str, Union[int, float]]:
+        """Counters describing how effective the cache has been, and how long rendering takes."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "in_flight": len(self._in_flight),
+            "entries": len(self._sizes),
+            "bytes": self._size,
+            "renders": self.renders,
+            "mean_render_seconds": round(self.render_time / self.renders, 3) if self.renders else 0,
+            "max_render_seconds": round(self.max_render_time, 3),
+        }
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.png"
+
+    def _load(self) -> None:
+        """Index the images already in the cache, oldest first, removing any which aren't complete."""
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix == ".tmp" or (path.suffix == ".png" and not _is_complete_png(path)):
+                log.info(f"Removing incomplete file {path.name} from the LaTeX cache.")
+                path.unlink(missing_ok=True)
+            elif path.suffix == ".png":
+                stat = path.stat()
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self._size += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes:
+            key, size = self._sizes.popitem(last=False)
+            self._size -= size
+            self._path(key).unlink(missing_ok=True)
+
+    def _store(self, key: str, image: bytes) -> None:
+        """Write `image` to the cache atomically, then remove the least recently used images until it's in budget."""
+        if len(image) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        temporary_path = path.with_name(f"{key}.{uuid.uuid4().hex}.tmp")
+        temporary_path.write_bytes(image)
+        os.replace(temporary_path, path)
+
+        self._size += len(image) - self._sizes.pop(key, 0)
+        self._sizes[key] = len(image)
+        self._evict()
+
+    def _lookup(self, key: str) -> Optional[bytes]:
+        if key not in self._sizes:
+            return None
+
+        path = self._path(key)
+        try:
+            image = path.read_bytes()
+        except FileNotFoundError:
+            self._size -= self._sizes.pop(key)
+            return None
+
+        self._sizes.move_to_end(key)
+        # The modification time records how recently it was used, for when the cache is loaded again
+        with suppress(OSError):
+            os.utime(path)
+        return image
+
+    async def get(self, key: str, render: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        Return the image cached for `key`, or render it with `render` and cache it if there isn't one.
+
+        Errors raised while rendering are propagated to every caller waiting on that render, and nothing is cached.
+        """
+        image = self._lookup(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        task = self._in_flight.get(key)
+        if task:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(self._render(key, render))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            # Mark the exception as retrieved, in case every caller was cancelled before it was raised.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        # Shielded so that one caller being cancelled doesn't cancel the render for the others.
+        return await asyncio.shield(task)
+
+    async def _render(self, key: str, render: Callable[[], Awaitable[bytes]]) -> bytes:
+        start = time.perf_counter()
+        try:
+            image = await render()
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.renders += 1
+            self.render_time += elapsed
+            self.max_render_time = max(self.max_render_time, elapsed)
+
+        self._store(key, image)
+        return image
+
+
 class InvalidLatexError(Exception):
     """Represents an error caused by invalid latex."""
 
@@ -74,19 +240,26 @@ class Latex(commands.Cog):
 
     def __init__(self, bot: Bot):
         self.bot = bot
+        self.cache = RenderCache(CACHE_DIRECTORY, CACHE_MAX_BYTES)
+        self._render_slots = asyncio.Semaphore(MAX_CONCURRENT_RENDERS)
+
+    async def _generate_image(self, query: str) -> bytes:
+        """Make an API request and return the generated image, pasted on a white background."""
+        async with self._render_slots:
+            payload = {"code": query, "format": "png"}
+            async with self.bot.http_session.post(LATEX_API_URL, data=payload, raise_for_status=True) as response:
+                response_json = await response.json()
+            if response_json["status"] != "success":
+                raise InvalidLatexError(logs=response_json.get("log"))
+            async with self.bot.http_session.get(
+                f"{LATEX_API_URL}/{response_json['filename']}",
+                raise_for_status=True
+            ) as response:
+                data = await response.read()
 
-    async def _generate_image(self, query: str, out_file: BinaryIO) -> None:
-        """Make an API request and save the generated image to cache."""
-        payload = {"code": query, "format": "png"}
-        async with self.bot.http_session.post(LATEX_API_URL, data=payload, raise_for_status=True) as response:
-            response_json = await response.json()
-        if response_json["status"] != "success":
-            raise InvalidLatexError(logs=response_json.get("log"))
-        async with self.bot.http_session.get(
-            f"{LATEX_API_URL}/{response_json['filename']}",
-            raise_for_status=True
-        ) as response:
-            _process_image(await response.read(), out_file)
+        out_file = BytesIO()
+        await self.bot.loop.run_in_executor(None, _process_image, data, out_file)
+        return out_file.getvalue()
 
     async def _upload_to_pastebin(self, text: str) -> Optional[str]:
         """Uploads `text` to the paste service, returning the url if successful."""
@@ -104,7 +277,6 @@ class Latex(commands.Cog):
             pass
 
     @commands.command()
-    @commands.max_concurrency(1, commands.BucketType.guild, wait=True)
     @whitelist_override(channels=LATEX_ALLOWED_CHANNNELS)
     async def latex(self, ctx: commands.Context, *, query: str) -> None:
         """Renders the text in latex and sends the image."""
@@ -112,26 +284,24 @@ class Latex(commands.Cog):
 
         # the hash of the query is used as the filename in the cache.
         query_hash = hashlib.md5(query.encode()).hexdigest()
-        image_path = CACHE_DIRECTORY / f"{query_hash}.png"
         async with ctx.typing():
-            if not image_path.exists():
-                try:
-                    with open(image_path, "wb") as out_file:
-                        await self._generate_image(TEMPLATE.substitute(text=query), out_file)
-                except InvalidLatexError as err:
-                    embed = discord.Embed(title="Failed to render input.")
-                    if err.logs is None:
-                        embed.description = "No logs available."
+            try:
+                image = await self.cache.get(
+                    query_hash, lambda: self._generate_image(TEMPLATE.substitute(text=query))
+                )
+            except InvalidLatexError as err:
+                embed = discord.Embed(title="Failed to render input.")
+                if err.logs is None:
+                    embed.description = "No logs available."
+                else:
+                    logs_paste_url = await self._upload_to_pastebin(err.logs)
+                    if logs_paste_url:
+                        embed.description = f"[View Logs]({logs_paste_url})"
                     else:
-                        logs_paste_url = await self._upload_to_pastebin(err.logs)
-                        if logs_paste_url:
-                            embed.description = f"[View Logs]({logs_paste_url})"
-                        else:
-                            embed.description = "Couldn't upload logs."
-                    await ctx.send(embed=embed)
-                    image_path.unlink()
-                    return
-            await ctx.send(file=discord.File(image_path, "latex.png"))
+                        embed.description = "Couldn't upload logs."
+                await ctx.send(embed=embed)
+                return
+            await ctx.send(file=discord.File(BytesIO(image), "latex.png"))
 
 
 async def setup(bot: Bot) -> None:
@@ -93,7 +93,9 @@ class Madlibs(commands.Cog):
             await original_message.edit(embed=madlibs_embed)
 
             try:
-                message = await self.bot.wait_for("message", check=author_check, timeout=TIMEOUT)
+                message = await self.bot.waiters.wait_for(
+                    "message", check=author_check, timeout=TIMEOUT, channel_id=ctx.channel.id, user_id=ctx.author.id
+                )
             except TimeoutError:
                 timeout_embed = discord.Embed(
                     title=choice(NEGATIVE_REPLIES),
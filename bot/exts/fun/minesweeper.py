@@ -1,7 +1,7 @@
 import logging
 from collections.abc import Iterator
 from dataclasses import dataclass
-from random import randint, random
+from random import random, randrange
 from typing import Union
 
 import discord
@@ -12,36 +12,125 @@ from bot.constants import Client
 from bot.utils.converters import CoordinateConverter
 from bot.utils.exceptions import UserNotPlayingError
 
+# Emojis are used directly rather than by name, since the names take up far more of a message's length limit
 MESSAGE_MAPPING = {
-    0: ":stop_button:",
-    1: ":one:",
-    2: ":two:",
-    3: ":three:",
-    4: ":four:",
-    5: ":five:",
-    6: ":six:",
-    7: ":seven:",
-    8: ":eight:",
-    9: ":nine:",
-    10: ":keycap_ten:",
-    "bomb": ":bomb:",
-    "hidden": ":grey_question:",
-    "flag": ":flag_black:",
-    "x": ":x:"
+    0: "\N{BLACK SQUARE FOR STOP}\ufe0f",
+    **{number: f"{number}\ufe0f\N{COMBINING ENCLOSING KEYCAP}" for number in range(1, 10)},
+    10: "\N{KEYCAP TEN}",
+    "bomb": "\N{BOMB}",
+    "hidden": "\N{WHITE QUESTION MARK ORNAMENT}",
+    "flag": "\N{WAVING BLACK FLAG}",
+    "x": "\N{CROSS MARK}"
 }
 
+# Rows are labelled with the numbered emojis above, and columns with regional indicators
+MAX_HEIGHT = 10
+MAX_WIDTH = 26
+
 log = logging.getLogger(__name__)
 
 
 GameBoard = list[list[Union[str, int]]]
 
 
+def _neighbour_sums(grid: list[list[int]]) -> list[list[int]]:
+    """Sum each cell of `grid` with its neighbours, by adding shifted copies of each row and then of the whole grid."""
+    horizontal = []
+    for row in grid:
+        padded = [0, *row, 0]
+        horizontal.append([a + b + c for a, b, c in zip(padded, padded[1:], padded[2:])])
+
+    blank = [0] * len(horizontal[0])
+    padded = [blank, *horizontal, blank]
+    return [[a + b + c for a, b, c in zip(*rows)] for rows in zip(padded, padded[1:], padded[2:])]
+
+
+class Board:
+    """
+    A minesweeper board of any size, along with what the player has revealed of it so far.
+
+    The number of safe cells still hidden is kept as cells are revealed, so that checking whether the game has been
+    won doesn't need to look at the whole board.
+    """
+
+    def __init__(self, width: int = 10, height: int = 10, bomb_chance: float = .2):
+        self.width = width
+        self.height = height
+
+        bombs = [[int(random() <= bomb_chance) for _ in range(width)] for _ in range(height)]
+        # make sure there is always a free cell
+        bombs[randrange(height)][randrange(width)] = 0
+
+        neighbours = _neighbour_sums(bombs)
+        self.cells: GameBoard = [
+            ["bomb" if bomb else count for bomb, count in zip(bomb_row, count_row)]
+            for bomb_row, count_row in zip(bombs, neighbours)
+        ]
+        self.revealed: GameBoard = [["hidden"] * width for _ in range(height)]
+        self.hidden_safe = width * height - sum(map(sum, bombs))
+
+    def __contains__(self, coordinate: tuple[int, int]) -> bool:
+        x, y = coordinate
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    @property
+    def won(self) -> bool:
+        """Whether every cell without a bomb has been revealed."""
+        return self.hidden_safe == 0
+
+    def get_neighbours(self, x: int, y: int) -> Iterator[tuple[int, int]]:
+        """Get all the neighbouring x and y including it self."""
+        for x_ in range(max(x - 1, 0), min(x + 2, self.width)):
+            for y_ in range(max(y - 1, 0), min(y + 2, self.height)):
+                yield x_, y_
+
+    def flag(self, x: int, y: int) -> None:
+        """Place a flag on the cell, if it's hidden."""
+        if self.revealed[y][x] == "hidden":
+            self.revealed[y][x] = "flag"
+
+    def reveal(self, x: int, y: int) -> bool:
+        """
+        Reveal the cell, along with the area around it if it's a 0.
+
+        Returns whether the cell was a bomb, in which case it's marked with an x.
+        """
+        if self.cells[y][x] == "bomb":
+            self.revealed[y][x] = "x"  # mark bomb that made you lose with a x
+            return True
+
+        if self.revealed[y][x] in ("hidden", "flag"):
+            self._reveal_safe(x, y)
+        return False
+
+    def _reveal_safe(self, x: int, y: int) -> None:
+        # Zeros are revealed with a stack rather than recursively, so large open areas can't hit the recursion limit
+        to_reveal = [(x, y)]
+        while to_reveal:
+            x, y = to_reveal.pop()
+            self.revealed[y][x] = self.cells[y][x]
+            self.hidden_safe -= 1
+
+            if self.cells[y][x] == 0:
+                for x_, y_ in self.get_neighbours(x, y):
+                    if self.revealed[y_][x_] == "hidden":
+                        # Marked straight away, so that it's only added to the stack once
+                        self.revealed[y_][x_] = "pending"
+                        to_reveal.append((x_, y_))
+
+    def reveal_bombs(self) -> None:
+        """Reveals all the bombs."""
+        for y, row in enumerate(self.cells):
+            for x, cell in enumerate(row):
+                if cell == "bomb" and self.revealed[y][x] != "x":
+                    self.revealed[y][x] = cell
+
+
 @dataclass
 class Game:
     """The data for a game."""
 
-    board: GameBoard
-    revealed: GameBoard
+    board: Board
     dm_msg: discord.Message
     chat_msg: discord.Message
     activated_on_server: bool
@@ -59,45 +148,12 @@ class Minesweeper(commands.Cog):
         """Commands for Playing Minesweeper."""
         await self.bot.invoke_help_command(ctx)
 
-    @staticmethod
-    def get_neighbours(x: int, y: int) -> Iterator[tuple[int, int]]:
-        """Get all the neighbouring x and y including it self."""
-        for x_ in [x - 1, x, x + 1]:
-            for y_ in [y - 1, y, y + 1]:
-                if x_ != -1 and x_ != 10 and y_ != -1 and y_ != 10:
-                    yield x_, y_
-
-    def generate_board(self, bomb_chance: float) -> GameBoard:
-        """Generate a 2d array for the board."""
-        board: GameBoard = [
-            [
-                "bomb" if random() <= bomb_chance else "number"
-                for _ in range(10)
-            ] for _ in range(10)
-        ]
-
-        # make sure there is always a free cell
-        board[randint(0, 9)][randint(0, 9)] = "number"
-
-        for y, row in enumerate(board):
-            for x, cell in enumerate(row):
-                if cell == "number":
-                    # calculate bombs near it
-                    bombs = 0
-                    for x_, y_ in self.get_neighbours(x, y):
-                        if board[y_][x_] == "bomb":
-                            bombs += 1
-                    board[y][x] = bombs
-        return board
-
     @staticmethod
     def format_for_discord(board: GameBoard) -> str:
         """Format the board as a string for Discord."""
-        discord_msg = (
-            ":stop_button:    :regional_indicator_a: :regional_indicator_b: :regional_indicator_c: "
-            ":regional_indicator_d: :regional_indicator_e: :regional_indicator_f: :regional_indicator_g: "
-            ":regional_indicator_h: :regional_indicator_i: :regional_indicator_j:\n\n"
-        )
+        # Regional indicators are separated by spaces, so that Discord doesn't show pairs of them as flags
+        columns = " ".join(chr(ord("\N{REGIONAL INDICATOR SYMBOL LETTER A}") + x) for x in range(len(board[0])))
+        discord_msg = f"{MESSAGE_MAPPING[0]}    {columns}\n\n"
         rows = []
         for row_number, row in enumerate(board):
             new_row = f"{MESSAGE_MAPPING[row_number + 1]}    "
@@ -108,13 +164,23 @@ class Minesweeper(commands.Cog):
         return discord_msg
 
     @minesweeper_group.command(name="start")
-    async def start_command(self, ctx: commands.Context, bomb_chance: float = .2) -> None:
-        """Start a game of Minesweeper."""
+    async def start_command(
+        self,
+        ctx: commands.Context,
+        bomb_chance: float = .2,
+        width: int = 10,
+        height: int = 10
+    ) -> None:
+        """Start a game of Minesweeper, on a board up to 26 cells wide and 10 cells high."""
         if ctx.author.id in self.games:  # Player is already playing
             await ctx.send(f"{ctx.author.mention} you already have a game running!", delete_after=2)
             await ctx.message.delete(delay=2)
             return
 
+        if not (2 <= width <= MAX_WIDTH and 2 <= height <= MAX_HEIGHT):
+            await ctx.send(f"The board must be between 2x2 and {MAX_WIDTH}x{MAX_HEIGHT} cells.")
+            return
+
         try:
             await ctx.author.send(
                 f"Play by typing: `{Client.prefix}ms reveal xy [xy]` or `{Client.prefix}ms flag xy [xy]` \n"
@@ -126,19 +192,17 @@ class Minesweeper(commands.Cog):
             return
 
         # Add game to list
-        board: GameBoard = self.generate_board(bomb_chance)
-        revealed_board: GameBoard = [["hidden"] * 10 for _ in range(10)]
-        dm_msg = await ctx.author.send(f"Here's your board!\n{self.format_for_discord(revealed_board)}")
+        board = Board(width, height, bomb_chance)
+        dm_msg = await ctx.author.send(f"Here's your board!\n{self.format_for_discord(board.revealed)}")
 
         if ctx.guild:
             await ctx.send(f"{ctx.author.mention} is playing Minesweeper.")
-            chat_msg = await ctx.send(f"Here's their board!\n{self.format_for_discord(revealed_board)}")
+            chat_msg = await ctx.send(f"Here's their board!\n{self.format_for_discord(board.revealed)}")
         else:
             chat_msg = None
 
         self.games[ctx.author.id] = Game(
             board=board,
-            revealed=revealed_board,
             dm_msg=dm_msg,
             chat_msg=chat_msg,
             activated_on_server=ctx.guild is not None
@@ -148,9 +212,9 @@ class Minesweeper(commands.Cog):
         """Update both playing boards."""
         game = self.games[ctx.author.id]
         await game.dm_msg.delete()
-        game.dm_msg = await ctx.author.send(f"Here's your board!\n{self.format_for_discord(game.revealed)}")
+        game.dm_msg = await ctx.author.send(f"Here's your board!\n{self.format_for_discord(game.board.revealed)}")
         if game.activated_on_server:
-            await game.chat_msg.edit(content=f"Here's their board!\n{self.format_for_discord(game.revealed)}")
+            await game.chat_msg.edit(content=f"Here's their board!\n{self.format_for_discord(game.board.revealed)}")
 
     @commands.dm_only()
     @minesweeper_group.command(name="flag")
@@ -158,25 +222,17 @@ class Minesweeper(commands.Cog):
         """Place multiple flags on the board."""
         if ctx.author.id not in self.games:
             raise UserNotPlayingError
-        board: GameBoard = self.games[ctx.author.id].revealed
+        board = self.games[ctx.author.id].board
         for x, y in coordinates:
-            if board[y][x] == "hidden":
-                board[y][x] = "flag"
+            if (x, y) in board:
+                board.flag(x, y)
 
         await self.update_boards(ctx)
 
-    @staticmethod
-    def reveal_bombs(revealed: GameBoard, board: GameBoard) -> None:
-        """Reveals all the bombs."""
-        for y, row in enumerate(board):
-            for x, cell in enumerate(row):
-                if cell == "bomb":
-                    revealed[y][x] = cell
-
     async def lost(self, ctx: commands.Context) -> None:
         """The player lost the game."""
         game = self.games[ctx.author.id]
-        self.reveal_bombs(game.revealed, game.board)
+        game.board.reveal_bombs()
         await ctx.author.send(":fire: You lost! :fire:")
         if game.activated_on_server:
             await game.chat_msg.channel.send(f":fire: {ctx.author.mention} just lost Minesweeper! :fire:")
@@ -188,48 +244,19 @@ class Minesweeper(commands.Cog):
         if game.activated_on_server:
             await game.chat_msg.channel.send(f":tada: {ctx.author.mention} just won Minesweeper! :tada:")
 
-    def reveal_zeros(self, revealed: GameBoard, board: GameBoard, x: int, y: int) -> None:
-        """Recursively reveal adjacent cells when a 0 cell is encountered."""
-        for x_, y_ in self.get_neighbours(x, y):
-            if revealed[y_][x_] != "hidden":
-                continue
-            revealed[y_][x_] = board[y_][x_]
-            if board[y_][x_] == 0:
-                self.reveal_zeros(revealed, board, x_, y_)
-
-    async def check_if_won(self, ctx: commands.Context, revealed: GameBoard, board: GameBoard) -> bool:
-        """Checks if a player has won."""
-        if any(
-            revealed[y][x] in ["hidden", "flag"] and board[y][x] != "bomb"
-            for x in range(10)
-            for y in range(10)
-        ):
-            return False
-        else:
-            await self.won(ctx)
-            return True
-
-    async def reveal_one(
-        self,
-        ctx: commands.Context,
-        revealed: GameBoard,
-        board: GameBoard,
-        x: int,
-        y: int
-    ) -> bool:
+    async def reveal_one(self, ctx: commands.Context, board: Board, x: int, y: int) -> bool:
         """
         Reveal one square.
 
         return is True if the game ended, breaking the loop in `reveal_command` and deleting the game.
         """
-        revealed[y][x] = board[y][x]
-        if board[y][x] == "bomb":
+        if board.reveal(x, y):
             await self.lost(ctx)
-            revealed[y][x] = "x"  # mark bomb that made you lose with a x
             return True
-        elif board[y][x] == 0:
-            self.reveal_zeros(revealed, board, x, y)
-        return await self.check_if_won(ctx, revealed, board)
+        if board.won:
+            await self.won(ctx)
+            return True
+        return False
 
     @commands.dm_only()
     @minesweeper_group.command(name="reveal")
@@ -238,12 +265,13 @@ class Minesweeper(commands.Cog):
         if ctx.author.id not in self.games:
             raise UserNotPlayingError
         game = self.games[ctx.author.id]
-        revealed: GameBoard = game.revealed
-        board: GameBoard = game.board
+        board = game.board
 
         for x, y in coordinates:
+            if (x, y) not in board:
+                continue
             # reveal_one returns True if the revealed cell is a bomb or the player won, ending the game
-            if await self.reveal_one(ctx, revealed, board, x, y):
+            if await self.reveal_one(ctx, board, x, y):
                 await self.update_boards(ctx)
                 del self.games[ctx.author.id]
                 break
@@ -256,7 +284,7 @@ class Minesweeper(commands.Cog):
         if ctx.author.id not in self.games:
             raise UserNotPlayingError
         game = self.games[ctx.author.id]
-        game.revealed = game.board
+        game.board.revealed = game.board.cells
         await self.update_boards(ctx)
         new_msg = f":no_entry: Game canceled. :no_entry:\n{game.dm_msg.content}"
         await game.dm_msg.edit(content=new_msg)
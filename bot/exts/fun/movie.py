@@ -3,13 +3,13 @@ import random
 from enum import Enum
 from typing import Any
 
-from aiohttp import ClientSession
 from discord import Embed
 from discord.ext.commands import Cog, Context, group
 
 from bot.bot import Bot
 from bot.constants import Tokens
 from bot.utils.exceptions import APIError
+from bot.utils.http_cache import ResponseCache
 from bot.utils.pagination import ImagePaginator
 
 logger = logging.getLogger(__name__)
@@ -30,6 +30,9 @@ MOVIE_PARAMS = {
 # anything over 500 returns an error.
 MAX_PAGES = 500
 
+# How long TMDB responses are cached for
+CACHE_TTL = 60 * 60
+
 
 class MovieGenres(Enum):
     """Movies Genre names and IDs."""
@@ -58,7 +61,7 @@ class Movie(Cog):
 
     def __init__(self, bot: Bot):
         self.bot = bot
-        self.http_session: ClientSession = bot.http_session
+        self.http_cache: ResponseCache = bot.http_cache
 
     @group(name="movies", aliases=("movie",), invoke_without_command=True)
     async def movies(self, ctx: Context, genre: str = "", amount: int = 5) -> None:
@@ -80,7 +83,7 @@ class Movie(Cog):
         # Capitalize genre for getting data from Enum, get random page, send help when genre don't exist.
         genre = genre.capitalize()
         try:
-            result = await self.get_movies_data(self.http_session, MovieGenres[genre].value, 1)
+            result = await self.get_movies_data(self.http_cache, MovieGenres[genre].value, 1)
         except KeyError:
             await self.bot.invoke_help_command(ctx)
             return
@@ -89,10 +92,10 @@ class Movie(Cog):
         page = random.randint(1, min(result["total_pages"], MAX_PAGES))
 
         # Get movies list from TMDB, check if results key in result. When not, raise error.
-        movies = await self.get_movies_data(self.http_session, MovieGenres[genre].value, page)
+        movies = await self.get_movies_data(self.http_cache, MovieGenres[genre].value, page)
 
         # Get all pages and embed
-        pages = await self.get_pages(self.http_session, movies, amount)
+        pages = await self.get_pages(self.http_cache, movies, amount)
         embed = await self.get_embed(genre)
 
         await ImagePaginator.paginate(pages, ctx, embed)
@@ -102,7 +105,7 @@ class Movie(Cog):
         """Show all currently available genres for .movies command."""
         await ctx.send(f"Current available genres: {', '.join('`' + genre.name + '`' for genre in MovieGenres)}")
 
-    async def get_movies_data(self, client: ClientSession, genre_id: str, page: int) -> list[dict[str, Any]]:
+    async def get_movies_data(self, client: ResponseCache, genre_id: str, page: int) -> list[dict[str, Any]]:
         """Return JSON of TMDB discover request."""
         # Define params of request
         params = {
@@ -118,21 +121,21 @@ class Movie(Cog):
         url = BASE_URL + "discover/movie"
 
         # Make discover request to TMDB, return result
-        async with client.get(url, params=params) as resp:
-            result, status = await resp.json(), resp.status
-            # Check if "results" is in result. If not, throw error.
-            if "results" not in result:
-                err_msg = (
-                    f"There was a problem making the TMDB API request. Response Code: {status}, "
-                    f"TMDB: Status Code: {result.get('status_code', None)} "
-                    f"TMDB: Status Message: {result.get('status_message', None)}, "
-                    f"TMDB: Errors: {result.get('errors', None)}, "
-                )
-                logger.error(err_msg)
-                raise APIError("TMDB API", status, err_msg)
-            return result
-
-    async def get_pages(self, client: ClientSession, movies: dict[str, Any], amount: int) -> list[tuple[str, str]]:
+        resp = await client.get(url, params=params, ttl=CACHE_TTL)
+        result, status = resp.json(), resp.status
+        # Check if "results" is in result. If not, throw error.
+        if "results" not in result:
+            err_msg = (
+                f"There was a problem making the TMDB API request. Response Code: {status}, "
+                f"TMDB: Status Code: {result.get('status_code', None)} "
+                f"TMDB: Status Message: {result.get('status_message', None)}, "
+                f"TMDB: Errors: {result.get('errors', None)}, "
+            )
+            logger.error(err_msg)
+            raise APIError("TMDB API", status, err_msg)
+        return result
+
+    async def get_pages(self, client: ResponseCache, movies: dict[str, Any], amount: int) -> list[tuple[str, str]]:
         """Fetch all movie pages from movies dictionary. Return list of pages."""
         pages = []
 
@@ -145,14 +148,14 @@ class Movie(Cog):
 
         return pages
 
-    async def get_movie(self, client: ClientSession, movie: int) -> dict[str, Any]:
+    async def get_movie(self, client: ResponseCache, movie: int) -> dict[str, Any]:
         """Get Movie by movie ID from TMDB. Return result dictionary."""
         if not isinstance(movie, int):
             raise ValueError("Error while fetching movie from TMDB, movie argument must be integer. ")
         url = BASE_URL + f"movie/{movie}"
 
-        async with client.get(url, params=MOVIE_PARAMS) as resp:
-            return await resp.json()
+        resp = await client.get(url, params=MOVIE_PARAMS, ttl=CACHE_TTL)
+        return resp.json()
 
     async def create_page(self, movie: dict[str, Any]) -> tuple[str, str]:
         """Create page from TMDB movie request result. Return formatted page + image."""
@@ -6,6 +6,7 @@ import random
 import re
 import string
 import textwrap
+import time
 import urllib
 from functools import partial
 from io import BytesIO
@@ -86,11 +87,18 @@ If the implementation is hard to explain, it's a bad idea.
 If the implementation is easy to explain, it may be a good idea.
 """
 
+# Animated snek constants
+SNEK_FRAMES_DEFAULT = 30
+SNEK_FRAMES_MAX = 120
+SNEK_FRAME_SHIFT = 0.01  # How far each frame moves along the Perlin noise
+SNEK_GIF_MAX_BYTES = 8 * 1024 * 1024  # Discord's upload limit
+
 # Max messages to train snake_chat on
 MSG_MAX = 100
 
 # get_snek constants
 URL = "https://en.wikipedia.org/w/api.php?"
+FETCH_CACHE_TTL = 60 * 60
 
 # snake guess responses
 INCORRECT_GUESS = (
@@ -155,6 +163,22 @@ class Snakes(Cog):
         self.num_movie_pages = None
 
     # region: Helper methods
+    def _random_snek_style(self) -> dict[str, Any]:
+        """Generate random attributes for drawing a snek, as keyword arguments for the snek frame functions."""
+        random_hue = random.random()
+        return {
+            "snake_width": random.randint(6, 10),
+            "snake_length": random.randint(15, 22),
+            "snake_color": self._beautiful_pastel(random_hue),
+            "text": random.choice(self.snake_idioms)["idiom"],
+            "text_color": self._beautiful_pastel((random_hue + 0.5) % 1),
+            "bg_color": (
+                random.randint(32, 50),
+                random.randint(32, 50),
+                random.randint(50, 70),
+            ),
+        }
+
     @staticmethod
     def _beautiful_pastel(hue: float) -> int:
         """Returns random bright pastels."""
@@ -280,8 +304,8 @@ class Snakes(Cog):
             params = {}
 
         async with async_timeout.timeout(10):
-            async with self.bot.http_session.get(url, params=params) as response:
-                return await response.json()
+            response = await self.bot.http_cache.get(url, params=params, ttl=FETCH_CACHE_TTL)
+            return response.json()
 
     def _get_random_long_message(self, messages: list[str], retries: int = 10) -> str:
         """
@@ -419,7 +443,13 @@ class Snakes(Cog):
 
         # Validate the answer
         try:
-            reaction, user = await ctx.bot.wait_for("reaction_add", timeout=45.0, check=predicate)
+            reaction, user = await ctx.bot.waiters.wait_for(
+                "reaction_add",
+                timeout=45.0,
+                check=predicate,
+                message_id=message.id,
+                user_id=ctx.author.id,
+            )
         except asyncio.TimeoutError:
             await ctx.send(f"You took too long. The correct answer was **{options[answer]}**.")
             await message.clear_reactions()
@@ -512,8 +542,8 @@ class Snakes(Cog):
         # Begin main game loop
         while not win and antidote_tries < 10:
             try:
-                reaction, user = await ctx.bot.wait_for(
-                    "reaction_add", timeout=300, check=predicate)
+                reaction, user = await ctx.bot.waiters.wait_for(
+                    "reaction_add", timeout=300, check=predicate, message_id=board_id.id)
             except asyncio.TimeoutError:
                 log.debug("Antidote timed out waiting for a reaction")
                 break  # We're done, no reactions for the last 5 minutes
@@ -600,34 +630,40 @@ class Snakes(Cog):
         """
         with ctx.typing():
 
-            # Generate random snake attributes
-            width = random.randint(6, 10)
-            length = random.randint(15, 22)
-            random_hue = random.random()
-            snek_color = self._beautiful_pastel(random_hue)
-            text_color = self._beautiful_pastel((random_hue + 0.5) % 1)
-            bg_color = (
-                random.randint(32, 50),
-                random.randint(32, 50),
-                random.randint(50, 70),
-            )
-
             # Build and send the snek
-            text = random.choice(self.snake_idioms)["idiom"]
             factory = utils.PerlinNoiseFactory(dimension=1, octaves=2)
-            image_frame = utils.create_snek_frame(
-                factory,
-                snake_width=width,
-                snake_length=length,
-                snake_color=snek_color,
-                text=text,
-                text_color=text_color,
-                bg_color=bg_color
-            )
+            image_frame = utils.create_snek_frame(factory, **self._random_snek_style())
             png_bytes = utils.frame_to_png_bytes(image_frame)
             file = File(png_bytes, filename="snek.png")
             await ctx.send(file=file)
 
+    @snakes_group.command(name="animate")
+    async def animate_command(self, ctx: Context, frames: int = SNEK_FRAMES_DEFAULT) -> None:
+        """
+        Draws a random wiggling snek as an animated GIF, using Perlin noise.
+
+        The snek wiggles forward and back again, so the animation loops smoothly.
+        """
+        frames = max(2, min(SNEK_FRAMES_MAX, frames))
+
+        with ctx.typing():
+            factory = utils.PerlinNoiseFactory(dimension=1, octaves=2)
+            forward = [index * SNEK_FRAME_SHIFT for index in range(frames // 2 + 1)]
+            shifts = forward + forward[-2:0:-1]
+
+            # The frames are drawn lazily, in the executor, as they are encoded.
+            snek_frames = utils.iter_snek_frames(factory, shifts, **self._random_snek_style())
+            func = partial(utils.frames_to_gif_bytes, snek_frames, max_bytes=SNEK_GIF_MAX_BYTES)
+
+            start = time.perf_counter()
+            gif_bytes, frame_count = await self.bot.loop.run_in_executor(None, func)
+            elapsed = time.perf_counter() - start
+
+            size = gif_bytes.getbuffer().nbytes
+            log.info(f"Rendered a {frame_count} frame snek animation in {elapsed:.3f}s, encoded as {size:,} bytes.")
+
+            await ctx.send(file=File(gif_bytes, filename="snek.gif"))
+
     @snakes_group.command(name="get")
     @bot_has_permissions(manage_messages=True)
     @locked()
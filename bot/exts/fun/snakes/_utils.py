@@ -6,9 +6,9 @@ import math
 import random
 from itertools import product
 from pathlib import Path
-from typing import Union
+from typing import Iterable, Iterator, Optional, Sequence, Union
 
-from PIL import Image
+from PIL import GifImagePlugin, Image
 from PIL.ImageDraw import ImageDraw
 from discord import File, Member, Reaction, User
 from discord.ext.commands import Cog, Context
@@ -112,6 +112,7 @@ DEFAULT_TEXT_POSITION = (
     10
 )
 DEFAULT_TEXT_COLOR = 0xf2ea15
+DEFAULT_FRAME_DURATION = 50  # milliseconds per frame of an animated snek
 X = 0
 Y = 1
 ANGLE_RANGE = math.pi * 2
@@ -138,12 +139,16 @@ class PerlinNoiseFactory(object):
 
     The underlying grid is aligned with the integers.
 
-    There is no limit to the coordinates used; new gradients are generated on the fly as necessary.
+    Gradients are picked from a table of random unit vectors using a permutation table, so that many points
+    can be computed in one pass with `get_plain_noise_batch` and `noise_batch`. The pattern repeats every
+    `TABLE_SIZE` units along each axis.
 
-    Taken from: https://gist.github.com/eevee/26f547457522755cb1fb8739d0ea89a1
+    Adapted from: https://gist.github.com/eevee/26f547457522755cb1fb8739d0ea89a1
     Licensed under ISC
     """
 
+    TABLE_SIZE = 256
+
     def __init__(self, dimension: int, octaves: int = 1, tile: tuple[int, ...] = (), unbias: bool = False):
         """
         Create a new Perlin noise factory in the given number of dimensions.
@@ -170,7 +175,12 @@ class PerlinNoiseFactory(object):
         # by this to scale to ±1
         self.scale_factor = 2 * dimension ** -0.5
 
-        self.gradient = {}
+        # The corners of a grid cell, relative to its minimum corner, ordered
+        # such that the last dimension alternates: (..., 0), (..., 1), etc.
+        self.corners = list(product((0, 1), repeat=dimension))
+
+        self.permutation = random.sample(range(self.TABLE_SIZE), self.TABLE_SIZE)
+        self.gradients = [self._generate_gradient() for _ in range(self.TABLE_SIZE)]
 
     def _generate_gradient(self) -> tuple[float, ...]:
         """
@@ -194,52 +204,51 @@ class PerlinNoiseFactory(object):
 
     def get_plain_noise(self, *point) -> float:
         """Get plain noise for a single point, without taking into account either octaves or tiling."""
-        if len(point) != self.dimension:
-            raise ValueError(
-                f"Expected {self.dimension} values, got {len(point)}"
-            )
+        return self.get_plain_noise_batch([point])[0]
+
+    def get_plain_noise_batch(self, points: Sequence[Sequence[float]]) -> list[float]:
+        """Get plain noise for each of the given points, without taking into account either octaves or tiling."""
+        permutation = self.permutation
+        gradients = self.gradients
+        mask = self.TABLE_SIZE - 1
+
+        values = []
+        for point in points:
+            if len(point) != self.dimension:
+                raise ValueError(
+                    f"Expected {self.dimension} values, got {len(point)}"
+                )
 
-        # Build a list of the (min, max) bounds in each dimension
-        grid_coords = []
-        for coord in point:
-            min_coord = math.floor(coord)
-            max_coord = min_coord + 1
-            grid_coords.append((min_coord, max_coord))
-
-        # Compute the dot product of each gradient vector and the point's
-        # distance from the corresponding grid point.  This gives you each
-        # gradient's "influence" on the chosen point.
-        dots = []
-        for grid_point in product(*grid_coords):
-            if grid_point not in self.gradient:
-                self.gradient[grid_point] = self._generate_gradient()
-            gradient = self.gradient[grid_point]
-
-            dot = 0
-            for i in range(self.dimension):
-                dot += gradient[i] * (point[i] - grid_point[i])
-            dots.append(dot)
-
-        # Interpolate all those dot products together.  The interpolation is
-        # done with smoothstep to smooth out the slope as you pass from one
-        # grid cell into the next.
-        # Due to the way product() works, dot products are ordered such that
-        # the last dimension alternates: (..., min), (..., max), etc.  So we
-        # can interpolate adjacent pairs to "collapse" that last dimension.  Then
-        # the results will alternate in their second-to-last dimension, and so
-        # forth, until we only have a single value left.
-        dim = self.dimension
-        while len(dots) > 1:
-            dim -= 1
-            s = smoothstep(point[dim] - grid_coords[dim][0])
-
-            next_dots = []
-            while dots:
-                next_dots.append(lerp(s, dots.pop(0), dots.pop(0)))
-
-            dots = next_dots
-
-        return dots[0] * self.scale_factor
+            min_coords = [math.floor(coord) for coord in point]
+            offsets = [coord - min_coord for coord, min_coord in zip(point, min_coords)]
+
+            # Compute the dot product of each gradient vector and the point's
+            # distance from the corresponding grid point.  This gives you each
+            # gradient's "influence" on the chosen point.
+            dots = []
+            for corner in self.corners:
+                index = 0
+                for min_coord, step in zip(min_coords, corner):
+                    index = permutation[(index + min_coord + step) & mask]
+                gradient = gradients[index]
+
+                dot = 0
+                for i in range(self.dimension):
+                    dot += gradient[i] * (offsets[i] - corner[i])
+                dots.append(dot)
+
+            # Interpolate all those dot products together, with smoothstep to
+            # smooth out the slope as you pass from one grid cell into the next.
+            # Adjacent pairs only differ in the last remaining dimension, so
+            # interpolating them "collapses" that dimension, until a single
+            # value is left.
+            for dim in reversed(range(self.dimension)):
+                s = smoothstep(offsets[dim])
+                dots = [lerp(s, dots[i], dots[i + 1]) for i in range(0, len(dots), 2)]
+
+            values.append(dots[0] * self.scale_factor)
+
+        return values
 
     def __call__(self, *point) -> float:
         """
@@ -247,23 +256,33 @@ class PerlinNoiseFactory(object):
 
         The number of values given should match the number of dimensions.
         """
-        ret = 0
+        return self.noise_batch([point])[0]
+
+    def noise_batch(self, points: Sequence[Sequence[float]]) -> list[float]:
+        """Get the value of this Perlin noise function at each of the given points."""
+        values = [0.0] * len(points)
         for o in range(self.octaves):
             o2 = 1 << o
-            new_point = []
-            for i, coord in enumerate(point):
-                coord *= o2
-                if self.tile[i]:
-                    coord %= self.tile[i] * o2
-                new_point.append(coord)
-            ret += self.get_plain_noise(*new_point) / o2
+            octave_points = []
+            for point in points:
+                new_point = []
+                for i, coord in enumerate(point):
+                    coord *= o2
+                    if self.tile[i]:
+                        coord %= self.tile[i] * o2
+                    new_point.append(coord)
+                octave_points.append(new_point)
+
+            for i, noise in enumerate(self.get_plain_noise_batch(octave_points)):
+                values[i] += noise / o2
 
         # Need to scale n back down since adding all those extra octaves has
         # probably expanded it beyond ±1
         # 1 octave: ±1
         # 2 octaves: ±1½
         # 3 octaves: ±1¾
-        ret /= 2 - 2 ** (1 - self.octaves)
+        scale = 2 - 2 ** (1 - self.octaves)
+        values = [value / scale for value in values]
 
         if self.unbias:
             # The output of the plain Perlin noise algorithm has a fairly
@@ -271,13 +290,16 @@ class PerlinNoiseFactory(object):
             # -- in fact the top and bottom 1/8 virtually never happen.  That's
             # a quarter of our entire output range!  If only we had a function
             # in [0..1] that could introduce a bias towards the endpoints...
-            r = (ret + 1) / 2
-            # Doing it this many times is a completely made-up heuristic.
-            for _ in range(int(self.octaves / 2 + 0.5)):
-                r = smoothstep(r)
-            ret = r * 2 - 1
+            unbiased = []
+            for value in values:
+                r = (value + 1) / 2
+                # Doing it this many times is a completely made-up heuristic.
+                for _ in range(int(self.octaves / 2 + 0.5)):
+                    r = smoothstep(r)
+                unbiased.append(r * 2 - 1)
+            values = unbiased
 
-        return ret
+        return values
 
 
 def create_snek_frame(
@@ -296,24 +318,64 @@ def create_snek_frame(
     `perlin_lookup_vertical_shift` represents the Perlin noise shift in the Y-dimension for this frame.
     If `text` is given, display the given text with the snek.
     """
+    return next(iter_snek_frames(
+        perlin_factory, (perlin_lookup_vertical_shift,),
+        image_dimensions=image_dimensions, image_margins=image_margins, snake_length=snake_length,
+        snake_color=snake_color, bg_color=bg_color, segment_length_range=segment_length_range,
+        snake_width=snake_width, text=text, text_position=text_position, text_color=text_color
+    ))
+
+
+def iter_snek_frames(
+        perlin_factory: PerlinNoiseFactory, perlin_lookup_vertical_shifts: Sequence[float],
+        image_dimensions: tuple[int, int] = DEFAULT_IMAGE_DIMENSIONS,
+        image_margins: tuple[int, int] = DEFAULT_IMAGE_MARGINS,
+        snake_length: int = DEFAULT_SNAKE_LENGTH,
+        snake_color: int = DEFAULT_SNAKE_COLOR, bg_color: int = DEFAULT_BACKGROUND_COLOR,
+        segment_length_range: tuple[int, int] = DEFAULT_SEGMENT_LENGTH_RANGE, snake_width: int = DEFAULT_SNAKE_WIDTH,
+        text: str = DEFAULT_TEXT, text_position: tuple[float, float] = DEFAULT_TEXT_POSITION,
+        text_color: int = DEFAULT_TEXT_COLOR
+) -> Iterator[Image.Image]:
+    """
+    Lazily creates a random snek frame using Perlin noise for each of the given vertical shifts.
+
+    Every frame shares the same start point and segment lengths, so that the frames can be played in sequence as an
+    animation. The noise for all of the frames is computed in a single batch, but each frame is only drawn once it is
+    requested, so only one frame needs to be held in memory at a time.
+    """
     start_x = random.randint(image_margins[X], image_dimensions[X] - image_margins[X])
     start_y = random.randint(image_margins[Y], image_dimensions[Y] - image_margins[Y])
-    points: list[tuple[float, float]] = [(start_x, start_y)]
-
-    for index in range(0, snake_length):
-        angle = perlin_factory.get_plain_noise(
-            ((1 / (snake_length + 1)) * (index + 1)) + perlin_lookup_vertical_shift
-        ) * ANGLE_RANGE
-        current_point = points[index]
-        segment_length = random.randint(segment_length_range[0], segment_length_range[1])
-        points.append((
-            current_point[X] + segment_length * math.cos(angle),
-            current_point[Y] + segment_length * math.sin(angle)
-        ))
+    segment_lengths = [random.randint(*segment_length_range) for _ in range(snake_length)]
+
+    noise = perlin_factory.get_plain_noise_batch([
+        (((1 / (snake_length + 1)) * (index + 1)) + shift,)
+        for shift in perlin_lookup_vertical_shifts
+        for index in range(snake_length)
+    ])
+
+    for frame_index in range(len(perlin_lookup_vertical_shifts)):
+        points: list[tuple[float, float]] = [(start_x, start_y)]
+        for index, segment_length in enumerate(segment_lengths):
+            angle = noise[frame_index * snake_length + index] * ANGLE_RANGE
+            current_point = points[index]
+            points.append((
+                current_point[X] + segment_length * math.cos(angle),
+                current_point[Y] + segment_length * math.sin(angle)
+            ))
+
+        yield _draw_snek(
+            points, image_dimensions, snake_color, bg_color, snake_width, text, text_position, text_color
+        )
 
+
+def _draw_snek(
+        points: list[tuple[float, float]], image_dimensions: tuple[int, int], snake_color: int, bg_color: int,
+        snake_width: int, text: str, text_position: tuple[float, float], text_color: int
+) -> Image.Image:
+    """Draws a snek through the given points, centered in a new image."""
     # normalize bounds
-    min_dimensions: list[float] = [start_x, start_y]
-    max_dimensions: list[float] = [start_x, start_y]
+    min_dimensions: list[float] = list(points[0])
+    max_dimensions: list[float] = list(points[0])
     for point in points:
         min_dimensions[X] = min(point[X], min_dimensions[X])
         min_dimensions[Y] = min(point[Y], min_dimensions[Y])
@@ -356,6 +418,38 @@ def frame_to_png_bytes(image: Image) -> io.BytesIO:
     return stream
 
 
+def frames_to_gif_bytes(
+        frames: Iterable[Image.Image], duration: int = DEFAULT_FRAME_DURATION, max_bytes: Optional[int] = None
+) -> tuple[io.BytesIO, int]:
+    """
+    Encode frames into a looping GIF byte stream, returning the stream and the number of frames it contains.
+
+    Each frame is encoded as soon as it is produced, so with a lazy iterable of frames only one is held in memory.
+    If `max_bytes` is given, frames which would make the GIF larger than it are dropped from the end.
+    """
+    stream = io.BytesIO()
+    frame_count = 0
+
+    for frame in frames:
+        frame = frame.convert("P", palette=Image.ADAPTIVE)
+        if not frame_count:
+            header, _ = GifImagePlugin.getheader(frame, info={"loop": 0})
+            stream.write(b"".join(header))
+
+        end_of_previous_frame = stream.tell()
+        stream.write(b"".join(GifImagePlugin.getdata(frame, duration=duration, include_color_table=True)))
+
+        if max_bytes is not None and stream.tell() + 1 > max_bytes and frame_count:
+            stream.seek(end_of_previous_frame)
+            stream.truncate()
+            break
+        frame_count += 1
+
+    stream.write(b";")  # GIF trailer
+    stream.seek(0)
+    return stream, frame_count
+
+
 log = logging.getLogger(__name__)
 START_EMOJI = "\u2611"     # :ballot_box_with_check: - Start the game
 CANCEL_EMOJI = "\u274C"    # :x: - Cancel or leave the game
@@ -426,17 +520,17 @@ class SnakeAndLaddersGame:
             f"Press {JOIN_EMOJI} to participate, and press "
             f"{START_EMOJI} to start the game"
         )
-        for emoji in STARTUP_SCREEN_EMOJI:
-            await startup.add_reaction(emoji)
+        await self.ctx.bot.ui_updates.add_reactions(startup, STARTUP_SCREEN_EMOJI)
 
         self.state = "waiting"
 
         while not self.started:
             try:
-                reaction, user = await self.ctx.bot.wait_for(
+                reaction, user = await self.ctx.bot.waiters.wait_for(
                     "reaction_add",
                     timeout=300,
-                    check=startup_event_check
+                    check=startup_event_check,
+                    message_id=startup.id,
                 )
                 if reaction.emoji == JOIN_EMOJI:
                     await self.player_join(user)
@@ -607,16 +701,16 @@ class SnakeAndLaddersGame:
         self.positions = temp_positions
 
         # Wait for rolls
-        for emoji in GAME_SCREEN_EMOJI:
-            await self.positions.add_reaction(emoji)
+        await self.ctx.bot.ui_updates.add_reactions(self.positions, GAME_SCREEN_EMOJI)
 
         is_surrendered = False
         while True:
             try:
-                reaction, user = await self.ctx.bot.wait_for(
+                reaction, user = await self.ctx.bot.waiters.wait_for(
                     "reaction_add",
                     timeout=300,
-                    check=game_event_check
+                    check=game_event_check,
+                    message_id=self.positions.id,
                 )
 
                 if reaction.emoji == ROLL_EMOJI:
@@ -19,13 +19,13 @@ NASA_IMAGES_BASE_URL = "https://images-api.nasa.gov"
 NASA_EPIC_BASE_URL = "https://epic.gsfc.nasa.gov"
 
 APOD_MIN_DATE = date(1995, 6, 16)
+NASA_CACHE_TTL = 60 * 60
 
 
 class Space(Cog):
     """Space Cog contains commands, that show images, facts or other information about space."""
 
     def __init__(self, bot: Bot):
-        self.http_session = bot.http_session
         self.bot = bot
 
         self.rovers = {}
@@ -216,8 +216,8 @@ class Space(Cog):
         if additional_params is not None:
             params.update(additional_params)
 
-        async with self.http_session.get(url=f"{base}/{endpoint}?{urlencode(params)}") as resp:
-            return await resp.json()
+        resp = await self.bot.http_cache.get(f"{base}/{endpoint}?{urlencode(params)}", ttl=NASA_CACHE_TTL)
+        return resp.json()
 
     def create_nasa_embed(self, title: str, description: str, image: str, footer: Optional[str] = "") -> Embed:
         """Generate NASA commands embeds. Required: title, description and image URL, footer (addition) is optional."""
@@ -1,3 +1,4 @@
+import time
 from random import choice
 
 import discord
@@ -8,6 +9,7 @@ from bot.bot import Bot
 HTTP_DOG_URL = "https://httpstatusdogs.com/img/{code}.jpg"
 HTTP_CAT_URL = "https://http.cat/{code}.jpg"
 STATUS_TEMPLATE = "**Status: {code}**"
+STATUS_CACHE_TTL = 24 * 60 * 60  # How long the status of an image's URL is remembered for
 ERR_404 = "Unable to find status floof for {code}."
 ERR_UNKNOWN = "Error attempting to retrieve status floof for {code}."
 ERROR_LENGTH_EMBED = discord.Embed(
@@ -25,6 +27,9 @@ class HTTPStatusCodes(commands.Cog):
 
     def __init__(self, bot: Bot):
         self.bot = bot
+        # Only the status of each image's URL is kept, as Discord downloads the image itself when it's embedded.
+        # There are at most 500 codes for each animal, so this doesn't need to be bounded.
+        self.statuses: dict[str, tuple[float, int]] = {}
 
     @commands.group(
         name="http_status",
@@ -52,34 +57,53 @@ class HTTPStatusCodes(commands.Cog):
             return
         await ctx.send(embed=ERROR_LENGTH_EMBED)
 
+    async def get_status(self, url: str) -> int:
+        """
+        Return the status of a request for `url`.
+
+        Whether an image exists is remembered for `STATUS_CACHE_TTL` seconds, but other statuses aren't, as the
+        error may be temporary.
+        """
+        if url in self.statuses:
+            checked_at, status = self.statuses[url]
+            if time.monotonic() - checked_at < STATUS_CACHE_TTL:
+                return status
+
+        async with self.bot.http_session.get(url, allow_redirects=False) as response:
+            status = response.status
+        if status in range(200, 300) or status in (302, 404):
+            self.statuses[url] = time.monotonic(), status
+
+        return status
+
     async def build_embed(self, url: str, ctx: commands.Context, code: int) -> None:
         """Attempt to build and dispatch embed. Append error message instead if something goes wrong."""
-        async with self.bot.http_session.get(url, allow_redirects=False) as response:
-            if response.status in range(200, 300):
-                await ctx.send(
-                    embed=discord.Embed(
-                        title=STATUS_TEMPLATE.format(code=code)
-                    ).set_image(url=url)
-                )
-            elif response.status in (302, 404):  # dog URL returns 302 instead of 404
-                if "dog" in url:
-                    await ctx.send(
-                        embed=discord.Embed(
-                            title=ERR_404.format(code=code)
-                        ).set_image(url="https://httpstatusdogs.com/img/404.jpg")
-                    )
-                    return
+        status = await self.get_status(url)
+        if status in range(200, 300):
+            await ctx.send(
+                embed=discord.Embed(
+                    title=STATUS_TEMPLATE.format(code=code)
+                ).set_image(url=url)
+            )
+        elif status in (302, 404):  # dog URL returns 302 instead of 404
+            if "dog" in url:
                 await ctx.send(
                     embed=discord.Embed(
                         title=ERR_404.format(code=code)
-                    ).set_image(url="https://http.cat/404.jpg")
-                )
-            else:
-                await ctx.send(
-                    embed=discord.Embed(
-                        title=STATUS_TEMPLATE.format(code=code)
-                    ).set_footer(text=ERR_UNKNOWN.format(code=code))
+                    ).set_image(url="https://httpstatusdogs.com/img/404.jpg")
                 )
+                return
+            await ctx.send(
+                embed=discord.Embed(
+                    title=ERR_404.format(code=code)
+                ).set_image(url="https://http.cat/404.jpg")
+            )
+        else:
+            await ctx.send(
+                embed=discord.Embed(
+                    title=STATUS_TEMPLATE.format(code=code)
+                ).set_footer(text=ERR_UNKNOWN.format(code=code))
+            )
 
 
 async def setup(bot: Bot) -> None:
@@ -1,39 +1,252 @@
 import asyncio
 import random
-from typing import Callable, Optional, Union
+import time
+from array import array
+from functools import cache
+from math import isqrt
+from typing import Callable, Literal, NamedTuple, Optional, Union
 
 import discord
 from discord.ext.commands import Cog, Context, check, group
 
 from bot.bot import Bot
 from bot.constants import Emojis
+from bot.utils.checks import stateful_check
 from bot.utils.pagination import LinePaginator
+from bot.utils.ui_updates import wait_for_edit
 
 CONFIRMATION_MESSAGE = (
     "{opponent}, {requester} wants to play Tic-Tac-Toe against you."
     f"\nReact to this message with {Emojis.confirmation} to accept or with {Emojis.decline} to decline."
 )
 
+# Each free cell needs its own reaction, and a message can only have 20 of them
+MAX_SIZE = 4
 
-def check_win(board: dict[int, str]) -> bool:
+# Boards with up to this many cells are solved completely when the cog loads, larger ones are searched on demand
+TABLE_MAX_CELLS = 9
+
+# Scores for won positions in the search, minus the number of moves made so that quicker wins score higher
+WIN_SCORE = 1_000
+
+# The transposition table is cleared before a search once it grows past this many positions
+TABLE_LIMIT = 500_000
+
+
+class Difficulty(NamedTuple):
+    """How well the AI plays."""
+
+    # How long the AI can search for a move on boards which are too large to solve in advance, in seconds
+    time_budget: float
+    # The chance of the AI making a random move instead of the best one
+    mistake_chance: float
+
+
+DIFFICULTIES = {
+    "easy": Difficulty(time_budget=0.2, mistake_chance=0.4),
+    "medium": Difficulty(time_budget=0.5, mistake_chance=0.15),
+    "hard": Difficulty(time_budget=2.0, mistake_chance=0),
+}
+
+
+@cache
+def winning_lines(size: int, in_a_row: int) -> list[tuple[int, ...]]:
+    """Get the positions of every line of `in_a_row` cells on a `size` by `size` board, numbered from 1."""
+    lines = []
+    for row in range(size):
+        for col in range(size):
+            for row_step, col_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + row_step * (in_a_row - 1), col + col_step * (in_a_row - 1)
+                if 0 <= end_row < size and 0 <= end_col < size:
+                    lines.append(tuple(
+                        (row + row_step * i) * size + col + col_step * i + 1 for i in range(in_a_row)
+                    ))
+    return lines
+
+
+def check_win(board: dict[int, str], in_a_row: int = 3) -> bool:
     """Check from board, is any player won game."""
+    # Free cells each have a different emoji, so a line of equal cells must all be the same player's
     return any(
-        (
-            # Horizontal
-            board[1] == board[2] == board[3],
-            board[4] == board[5] == board[6],
-            board[7] == board[8] == board[9],
-            # Vertical
-            board[1] == board[4] == board[7],
-            board[2] == board[5] == board[8],
-            board[3] == board[6] == board[9],
-            # Diagonal
-            board[1] == board[5] == board[9],
-            board[3] == board[5] == board[7],
-        )
+        len({board[position] for position in line}) == 1
+        for line in winning_lines(isqrt(len(board)), in_a_row)
     )
 
 
+def cell_emojis(size: int) -> dict[int, str]:
+    """Get the emojis marking each free cell, which are numbers on a 3x3 board and letters on larger ones."""
+    if size == 3:
+        return dict(Emojis.number_emojis)
+    return {
+        position: chr(ord("\N{REGIONAL INDICATOR SYMBOL LETTER A}") + position - 1)
+        for position in range(1, size ** 2 + 1)
+    }
+
+
+class MoveTable:
+    """
+    The score of every position reachable on a board, found by solving the whole game once.
+
+    Positions are encoded in base 3, with a digit for each cell which is 0 if it's free, 1 if the first player has it
+    and 2 if the second player has it. The table holds the score of each position for the player to move, so the best
+    move in a position can be looked up without any search.
+    """
+
+    UNREACHED = -128
+
+    def __init__(self, size: int, in_a_row: int):
+        self.cells = size ** 2
+        self.lines = [sum(1 << (position - 1) for position in line) for line in winning_lines(size, in_a_row)]
+        self.powers = [3 ** cell for cell in range(self.cells)]
+        self.scores = array("b", [self.UNREACHED]) * 3 ** self.cells
+        self._solve(0, 0, 0, 0)
+
+    def _solve(self, key: int, mine: int, theirs: int, moves: int) -> int:
+        """Score every position reachable from this one, returning its score for the player to move."""
+        if (score := self.scores[key]) != self.UNREACHED:
+            return score
+
+        if any(theirs & line == line for line in self.lines):
+            # The player who just moved won, and a quicker loss is a worse one
+            score = moves - self.cells - 1
+        elif moves == self.cells:
+            score = 0
+        else:
+            digit = 1 + moves % 2
+            score = max(
+                -self._solve(key + digit * self.powers[cell], theirs, mine | 1 << cell, moves + 1)
+                for cell in range(self.cells)
+                if not (mine | theirs) >> cell & 1
+            )
+
+        self.scores[key] = score
+        return score
+
+    def best_move(self, first: int, second: int, difficulty: Difficulty) -> int:
+        """Look up the best cell to play, picking at random between cells which are equally good."""
+        key = sum(
+            (1 if first >> cell & 1 else 2) * self.powers[cell]
+            for cell in range(self.cells)
+            if (first | second) >> cell & 1
+        )
+        digit = 1 + (first | second).bit_count() % 2
+
+        scores = {
+            cell: -self.scores[key + digit * self.powers[cell]]
+            for cell in range(self.cells)
+            if not (first | second) >> cell & 1
+        }
+        best_score = max(scores.values())
+        return random.choice([cell for cell, score in scores.items() if score == best_score])
+
+
+class _OutOfTime(Exception):
+    """Raised to abandon a search once its time budget runs out."""
+
+
+class Engine:
+    """
+    Picks moves on boards too large for a `MoveTable`, with a negamax search using alpha-beta pruning and memoisation.
+
+    The search deepens iteratively, and the move from the deepest search completed within the time budget is used.
+    Positions are given from the point of view of the player to move, as a bitboard of their cells and of their
+    opponent's cells.
+    """
+
+    def __init__(self, size: int, in_a_row: int):
+        self.cells = size ** 2
+        self.lines = [sum(1 << (position - 1) for position in line) for line in winning_lines(size, in_a_row)]
+        # Cells near the centre tend to be in more lines, so searching them first prunes more
+        centre = (size - 1) / 2
+        self.order = sorted(range(self.cells), key=lambda cell: abs(cell // size - centre) + abs(cell % size - centre))
+
+        # Maps a position's key to (depth, flag, score, best cell), where the flag is -1, 0 or 1
+        # for an upper bound, an exact score or a lower bound respectively
+        self.table: dict[int, tuple[int, int, int, int]] = {}
+        self.deadline = 0
+        self.nodes = 0
+
+    def _has_line(self, bitboard: int) -> bool:
+        return any(bitboard & line == line for line in self.lines)
+
+    def evaluate(self, mine: int, theirs: int) -> int:
+        """Score a position for the player to move, favouring lines which only one player has cells in."""
+        score = 0
+        for line in self.lines:
+            if not line & theirs:
+                score += (line & mine).bit_count() ** 2
+            elif not line & mine:
+                score -= (line & theirs).bit_count() ** 2
+        return score
+
+    def negamax(self, mine: int, theirs: int, moves: int, depth: int, alpha: int, beta: int) -> tuple[int, int]:
+        """Return the score of a position for the player to move, along with the best cell to play."""
+        self.nodes += 1
+        if not self.nodes % 1024 and time.monotonic() > self.deadline:
+            raise _OutOfTime
+
+        key = mine | theirs << self.cells
+        entry = self.table.get(key)
+        candidates = [cell for cell in self.order if not (mine | theirs) >> cell & 1]
+        if entry:
+            candidates.remove(entry[3])
+            candidates.insert(0, entry[3])
+
+        for cell in candidates:
+            if self._has_line(mine | 1 << cell):
+                return WIN_SCORE - moves, cell
+        if moves + 1 >= self.cells:
+            return 0, candidates[0]
+        if depth == 0:
+            return self.evaluate(mine, theirs), candidates[0]
+
+        if entry and entry[0] >= depth:
+            _, flag, score, cell = entry
+            if flag == 0 or (flag > 0 and score >= beta) or (flag < 0 and score <= alpha):
+                return score, cell
+
+        original_alpha = alpha
+        best_score, best_cell = -2 * WIN_SCORE, candidates[0]
+        for cell in candidates:
+            score = -self.negamax(theirs, mine | 1 << cell, moves + 1, depth - 1, -beta, -alpha)[0]
+            if score > best_score:
+                best_score, best_cell = score, cell
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = -1
+        elif best_score >= beta:
+            flag = 1
+        else:
+            flag = 0
+        self.table[key] = (depth, flag, best_score, best_cell)
+
+        return best_score, best_cell
+
+    def best_move(self, first: int, second: int, difficulty: Difficulty) -> int:
+        """Find the best cell to play, searching deeper until the game is solved or the time budget runs out."""
+        if len(self.table) > TABLE_LIMIT:
+            self.table.clear()
+
+        moves = (first | second).bit_count()
+        mine, theirs = (first, second) if moves % 2 == 0 else (second, first)
+        self.deadline = time.monotonic() + difficulty.time_budget
+
+        best_cell = next(cell for cell in self.order if not (mine | theirs) >> cell & 1)
+        for depth in range(1, self.cells - moves + 1):
+            try:
+                score, best_cell = self.negamax(mine, theirs, moves, depth, -2 * WIN_SCORE, 2 * WIN_SCORE)
+            except _OutOfTime:
+                break
+            if abs(score) >= WIN_SCORE - self.cells:
+                # The result is forced, so searching any deeper won't change it
+                break
+
+        return best_cell
+
+
 class Player:
     """Class that contains information about player and functions that interact with player."""
 
@@ -42,27 +255,35 @@ class Player:
         self.ctx = ctx
         self.symbol = symbol
 
-    async def get_move(self, board: dict[int, str], msg: discord.Message) -> tuple[bool, Optional[int]]:
+    async def get_move(self, game: "Game", msg: discord.Message) -> tuple[bool, Optional[int]]:
         """
         Get move from user.
 
         Return is timeout reached and position of field what user will fill when timeout don't reach.
         """
+        positions = {emoji: position for position, emoji in game.cell_emojis.items()}
+
         def check_for_move(r: discord.Reaction, u: discord.User) -> bool:
             """Check does user who reacted is user who we want, message is board and emoji is in board values."""
             return (
                 u.id == self.user.id
                 and msg.id == r.message.id
-                and r.emoji in board.values()
-                and r.emoji in Emojis.number_emojis.values()
+                and r.emoji in game.board.values()
+                and r.emoji in positions
             )
 
         try:
-            react, _ = await self.ctx.bot.wait_for("reaction_add", timeout=30.0, check=check_for_move)
+            react, _ = await self.ctx.bot.waiters.wait_for(
+                "reaction_add",
+                timeout=30.0,
+                check=check_for_move,
+                message_id=msg.id,
+                user_id=self.user.id,
+            )
         except asyncio.TimeoutError:
             return True, None
         else:
-            return False, list(Emojis.number_emojis.keys())[list(Emojis.number_emojis.values()).index(react.emoji)]
+            return False, positions[react.emoji]
 
     def __str__(self) -> str:
         """Return mention of user."""
@@ -72,31 +293,40 @@ class Player:
 class AI:
     """Tic Tac Toe AI class for against computer gaming."""
 
-    def __init__(self, bot_user: discord.Member, symbol: str):
+    def __init__(
+        self,
+        bot_user: discord.Member,
+        symbol: str,
+        solver: Union[MoveTable, Engine],
+        difficulty: str = "medium"
+    ):
         self.user = bot_user
         self.symbol = symbol
+        self.solver = solver
+        self.difficulty = DIFFICULTIES[difficulty]
 
-    @staticmethod
-    async def get_move(board: dict[int, str], _: discord.Message) -> tuple[bool, int]:
-        """Get move from AI. AI use Minimax strategy."""
-        possible_moves = [i for i, emoji in board.items() if emoji in list(Emojis.number_emojis.values())]
-
-        for symbol in (Emojis.o_square, Emojis.x_square):
-            for move in possible_moves:
-                board_copy = board.copy()
-                board_copy[move] = symbol
-                if check_win(board_copy):
-                    return False, move
-
-        open_corners = [i for i in possible_moves if i in (1, 3, 7, 9)]
-        if len(open_corners) > 0:
-            return False, random.choice(open_corners)
-
-        if 5 in possible_moves:
-            return False, 5
+    def choose_move(self, game: "Game") -> int:
+        """
+        Choose the position to play, occasionally making a random move instead depending on the difficulty.
 
-        open_edges = [i for i in possible_moves if i in (2, 4, 6, 8)]
-        return False, random.choice(open_edges)
+        On boards too large for a move table this searches for up to the difficulty's time budget, so it should be
+        run in an executor.
+        """
+        free = [position for position, emoji in game.board.items() if emoji == game.cell_emojis[position]]
+        if random.random() < self.difficulty.mistake_chance:
+            return random.choice(free)
+
+        first = second = 0
+        for position, emoji in game.board.items():
+            if emoji == game.players[0].symbol:
+                first |= 1 << (position - 1)
+            elif emoji == game.players[1].symbol:
+                second |= 1 << (position - 1)
+        return self.solver.best_move(first, second, self.difficulty) + 1
+
+    async def get_move(self, game: "Game", _: discord.Message) -> tuple[bool, int]:
+        """Get move from AI, which plays perfectly on a 3x3 board unless it makes a mistake."""
+        return False, await asyncio.get_running_loop().run_in_executor(None, self.choose_move, game)
 
     def __str__(self) -> str:
         """Return mention of @Sir Lancebot."""
@@ -106,21 +336,14 @@ class AI:
 class Game:
     """Class that contains information and functions about Tic Tac Toe game."""
 
-    def __init__(self, players: list[Union[Player, AI]], ctx: Context):
+    def __init__(self, players: list[Union[Player, AI]], ctx: Context, size: int = 3, in_a_row: int = 3):
         self.players = players
         self.ctx = ctx
         self.channel = ctx.channel
-        self.board = {
-            1: Emojis.number_emojis[1],
-            2: Emojis.number_emojis[2],
-            3: Emojis.number_emojis[3],
-            4: Emojis.number_emojis[4],
-            5: Emojis.number_emojis[5],
-            6: Emojis.number_emojis[6],
-            7: Emojis.number_emojis[7],
-            8: Emojis.number_emojis[8],
-            9: Emojis.number_emojis[9]
-        }
+        self.size = size
+        self.in_a_row = in_a_row
+        self.cell_emojis = cell_emojis(size)
+        self.board = dict(self.cell_emojis)
 
         self.current = self.players[0]
         self.next = self.players[1]
@@ -157,10 +380,12 @@ class Game:
             )
 
         try:
-            reaction, user = await self.ctx.bot.wait_for(
+            reaction, user = await self.ctx.bot.waiters.wait_for(
                 "reaction_add",
                 timeout=60.0,
-                check=confirm_check
+                check=confirm_check,
+                message_id=confirm_message.id,
+                user_id=self.players[1].user.id,
             )
         except asyncio.TimeoutError:
             self.over = True
@@ -176,17 +401,15 @@ class Game:
             self.canceled = True
             return False, "User declined"
 
-    @staticmethod
-    async def add_reactions(msg: discord.Message) -> None:
-        """Add number emojis to message."""
-        for nr in Emojis.number_emojis.values():
-            await msg.add_reaction(nr)
+    async def add_reactions(self, msg: discord.Message) -> None:
+        """Add the emojis marking each cell to message."""
+        await self.ctx.bot.ui_updates.add_reactions(msg, self.cell_emojis.values())
 
     def format_board(self) -> str:
         """Get formatted tic-tac-toe board for message."""
         board = list(self.board.values())
         return "\n".join(
-            (f"{board[line]} {board[line + 1]} {board[line + 2]}" for line in range(0, len(board), 3))
+            " ".join(board[line:line + self.size]) for line in range(0, len(board), self.size)
         )
 
     async def play(self) -> None:
@@ -197,13 +420,14 @@ class Game:
         )
         await self.add_reactions(board)
 
-        for _ in range(9):
+        last_edit = None
+        for _ in range(self.size ** 2):
             if isinstance(self.current, Player):
                 announce = await self.ctx.send(
                     f"{self.current.user.mention}, it's your turn! "
                     "React with an emoji to take your go."
                 )
-            timeout, pos = await self.current.get_move(self.board, board)
+            timeout, pos = await self.current.get_move(self, board)
             if isinstance(self.current, Player):
                 await announce.delete()
             if timeout:
@@ -212,13 +436,13 @@ class Game:
                 self.canceled = True
                 return
             self.board[pos] = self.current.symbol
-            await board.edit(
-                embed=discord.Embed(description=self.format_board())
-            )
-            await board.clear_reaction(Emojis.number_emojis[pos])
-            if check_win(self.board):
+            last_edit = self.ctx.bot.ui_updates.edit(board, embed=discord.Embed(description=self.format_board()))
+            await board.clear_reaction(self.cell_emojis[pos])
+            if check_win(self.board, self.in_a_row):
                 self.winner = self.current
                 self.loser = self.next
+                # The final board is shown before the result is announced
+                await wait_for_edit(last_edit)
                 await self.ctx.send(
                     f":tada: {self.current} won this game! :tada:"
                 )
@@ -227,6 +451,7 @@ class Game:
             self.current, self.next = self.next, self.current
         if not self.winner:
             self.draw = True
+            await wait_for_edit(last_edit)
             await self.ctx.send("It's a DRAW!")
         self.over = True
 
@@ -235,7 +460,7 @@ def is_channel_free() -> Callable:
     """Check is channel where command will be invoked free."""
     async def predicate(ctx: Context) -> bool:
         return all(game.channel != ctx.channel for game in ctx.cog.games if not game.over)
-    return check(predicate)
+    return check(stateful_check(predicate))
 
 
 def is_requester_free() -> Callable:
@@ -244,7 +469,7 @@ def is_requester_free() -> Callable:
         return all(
             ctx.author not in (player.user for player in game.players) for game in ctx.cog.games if not game.over
         )
-    return check(predicate)
+    return check(stateful_check(predicate))
 
 
 class TicTacToe(Cog):
@@ -252,12 +477,39 @@ class TicTacToe(Cog):
 
     def __init__(self):
         self.games: list[Game] = []
+        # Boards small enough to be solved completely are solved once here, rather than whenever the AI moves
+        self.move_tables = {
+            (size, in_a_row): MoveTable(size, in_a_row)
+            for size in range(3, MAX_SIZE + 1)
+            for in_a_row in range(3, size + 1)
+            if size ** 2 <= TABLE_MAX_CELLS
+        }
+
+    def get_solver(self, size: int, in_a_row: int) -> Union[MoveTable, Engine]:
+        """Get the move table for a board, or a search engine if the board is too large to have one."""
+        return self.move_tables.get((size, in_a_row)) or Engine(size, in_a_row)
 
     @is_channel_free()
     @is_requester_free()
     @group(name="tictactoe", aliases=("ttt", "tic"), invoke_without_command=True)
-    async def tic_tac_toe(self, ctx: Context, opponent: Optional[discord.User]) -> None:
-        """Tic Tac Toe game. Play against friends or AI. Use reactions to add your mark to field."""
+    async def tic_tac_toe(
+        self,
+        ctx: Context,
+        opponent: Optional[discord.User],
+        difficulty: Optional[Literal["easy", "medium", "hard"]] = "medium",
+        size: int = 3,
+        in_a_row: Optional[int] = None
+    ) -> None:
+        """
+        Tic Tac Toe game. Play against friends or AI. Use reactions to add your mark to field.
+
+        The difficulty of the AI can be easy, medium or hard. The board can be up to 4x4, and the number of marks
+        in a row needed to win defaults to the size of the board.
+        """
+        in_a_row = in_a_row or size
+        if not 3 <= in_a_row <= size <= MAX_SIZE:
+            await ctx.send(f"The board can be up to {MAX_SIZE}x{MAX_SIZE}, with 3 or more in a row needed to win.")
+            return
         if opponent == ctx.author:
             await ctx.send("You can't play against yourself.")
             return
@@ -267,14 +519,14 @@ class TicTacToe(Cog):
             await ctx.send("Opponent is already in game.")
             return
         if opponent is None:
-            game = Game(
-                [Player(ctx.author, ctx, Emojis.x_square), AI(ctx.me, Emojis.o_square)],
-                ctx
-            )
+            ai = AI(ctx.me, Emojis.o_square, self.get_solver(size, in_a_row), difficulty)
+            game = Game([Player(ctx.author, ctx, Emojis.x_square), ai], ctx, size, in_a_row)
         else:
             game = Game(
                 [Player(ctx.author, ctx, Emojis.x_square), Player(opponent, ctx, Emojis.o_square)],
-                ctx
+                ctx,
+                size,
+                in_a_row
             )
         self.games.append(game)
         if opponent is not None:
@@ -13,10 +13,10 @@ from typing import Callable, Optional
 
 import discord
 from discord.ext import commands, tasks
-from rapidfuzz import fuzz
 
 from bot.bot import Bot
 from bot.constants import Client, Colours, MODERATION_ROLES, NEGATIVE_REPLIES
+from bot.utils.answer_matcher import AnswerMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -420,6 +420,10 @@ class TriviaQuiz(commands.Cog):
                         question_dict["answer"],
                     )
 
+                # Every message in the channel is checked while the question is open, so the answers are only
+                # prepared once per question
+                matcher = AnswerMatcher(quiz_entry.answers, quiz_entry.var_tol)
+
                 embed = discord.Embed(
                     colour=Colours.gold,
                     title=f"Question #{len(done_questions)}",
@@ -431,17 +435,19 @@ class TriviaQuiz(commands.Cog):
 
                 await ctx.send(embed=embed)
 
-            def check_func(variation_tolerance: int) -> Callable[[discord.Message], bool]:
+            def check_func(answer_matcher: AnswerMatcher) -> Callable[[discord.Message], bool]:
                 def contains_correct_answer(m: discord.Message) -> bool:
-                    return m.channel == ctx.channel and any(
-                        fuzz.ratio(answer.lower(), m.content.lower()) > variation_tolerance
-                        for answer in quiz_entry.answers  # noqa: B023
-                    )
+                    return m.channel == ctx.channel and answer_matcher.matches(m.content)
 
                 return contains_correct_answer
 
             try:
-                msg = await self.bot.wait_for("message", check=check_func(quiz_entry.var_tol), timeout=10)
+                msg = await self.bot.waiters.wait_for(
+                    "message",
+                    check=check_func(matcher),
+                    timeout=10,
+                    channel_id=ctx.channel.id,
+                )
             except asyncio.TimeoutError:
                 # In case of TimeoutError and the game has been stopped, then do nothing.
                 if not self.game_status[ctx.channel.id]:
@@ -14,6 +14,7 @@ log = logging.getLogger(__name__)
 
 COMIC_FORMAT = re.compile(r"latest|[0-9]+")
 BASE_URL = "https://xkcd.com"
+COMIC_CACHE_TTL = 24 * 60 * 60  # Published comics don't change
 
 
 class XKCD(Cog):
@@ -31,11 +32,12 @@ class XKCD(Cog):
     @tasks.loop(minutes=30)
     async def get_latest_comic_info(self) -> None:
         """Refreshes latest comic's information ever 30 minutes. Also used for finding a random comic."""
-        async with self.bot.http_session.get(f"{BASE_URL}/info.0.json") as resp:
-            if resp.status == 200:
-                self.latest_comic_info = await resp.json()
-            else:
-                log.debug(f"Failed to get latest XKCD comic information. Status code {resp.status}")
+        # Expire just before the next refresh, so that it's revalidated rather than downloaded again.
+        resp = await self.bot.http_cache.get(f"{BASE_URL}/info.0.json", ttl=25 * 60)
+        if resp.status == 200:
+            self.latest_comic_info = resp.json()
+        else:
+            log.debug(f"Failed to get latest XKCD comic information. Status code {resp.status}")
 
     @command(name="xkcd")
     async def fetch_xkcd_comics(self, ctx: Context, comic: Optional[str]) -> None:
@@ -58,15 +60,18 @@ class XKCD(Cog):
         if comic == "latest":
             info = self.latest_comic_info
         else:
-            async with self.bot.http_session.get(f"{BASE_URL}/{comic}/info.0.json") as resp:
-                if resp.status == 200:
-                    info = await resp.json()
-                else:
-                    embed.title = f"XKCD comic #{comic}"
-                    embed.description = f"{resp.status}: Could not retrieve xkcd comic #{comic}."
-                    log.debug(f"Retrieving xkcd comic #{comic} failed with status code {resp.status}.")
-                    await ctx.send(embed=embed)
-                    return
+            # A comic which isn't found may be published at any moment, so that isn't cached
+            resp = await self.bot.http_cache.get(
+                f"{BASE_URL}/{comic}/info.0.json", ttl=COMIC_CACHE_TTL, error_ttl=0
+            )
+            if resp.status == 200:
+                info = resp.json()
+            else:
+                embed.title = f"XKCD comic #{comic}"
+                embed.description = f"{resp.status}: Could not retrieve xkcd comic #{comic}."
+                log.debug(f"Retrieving xkcd comic #{comic} failed with status code {resp.status}.")
+                await ctx.send(embed=embed)
+                return
 
         embed.title = f"XKCD comic #{info['num']}"
         embed.description = info["alt"]
@@ -10,6 +10,7 @@ from discord.ext import commands
 
 from bot.bot import Bot
 from bot.constants import Colours
+from bot.utils.listener_filters import listener_filter
 
 log = logging.getLogger(__name__)
 
@@ -130,11 +131,10 @@ class EggheadQuiz(commands.Cog):
                     return True
         return False
 
+    @listener_filter(ignore_bots=True)
     @commands.Cog.listener()
     async def on_reaction_add(self, reaction: discord.Reaction, user: Union[discord.Member, discord.User]) -> None:
         """Listener to listen specifically for reactions of quiz messages."""
-        if user.bot:
-            return
         if reaction.message.id not in self.quiz_messages:
             return
         if str(reaction.emoji) not in self.quiz_messages[reaction.message.id]:
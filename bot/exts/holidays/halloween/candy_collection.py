@@ -9,6 +9,8 @@ from discord.ext import commands
 from bot.bot import Bot
 from bot.constants import Channels, Month
 from bot.utils.decorators import in_month
+from bot.utils.listener_filters import listener_filter
+from bot.utils.redis_batch import BatchedRedisCache
 
 log = logging.getLogger(__name__)
 
@@ -44,42 +46,36 @@ class CandyCollection(commands.Cog):
     def __init__(self, bot: Bot):
         self.bot = bot
 
-    @in_month(Month.OCTOBER)
+        # These are written to on nearly every message during October, so writes are batched
+        self.records = BatchedRedisCache(self.candy_records)
+        self.candies = BatchedRedisCache(self.candy_messages)
+        self.skulls = BatchedRedisCache(self.skull_messages)
+
+    async def cog_unload(self) -> None:
+        """Flush any batched writes to Redis."""
+        for cache in (self.records, self.candies, self.skulls):
+            await cache.close()
+
+    @listener_filter(
+        channels=(Channels.sir_lancebot_playground,), months=(Month.OCTOBER,), ignore_bots=True, ignore_dms=True
+    )
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
         """Randomly adds candy or skull reaction to non-bot messages in the Event channel."""
-        # Ignore messages in DMs
-        if not message.guild:
-            return
-        # make sure its a human message
-        if message.author.bot:
-            return
-        # ensure it's hacktober channel
-        if message.channel.id != Channels.sir_lancebot_playground:
-            return
-
         # do random check for skull first as it has the lower chance
         if random.randint(1, ADD_SKULL_REACTION_CHANCE) == 1:
-            await self.skull_messages.set(message.id, "skull")
+            await self.skulls.set(message.id, "skull")
             await message.add_reaction(EMOJIS["SKULL"])
         # check for the candy chance next
         elif random.randint(1, ADD_CANDY_REACTION_CHANCE) == 1:
-            await self.candy_messages.set(message.id, "candy")
+            await self.candies.set(message.id, "candy")
             await message.add_reaction(EMOJIS["CANDY"])
 
-    @in_month(Month.OCTOBER)
+    @listener_filter(channels=(Channels.sir_lancebot_playground,), months=(Month.OCTOBER,), ignore_bots=True)
     @commands.Cog.listener()
     async def on_reaction_add(self, reaction: discord.Reaction, user: Union[discord.User, discord.Member]) -> None:
         """Add/remove candies from a person if the reaction satisfies criteria."""
         message = reaction.message
-        # check to ensure the reactor is human
-        if user.bot:
-            return
-
-        # check to ensure it is in correct channel
-        if message.channel.id != Channels.sir_lancebot_playground:
-            return
-
         # if its not a candy or skull, and it is one of 10 most recent messages,
         # proceed to add a skull/candy with higher chance
         if str(reaction.emoji) not in (EMOJIS["SKULL"], EMOJIS["CANDY"]):
@@ -93,19 +89,16 @@ class CandyCollection(commands.Cog):
                 await self.reacted_msg_chance(message)
             return
 
-        if await self.candy_messages.get(message.id) == "candy" and str(reaction.emoji) == EMOJIS["CANDY"]:
-            await self.candy_messages.delete(message.id)
-            if await self.candy_records.contains(user.id):
-                await self.candy_records.increment(user.id)
-            else:
-                await self.candy_records.set(user.id, 1)
+        if await self.candies.get(message.id) == "candy" and str(reaction.emoji) == EMOJIS["CANDY"]:
+            await self.candies.delete(message.id)
+            await self.records.increment(user.id)
 
-        elif await self.skull_messages.get(message.id) == "skull" and str(reaction.emoji) == EMOJIS["SKULL"]:
-            await self.skull_messages.delete(message.id)
+        elif await self.skulls.get(message.id) == "skull" and str(reaction.emoji) == EMOJIS["SKULL"]:
+            await self.skulls.delete(message.id)
 
-            if prev_record := await self.candy_records.get(user.id):
+            if prev_record := await self.records.get(user.id):
                 lost = min(random.randint(1, 3), prev_record)
-                await self.candy_records.decrement(user.id, lost)
+                await self.records.decrement(user.id, lost)
 
                 if lost == prev_record:
                     await CandyCollection.send_spook_msg(user, message.channel, "all of your")
@@ -126,11 +119,11 @@ class CandyCollection(commands.Cog):
         existing reaction.
         """
         if random.randint(1, ADD_SKULL_EXISTING_REACTION_CHANCE) == 1:
-            await self.skull_messages.set(message.id, "skull")
+            await self.skulls.set(message.id, "skull")
             await message.add_reaction(EMOJIS["SKULL"])
 
         elif random.randint(1, ADD_CANDY_EXISTING_REACTION_CHANCE) == 1:
-            await self.candy_messages.set(message.id, "candy")
+            await self.candies.set(message.id, "candy")
             await message.add_reaction(EMOJIS["CANDY"])
 
     @property
@@ -169,7 +162,7 @@ class CandyCollection(commands.Cog):
     @commands.command()
     async def candy(self, ctx: commands.Context) -> None:
         """Get the candy leaderboard and save to JSON."""
-        records = await self.candy_records.items()
+        records = await self.records.items()
 
         def generate_leaderboard() -> str:
             top_sorted = sorted(
@@ -16,7 +16,9 @@ from discord.ext.commands import Cog, Context, group
 
 from bot.bot import Bot
 from bot.constants import Channels, Client, Colours, Month
+from bot.utils import resolve_current_month
 from bot.utils.decorators import InMonthCheckFailure
+from bot.utils.listener_filters import listener_filter
 
 logger = getLogger(__name__)
 
@@ -186,10 +188,11 @@ class SpookyNameRate(Cog):
             f"But you don't have an entry... :eyes: Type `{Client.prefix}spookynamerate add your entry`"
         )
 
+    @listener_filter(ignore_bots=True)
     @Cog.listener()
     async def on_reaction_add(self, reaction: Reaction, user: User) -> None:
         """Ensures that each user adds maximum one reaction."""
-        if user.bot or not await self.messages.contains(reaction.message.id):
+        if not await self.messages.contains(reaction.message.id):
             return
 
         async with self.checking_messages:  # Acquire the lock so that the dictionary isn't reset while iterating.
@@ -237,6 +240,7 @@ class SpookyNameRate(Cog):
                     await asyncio.sleep(2 * 60 * 60)  # sleep for two hours
 
             logger.info("Calculating score")
+            scores = {}
             for message_id, data in await self.messages.items():
                 data = json.loads(data)
 
@@ -249,11 +253,15 @@ class SpookyNameRate(Cog):
 
                 logger.debug(f"{self.bot.get_user(data['author'])} got a score of {score}")
                 data["score"] = score
-                await self.messages.set(message_id, json.dumps(data))
+                scores[message_id] = json.dumps(data)
+
+            # Write every score back at once, rather than one round-trip per entry
+            if scores:
+                await self.messages.update(scores)
 
             # Sort the winner messages
             winner_messages = sorted(
-                ((msg_id, json.loads(usr_data)) for msg_id, usr_data in await self.messages.items()),
+                ((msg_id, json.loads(usr_data)) for msg_id, usr_data in scores.items()),
                 key=lambda x: x[1]["score"],
                 reverse=True,
             )
@@ -329,8 +337,9 @@ class SpookyNameRate(Cog):
         channel = await self.get_channel()
 
         embed = Embed(color=Colour.red())
+        entries = await self.messages.items()
 
-        if await self.messages.items():
+        if entries:
             if final:
                 embed.title = "Spooky Name Rate is about to end!"
                 embed.description = (
@@ -343,7 +352,7 @@ class SpookyNameRate(Cog):
         else:
             embed.title = "No one has added an entry yet..."
 
-        for message_id, data in await self.messages.items():
+        for message_id, data in entries:
             data = json.loads(data)
 
             embed.add_field(
@@ -368,9 +377,7 @@ class SpookyNameRate(Cog):
         if SpookyNameRate.debug:
             return True
 
-        if not Client.month_override:
-            return datetime.utcnow().month == Month.OCTOBER
-        return Client.month_override == Month.OCTOBER
+        return resolve_current_month() == Month.OCTOBER
 
     def cog_check(self, ctx: Context) -> bool:
         """A command to check whether the command is being called in October."""
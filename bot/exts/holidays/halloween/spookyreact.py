@@ -6,7 +6,7 @@ from discord.ext.commands import Cog
 
 from bot.bot import Bot
 from bot.constants import Month
-from bot.utils.decorators import in_month
+from bot.utils.listener_filters import listener_filter
 
 log = logging.getLogger(__name__)
 
@@ -28,7 +28,7 @@ class SpookyReact(Cog):
     def __init__(self, bot: Bot):
         self.bot = bot
 
-    @in_month(Month.OCTOBER)
+    @listener_filter(months=(Month.OCTOBER,))
     @Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
         """Triggered when the bot sees a message in October."""
@@ -90,10 +90,11 @@ class ConvoStarters(commands.Cog):
         await message.add_reaction("🔄")
         while True:
             try:
-                reaction, user = await self.bot.wait_for(
+                reaction, user = await self.bot.waiters.wait_for(
                     "reaction_add",
                     check=partial(self._predicate, command_invoker, message),
-                    timeout=60.0
+                    timeout=60.0,
+                    message_id=message.id,
                 )
             except asyncio.TimeoutError:
                 with suppress(discord.NotFound):
@@ -1,17 +1,21 @@
+import asyncio
 import logging
 import random
 import re
+import time
 import typing as t
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
 from urllib.parse import quote
 
 import discord
-from aiohttp import ClientResponse
+from aiohttp import ClientResponse, ClientSession
 from discord.ext import commands
 
 from bot.bot import Bot
 from bot.constants import Colours, ERROR_REPLIES, Emojis, NEGATIVE_REPLIES, Tokens
+from bot.utils.listener_filters import listener_filter
 
 log = logging.getLogger(__name__)
 
@@ -25,6 +29,9 @@ REPOSITORY_ENDPOINT = "https://api.github.com/orgs/{org}/repos?per_page=100&type
 ISSUE_ENDPOINT = "https://api.github.com/repos/{user}/{repository}/issues/{number}"
 PR_ENDPOINT = "https://api.github.com/repos/{user}/{repository}/pulls/{number}"
 
+# The organisation of issues which are mentioned without one
+DEFAULT_ORGANISATION = "python-discord"
+
 if Tokens.github:
     REQUEST_HEADERS["Authorization"] = f"token {Tokens.github}"
 
@@ -37,6 +44,13 @@ CODE_BLOCK_RE = re.compile(
 # Maximum number of issues in one message
 MAXIMUM_ISSUES = 5
 
+# How long the state of an issue is reused for before it's checked again, in seconds
+ISSUE_CACHE_TTL = 60
+# How many issue states and API responses are kept
+ISSUE_CACHE_SIZE = 1000
+# Automatic linking is paused while less than this fraction of the rate limit is left, leaving the rest for commands
+RATE_LIMIT_RESERVE = 0.1
+
 # Regex used when looking for automatic linking in messages
 # regex101 of current regex https://regex101.com/r/V2ji8M/6
 AUTOMATIC_REGEX = re.compile(
@@ -72,17 +86,121 @@ class IssueState:
     emoji: str
 
 
-class GithubInfo(commands.Cog):
-    """A Cog that fetches info from GitHub."""
+# The FetchErrors which are cached, as they won't change by checking again soon
+CACHEABLE_ERRORS = (404, 410)
 
-    def __init__(self, bot: Bot):
-        self.bot = bot
-        self.repos = []
 
-    @staticmethod
-    def remove_codeblocks(message: str) -> str:
-        """Remove any codeblock in a message."""
-        return CODE_BLOCK_RE.sub("", message)
+class IssueResolver:
+    """
+    Looks up the state of issues and PRs for automatic linking.
+
+    States are reused for `ISSUE_CACHE_TTL` seconds, after which the issue is fetched again using the ETags of the
+    responses it came from, so an issue which hasn't changed doesn't count towards the rate limit. Concurrent lookups
+    of the same issue share one fetch. While less than `RATE_LIMIT_RESERVE` of the rate limit is left, issues are
+    only looked up in the cache, until the rate limit resets.
+    """
+
+    def __init__(self, http_session: ClientSession):
+        self.http_session = http_session
+
+        self._states: OrderedDict[tuple, tuple[float, t.Union[IssueState, FetchError]]] = OrderedDict()
+        # The ETag and JSON of each response, by URL
+        self._responses: OrderedDict[str, tuple[str, t.Any]] = OrderedDict()
+        self._in_flight: dict[tuple, asyncio.Task] = {}
+
+        self.rate_limit_remaining: t.Optional[int] = None
+        self.rate_limit_limit = 0
+        self.rate_limit_reset = 0.0
+
+    @property
+    def paused(self) -> bool:
+        """Whether lookups are paused until the rate limit resets."""
+        if (
+            self.rate_limit_remaining is None
+            or self.rate_limit_remaining >= self.rate_limit_limit * RATE_LIMIT_RESERVE
+        ):
+            return False
+        return time.time() < self.rate_limit_reset
+
+    def update_rate_limit(self, headers: t.Mapping[str, str]) -> None:
+        """Record how much of the rate limit is left from the headers of a GitHub API response."""
+        if "X-RateLimit-Remaining" not in headers:
+            return
+
+        was_paused = self.paused
+        self.rate_limit_remaining = int(headers["X-RateLimit-Remaining"])
+        # Without a token, the limit is 60 requests an hour rather than 5000
+        self.rate_limit_limit = int(headers.get("X-RateLimit-Limit", 0))
+        self.rate_limit_reset = float(headers.get("X-RateLimit-Reset", 0))
+        if self.paused and not was_paused:
+            log.info(f"Pausing automatic issue linking, {self.rate_limit_remaining} GitHub requests are left.")
+
+    async def resolve(self, issues: t.Iterable[FoundIssue]) -> list[t.Union[IssueState, FetchError]]:
+        """Look up the state of every issue concurrently, returning them in the same order."""
+        return await asyncio.gather(*(self._resolve(issue) for issue in issues))
+
+    async def _resolve(self, issue: FoundIssue) -> t.Union[IssueState, FetchError]:
+        # GitHub's names are case-insensitive, so the key is too
+        key = ((issue.organisation or DEFAULT_ORGANISATION).casefold(), issue.repository.casefold(), int(issue.number))
+
+        cached = self._states.get(key)
+        if cached and cached[0] > time.time():
+            self._states.move_to_end(key)
+            return cached[1]
+
+        if self.paused:
+            # A stale state is better than none while lookups are paused
+            if cached:
+                return cached[1]
+            return FetchError(403, "Ratelimit reached, please retry in a few minutes.")
+
+        task = self._in_flight.get(key)
+        if not task:
+            task = asyncio.create_task(self._fetch(key, issue))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            # Mark the exception as retrieved, in case every caller was cancelled before it was raised.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        # Shielded so that one caller being cancelled doesn't cancel the fetch for the others.
+        return await asyncio.shield(task)
+
+    async def _fetch_json(self, url: str) -> tuple[int, t.Any]:
+        """Make a GET request to the GitHub API, revalidating the last response from `url` if there was one."""
+        headers = REQUEST_HEADERS
+        cached = self._responses.get(url)
+        if cached:
+            headers = {**REQUEST_HEADERS, "If-None-Match": cached[0]}
+
+        log.trace(f"Querying GH issues API: {url}")
+        async with self.http_session.get(url, headers=headers) as r:
+            self.update_rate_limit(r.headers)
+            if cached and r.status == 304:
+                self._responses.move_to_end(url)
+                return 200, cached[1]
+
+            json_data = await r.json()
+            if r.status == 200 and (etag := r.headers.get("ETag")):
+                self._responses[url] = (etag, json_data)
+                self._responses.move_to_end(url)
+                if len(self._responses) > ISSUE_CACHE_SIZE:
+                    self._responses.popitem(last=False)
+
+            return r.status, json_data
+
+    async def _fetch(self, key: tuple, issue: FoundIssue) -> t.Union[IssueState, FetchError]:
+        """Fetch the state of an issue, caching it unless the fetch failed in a way which might not last."""
+        state = await self.fetch_issue(
+            int(issue.number), issue.repository, issue.organisation or DEFAULT_ORGANISATION
+        )
+
+        if isinstance(state, IssueState) or state.return_code in CACHEABLE_ERRORS:
+            self._states[key] = (time.time() + ISSUE_CACHE_TTL, state)
+            self._states.move_to_end(key)
+            if len(self._states) > ISSUE_CACHE_SIZE:
+                self._states.popitem(last=False)
+
+        return state
 
     async def fetch_issue(
         self,
@@ -98,17 +216,17 @@ class GithubInfo(commands.Cog):
         url = ISSUE_ENDPOINT.format(user=user, repository=repository, number=number)
         pulls_url = PR_ENDPOINT.format(user=user, repository=repository, number=number)
 
-        json_data, r = await self.fetch_data(url)
+        status, json_data = await self._fetch_json(url)
 
-        if r.status == 403:
-            if r.headers.get("X-RateLimit-Remaining") == "0":
+        if status == 403:
+            if self.rate_limit_remaining == 0:
                 log.info(f"Ratelimit reached while fetching {url}")
                 return FetchError(403, "Ratelimit reached, please retry in a few minutes.")
             return FetchError(403, "Cannot access issue.")
-        elif r.status in (404, 410):
-            return FetchError(r.status, "Issue not found.")
-        elif r.status != 200:
-            return FetchError(r.status, "Error while fetching issue.")
+        elif status in (404, 410):
+            return FetchError(status, "Issue not found.")
+        elif status != 200:
+            return FetchError(status, "Error while fetching issue.")
 
         # The initial API request is made to the issues API endpoint, which will return information
         # if the issue or PR is present. However, the scope of information returned for PRs differs
@@ -124,7 +242,10 @@ class GithubInfo(commands.Cog):
         # we know that a PR has been requested and a call to the pulls API endpoint is necessary
         # to get the desired information for the PR.
         else:
-            pull_data, _ = await self.fetch_data(pulls_url)
+            status, pull_data = await self._fetch_json(pulls_url)
+            if status != 200:
+                return FetchError(status, "Error while fetching pull request.")
+
             if pull_data["draft"]:
                 emoji = Emojis.pull_request_draft
             elif pull_data["state"] == "open":
@@ -139,6 +260,20 @@ class GithubInfo(commands.Cog):
 
         return IssueState(repository, number, issue_url, json_data.get("title", ""), emoji)
 
+
+class GithubInfo(commands.Cog):
+    """A Cog that fetches info from GitHub."""
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self.repos = []
+        self.issues = IssueResolver(bot.http_session)
+
+    @staticmethod
+    def remove_codeblocks(message: str) -> str:
+        """Remove any codeblock in a message."""
+        return CODE_BLOCK_RE.sub("", message)
+
     @staticmethod
     def format_embed(
         results: t.List[t.Union[IssueState, FetchError]]
@@ -169,6 +304,7 @@ class GithubInfo(commands.Cog):
         if ctx.invoked_subcommand is None:
             await self.bot.invoke_help_command(ctx)
 
+    @listener_filter(ignore_bots=True, ignore_dms=True)
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
         """
@@ -176,8 +312,8 @@ class GithubInfo(commands.Cog):
 
         Listener to retrieve issue(s) from a GitHub repository using automatic linking if matching <org>/<repo>#<issue>.
         """
-        # Ignore bots
-        if message.author.bot:
+        # Most messages don't mention an issue at all, so don't run the regex on them
+        if "#" not in message.content:
             return
 
         issues = [
@@ -187,10 +323,6 @@ class GithubInfo(commands.Cog):
         links = []
 
         if issues:
-            # Block this from working in DMs
-            if not message.guild:
-                return
-
             log.trace(f"Found {issues = }")
             # Remove duplicates
             issues = list(dict.fromkeys(issues))
@@ -204,14 +336,7 @@ class GithubInfo(commands.Cog):
                 await message.channel.send(embed=embed, delete_after=5)
                 return
 
-            for repo_issue in issues:
-                result = await self.fetch_issue(
-                    int(repo_issue.number),
-                    repo_issue.repository,
-                    repo_issue.organisation or "python-discord"
-                )
-                if isinstance(result, IssueState):
-                    links.append(result)
+            links = [result for result in await self.issues.resolve(issues) if isinstance(result, IssueState)]
 
         if not links:
             return
@@ -223,6 +348,7 @@ class GithubInfo(commands.Cog):
         """Retrieve data as a dictionary and the response in a tuple."""
         log.trace(f"Querying GH issues API: {url}")
         async with self.bot.http_session.get(url, headers=REQUEST_HEADERS) as r:
+            self.issues.update_rate_limit(r.headers)
             return await r.json(), r
 
     @github_group.command(name="user", aliases=("userinfo",))
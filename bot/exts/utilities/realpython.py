@@ -15,6 +15,7 @@ API_ROOT = "https://realpython.com/search/api/v1/"
 ARTICLE_URL = "https://realpython.com{article_url}"
 SEARCH_URL = "https://realpython.com/search?q={user_search}"
 HOME_URL = "https://realpython.com/"
+SEARCH_CACHE_TTL = 60 * 60
 
 ERROR_EMBED = Embed(
     title="Error while searching Real Python",
@@ -62,15 +63,15 @@ class RealPython(commands.Cog):
             await ctx.send(embed=homepage_embed)
 
         params = {"q": user_search, "limit": amount, "kind": "article"}
-        async with self.bot.http_session.get(url=API_ROOT, params=params) as response:
-            if response.status != 200:
-                logger.error(
-                    f"Unexpected status code {response.status} from Real Python"
-                )
-                await ctx.send(embed=ERROR_EMBED)
-                return
-
-            data = await response.json()
+        response = await self.bot.http_cache.get(API_ROOT, params=params, ttl=SEARCH_CACHE_TTL)
+        if response.status != 200:
+            logger.error(
+                f"Unexpected status code {response.status} from Real Python"
+            )
+            await ctx.send(embed=ERROR_EMBED)
+            return
+
+        data = response.json()
 
         articles = data["results"]
 
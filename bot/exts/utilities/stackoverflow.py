@@ -17,6 +17,7 @@ SO_PARAMS = {
     "site": "stackoverflow"
 }
 SEARCH_URL = "https://stackoverflow.com/search?q={query}"
+SEARCH_CACHE_TTL = 10 * 60
 ERR_EMBED = Embed(
     title="Error in fetching results from Stackoverflow",
     description=(
@@ -38,13 +39,13 @@ class Stackoverflow(commands.Cog):
     async def stackoverflow(self, ctx: commands.Context, *, search_query: str) -> None:
         """Sends the top 5 results of a search query from stackoverflow."""
         params = SO_PARAMS | {"q": search_query}
-        async with self.bot.http_session.get(url=BASE_URL, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-            else:
-                logger.error(f'Status code is not 200, it is {response.status}')
-                await ctx.send(embed=ERR_EMBED)
-                return
+        response = await self.bot.http_cache.get(BASE_URL, params=params, ttl=SEARCH_CACHE_TTL)
+        if response.status == 200:
+            data = response.json()
+        else:
+            logger.error(f'Status code is not 200, it is {response.status}')
+            await ctx.send(embed=ERR_EMBED)
+            return
         if not data['items']:
             no_search_result = Embed(
                 title=f"No search results found for {search_query}",
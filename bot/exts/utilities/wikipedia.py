@@ -25,6 +25,7 @@ WIKI_PARAMS = {
     "origin": "*",
 
 }
+SEARCH_CACHE_TTL = 60 * 60
 WIKI_THUMBNAIL = (
     "https://upload.wikimedia.org/wikipedia/en/thumb/8/80/Wikipedia-logo-v2.svg"
     "/330px-Wikipedia-logo-v2.svg.png"
@@ -45,33 +46,33 @@ class WikipediaSearch(commands.Cog):
     async def wiki_request(self, channel: TextChannel, search: str) -> list[str]:
         """Search wikipedia search string and return formatted first 10 pages found."""
         params = WIKI_PARAMS | {"srlimit": 10, "srsearch": search}
-        async with self.bot.http_session.get(url=SEARCH_API, params=params) as resp:
-            if resp.status != 200:
-                log.info(f"Unexpected response `{resp.status}` while searching wikipedia for `{search}`")
-                raise APIError("Wikipedia API", resp.status)
-
-            raw_data = await resp.json()
-
-            if not raw_data.get("query"):
-                if error := raw_data.get("errors"):
-                    log.error(f"There was an error while communicating with the Wikipedia API: {error}")
-                raise APIError("Wikipedia API", resp.status, error)
-
-            lines = []
-            if raw_data["query"]["searchinfo"]["totalhits"]:
-                for article in raw_data["query"]["search"]:
-                    line = WIKI_SEARCH_RESULT.format(
-                        name=article["title"],
-                        description=unescape(
-                            re.sub(
-                                WIKI_SNIPPET_REGEX, "", article["snippet"]
-                            )
-                        ),
-                        url=f"https://en.wikipedia.org/?curid={article['pageid']}"
-                    )
-                    lines.append(line)
-
-            return lines
+        resp = await self.bot.http_cache.get(SEARCH_API, params=params, ttl=SEARCH_CACHE_TTL)
+        if resp.status != 200:
+            log.info(f"Unexpected response `{resp.status}` while searching wikipedia for `{search}`")
+            raise APIError("Wikipedia API", resp.status)
+
+        raw_data = resp.json()
+
+        if not raw_data.get("query"):
+            if error := raw_data.get("errors"):
+                log.error(f"There was an error while communicating with the Wikipedia API: {error}")
+            raise APIError("Wikipedia API", resp.status, error)
+
+        lines = []
+        if raw_data["query"]["searchinfo"]["totalhits"]:
+            for article in raw_data["query"]["search"]:
+                line = WIKI_SEARCH_RESULT.format(
+                    name=article["title"],
+                    description=unescape(
+                        re.sub(
+                            WIKI_SNIPPET_REGEX, "", article["snippet"]
+                        )
+                    ),
+                    url=f"https://en.wikipedia.org/?curid={article['pageid']}"
+                )
+                lines.append(line)
+
+        return lines
 
     @commands.cooldown(1, 10, commands.BucketType.user)
     @commands.command(name="wikipedia", aliases=("wiki",))
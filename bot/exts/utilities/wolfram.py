@@ -11,6 +11,7 @@ from discord.ext.commands import BucketType, Cog, Context, check, group
 
 from bot.bot import Bot
 from bot.constants import Colours, STAFF_ROLES, Wolfram
+from bot.utils.checks import stateful_check
 from bot.utils.pagination import ImagePaginator
 
 log = logging.getLogger(__name__)
@@ -102,7 +103,7 @@ def custom_cooldown(*ignore: int) -> Callable:
 
         return True
 
-    return check(predicate)
+    return check(stateful_check(predicate))
 
 
 async def get_pod_pages(ctx: Context, bot: Bot, query: str) -> Optional[list[tuple[str, str]]]:
@@ -42,11 +42,12 @@ class WTFPython(commands.Cog):
     @tasks.loop(minutes=60)
     async def fetch_readme(self) -> None:
         """Gets the content of README.md from the WTF Python Repository."""
-        async with self.bot.http_session.get(f"{WTF_PYTHON_RAW_URL}README.md") as resp:
-            log.trace("Fetching the latest WTF Python README.md")
-            if resp.status == 200:
-                raw = await resp.text()
-                self.parse_readme(raw)
+        log.trace("Fetching the latest WTF Python README.md")
+        # Expire before the next fetch, so that it is revalidated rather than downloaded again.
+        resp = await self.bot.http_cache.get(f"{WTF_PYTHON_RAW_URL}README.md", ttl=30 * 60)
+        if resp.status == 200:
+            raw = resp.text()
+            self.parse_readme(raw)
 
     def parse_readme(self, data: str) -> None:
         """
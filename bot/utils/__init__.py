@@ -3,14 +3,14 @@ import contextlib
 import re
 import string
 from collections.abc import Iterable
-from datetime import datetime
 from typing import Optional
 
 import discord
 from discord.ext.commands import BadArgument, Context
 
-from bot.constants import Client, Month
+from bot.constants import Month
 from bot.utils.pagination import LinePaginator
+from bot.utils.seasons import season_clock
 
 
 def human_months(months: Iterable[Month]) -> str:
@@ -23,12 +23,9 @@ def resolve_current_month() -> Month:
     Determine current month w.r.t. `Client.month_override` env var.
 
     If the env variable was set, current month always resolves to the configured value.
-    Otherwise, the current UTC month is given.
+    Otherwise, the current UTC month is given, which is cached by the season clock until the month ends.
     """
-    if Client.month_override is not None:
-        return Month(Client.month_override)
-    else:
-        return Month(datetime.utcnow().month)
+    return season_clock.current_month
 
 
 async def disambiguate(
@@ -67,7 +64,9 @@ async def disambiguate(
         if embed is None:
             embed = discord.Embed()
 
-        coro1 = ctx.bot.wait_for("message", check=check, timeout=timeout)
+        coro1 = ctx.bot.waiters.wait_for(
+            "message", check=check, timeout=timeout, channel_id=ctx.channel.id, user_id=ctx.author.id
+        )
         coro2 = LinePaginator.paginate(
             choices, ctx, embed=embed, max_lines=entries_per_page,
             empty=empty, max_size=6000, timeout=9000
@@ -0,0 +1,87 @@
+from collections import Counter
+from collections.abc import Iterable
+
+from rapidfuzz import fuzz
+
+
+def normalise(text: str) -> str:
+    """Casefold `text` and collapse its whitespace, so that answers compare the same however they're typed."""
+    return " ".join(text.casefold().split())
+
+
+class _Answer:
+    """A normalised answer, along with what's needed to rule out guesses for it without scoring them in full."""
+
+    __slots__ = ("text", "chars", "min_length", "max_length")
+
+    def __init__(self, text: str, threshold: float):
+        self.text = normalise(text)
+        self.chars = Counter(self.text)
+
+        # `fuzz.ratio` is 200 * matches / (len(a) + len(b)), and there can't be more matches than characters in the
+        # shorter string, so a guess can only score above the threshold if its length is within these bounds.
+        length = len(self.text)
+        if threshold <= 0:
+            self.min_length, self.max_length = 0, float("inf")
+        elif threshold >= 100:
+            self.min_length, self.max_length = float("inf"), -1
+        else:
+            self.min_length = length * threshold / (200 - threshold)
+            self.max_length = length * (200 - threshold) / threshold
+
+
+class AnswerMatcher:
+    """
+    Scores guesses against a question's answers with `fuzz.ratio`, where a guess matches if it scores above `threshold`.
+
+    The answers are normalised once when the matcher is made, rather than for every guess. Guesses are first ruled
+    out by their length, then by how many characters they share with an answer, before being scored in full.
+    """
+
+    def __init__(self, answers: Iterable[str], threshold: float):
+        self.threshold = threshold
+        self.answers = [_Answer(answer, threshold) for answer in answers]
+
+    def _score(self, guess: str) -> float:
+        best = 0
+        guess_chars = None
+
+        for answer in self.answers:
+            if guess == answer.text:
+                return 100
+            if not answer.min_length < len(guess) < answer.max_length:
+                continue
+
+            # The characters in common are an upper bound on how many can be matched in order.
+            guess_chars = guess_chars or Counter(guess)
+            common = (guess_chars & answer.chars).total()
+            if 200 * common / (len(guess) + len(answer.text)) <= self.threshold:
+                continue
+
+            best = max(best, fuzz.ratio(answer.text, guess, score_cutoff=self.threshold))
+
+        return best
+
+    def score(self, guess: str) -> float:
+        """
+        Return the best score of `guess` against any of the answers.
+
+        Guesses which can't score above the threshold are given 0 without being scored in full.
+        """
+        return self._score(normalise(guess))
+
+    def matches(self, guess: str) -> bool:
+        """Return whether `guess` scores above the threshold against any of the answers."""
+        return self.score(guess) > self.threshold
+
+    def score_batch(self, guesses: Iterable[str]) -> list[float]:
+        """Score several guesses at once, with guesses that are the same once normalised only being scored once."""
+        scores = {}
+        results = []
+        for guess in guesses:
+            guess = normalise(guess)
+            if guess not in scores:
+                scores[guess] = self._score(guess)
+            results.append(scores[guess])
+
+        return results
@@ -127,6 +127,18 @@ def without_role_check(ctx: Context, *role_ids: int) -> bool:
     return check
 
 
+def stateful_check(predicate: Callable) -> Callable:
+    """
+    Mark a check's `predicate` as depending on more than the channel, the author's roles and the month.
+
+    The help command shares which commands can be run between everyone with the same roles in the same kind of
+    channel, so checks like this, such as ones about who the author is or which games are running, are instead
+    run for every help page which lists their command.
+    """
+    predicate.stateful = True
+    return predicate
+
+
 def cooldown_with_role_bypass(rate: int, per: float, type: BucketType = BucketType.default, *,
                               bypass_roles: Iterable[int]) -> Callable:
     """
@@ -42,7 +42,8 @@ class CoordinateConverter(commands.Converter):
         x = ord(letter) - ord("a")
         y = int(digit) - 1
 
-        if (not 0 <= x <= 9) or (not 0 <= y <= 9):
+        # Whether the coordinate is actually on the board is left to the command, since boards vary in size
+        if (not 0 <= x <= 25) or y < 0:
             raise commands.BadArgument
         return x, y
 
@@ -15,6 +15,7 @@ from discord.ext.commands import CheckFailure, Command, Context
 from bot.constants import Channels, ERROR_REPLIES, Month, WHITELISTED_CHANNELS
 from bot.utils import human_months, resolve_current_month
 from bot.utils.checks import in_whitelist_check
+from bot.utils.seasons import season_clock
 
 ONE_DAY = 24 * 60 * 60
 
@@ -42,6 +43,7 @@ def seasonal_task(*allowed_months: Month, sleep_time: Union[float, int] = ONE_DA
 
     The decorated function will be called once every `sleep_time` seconds while
     the current UTC month is in `allowed_months`. Sleep time defaults to 24 hours.
+    Outside of `allowed_months`, the task sleeps until the next of them starts.
 
     The wrapped task is responsible for waiting for the bot to be ready, if necessary.
     """
@@ -52,13 +54,11 @@ def seasonal_task(*allowed_months: Month, sleep_time: Union[float, int] = ONE_DA
             log.info(f"Starting seasonal task {task_body.__qualname__} ({human_months(allowed_months)})")
 
             while True:
-                current_month = resolve_current_month()
-
-                if current_month in allowed_months:
-                    await task_body(*args, **kwargs)
-                else:
-                    log.debug(f"Seasonal task {task_body.__qualname__} sleeps in {current_month!s}")
+                if resolve_current_month() not in allowed_months:
+                    log.debug(f"Seasonal task {task_body.__qualname__} sleeps until {human_months(allowed_months)}")
+                    await season_clock.wait_for(allowed_months)
 
+                await task_body(*args, **kwargs)
                 await asyncio.sleep(sleep_time)
         return decorated_task
     return decorator
@@ -74,13 +74,9 @@ def in_month_listener(*allowed_months: Month) -> Callable:
         @functools.wraps(listener)
         async def guarded_listener(*args, **kwargs) -> None:
             """Wrapped listener will abort if not in allowed month."""
-            current_month = resolve_current_month()
-
-            if current_month in allowed_months:
+            if resolve_current_month() in allowed_months:
                 # Propagate return value although it should always be None
                 return await listener(*args, **kwargs)
-            else:
-                log.debug(f"Guarded {listener.__qualname__} from invoking in {current_month!s}")
         return guarded_listener
     return decorator
 
@@ -91,18 +87,15 @@ def in_month_command(*allowed_months: Month) -> Callable:
 
     Uses the current UTC month at the time of running the predicate.
     """
+    allowed = human_months(allowed_months)
+
     async def predicate(ctx: Context) -> bool:
         current_month = resolve_current_month()
-        can_run = current_month in allowed_months
-
-        log.debug(
-            f"Command '{ctx.command}' is locked to months {human_months(allowed_months)}. "
-            f"Invoking it in month {current_month!s} is {'allowed' if can_run else 'disallowed'}."
-        )
-        if can_run:
+        if current_month in allowed_months:
             return True
-        else:
-            raise InMonthCheckFailure(f"Command can only be used in {human_months(allowed_months)}")
+
+        log.debug(f"Command '{ctx.command}' is locked to months {allowed}, so can't be invoked in {current_month!s}.")
+        raise InMonthCheckFailure(f"Command can only be used in {allowed}")
 
     return commands.check(predicate)
 
@@ -17,6 +17,12 @@ class APIError(Exception):
         self.error_msg = error_msg
 
 
+class ExecutorSaturatedError(Exception):
+    """Raised when a worker pool has too much queued work to accept more."""
+
+    pass
+
+
 class MovedCommandError(Exception):
     """Raised when a command has moved locations."""
 
@@ -0,0 +1,258 @@
+import asyncio
+import base64
+import dataclasses
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import aiohttp
+from async_rediscache import RedisSession
+from redis import RedisError
+
+log = logging.getLogger(__name__)
+
+# Statuses which may be cached without explicit freshness information.
+# See https://www.rfc-editor.org/rfc/rfc9111#section-4.2.2
+CACHEABLE_STATUSES = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+
+# How long a stale response with an ETag or Last-Modified header is kept in Redis,
+# so that it can be revalidated rather than downloaded again.
+STALE_RETENTION = 24 * 60 * 60
+
+
+@dataclasses.dataclass
+class CachedResponse:
+    """A fully read HTTP response, which is safe to share between callers."""
+
+    url: str
+    status: int
+    body: bytes
+    content_type: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    expires_at: float = 0
+
+    @property
+    def expired(self) -> bool:
+        """Whether this response needs to be revalidated or fetched again before it is used."""
+        return time.time() >= self.expires_at
+
+    def text(self, encoding: str = "utf-8") -> str:
+        """Decode the body as text."""
+        return self.body.decode(encoding)
+
+    def json(self) -> Any:
+        """Decode the body as JSON."""
+        return json.loads(self.body)
+
+    def to_redis(self) -> str:
+        """Serialise this response for storage in Redis."""
+        data = dataclasses.asdict(self)
+        data["body"] = base64.b64encode(self.body).decode()
+        return json.dumps(data)
+
+    @classmethod
+    def from_redis(cls, value: str) -> "CachedResponse":
+        """Deserialise a response stored with `to_redis`."""
+        data = json.loads(value)
+        data["body"] = base64.b64decode(data["body"])
+        return cls(**data)
+
+
+class ResponseCache:
+    """
+    A cache for GET requests made with the bot's HTTP session, which cogs can opt into.
+
+    Responses are kept until their TTL runs out, after which they are revalidated using their ETag or Last-Modified
+    header if they had one. Responses are stored in memory in least recently used order, with a budget on the total
+    size of their bodies. If a Redis session is given, responses are also shared through Redis, so that they survive
+    restarts. Redis is only used on a best effort basis, errors are logged and ignored.
+
+    Concurrent requests for the same key are coalesced, so that only one request is made upstream and every caller
+    gets the same response. The number of requests which were collapsed this way is counted in `coalesced`.
+    """
+
+    def __init__(
+        self,
+        http_session: aiohttp.ClientSession,
+        max_bytes: int,
+        default_ttl: float,
+        redis_session: Optional[RedisSession] = None
+    ):
+        self.http_session = http_session
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.redis_session = redis_session
+
+        self._responses: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._size = 0
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.coalesced = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Counters describing how effective the cache has been."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "entries": len(self._responses),
+            "bytes": self._size,
+        }
+
+    @staticmethod
+    def make_key(url: str, params: Optional[dict[str, Any]], kwargs: dict[str, Any]) -> str:
+        """Create a cache key for a GET request with the given arguments."""
+        content = json.dumps([url, params, kwargs], sort_keys=True, default=str).encode()
+        return hashlib.sha256(content).hexdigest()
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.redis_session.global_namespace}.http_cache:{key}"
+
+    def _store(self, key: str, response: CachedResponse) -> None:
+        """Store a response in memory, evicting the least recently used ones until it fits."""
+        if len(response.body) > self.max_bytes:
+            return
+
+        if key in self._responses:
+            self._size -= len(self._responses.pop(key).body)
+
+        self._responses[key] = response
+        self._size += len(response.body)
+        while self._size > self.max_bytes:
+            _, evicted = self._responses.popitem(last=False)
+            self._size -= len(evicted.body)
+
+    async def _lookup(self, key: str) -> Optional[CachedResponse]:
+        """Find a response in memory or Redis, which may have expired."""
+        if key in self._responses:
+            self._responses.move_to_end(key)
+            return self._responses[key]
+
+        if not self.redis_session:
+            return None
+
+        try:
+            value = await self.redis_session.client.get(self._redis_key(key))
+        except RedisError:
+            log.exception("Failed to get a cached response from Redis.")
+            return None
+
+        if value is None:
+            return None
+
+        response = CachedResponse.from_redis(value)
+        self._store(key, response)
+        return response
+
+    async def _save(self, key: str, response: CachedResponse) -> None:
+        """Save a response to memory and Redis."""
+        self._store(key, response)
+
+        if not self.redis_session:
+            return
+
+        expiry = response.expires_at - time.time()
+        if response.etag or response.last_modified:
+            expiry += STALE_RETENTION
+
+        try:
+            await self.redis_session.client.set(self._redis_key(key), response.to_redis(), ex=max(1, int(expiry)))
+        except RedisError:
+            log.exception("Failed to store a cached response in Redis.")
+
+    async def get(
+        self,
+        url: str,
+        *,
+        ttl: Optional[float] = None,
+        error_ttl: Optional[float] = None,
+        params: Optional[dict[str, Any]] = None,
+        **kwargs
+    ) -> CachedResponse:
+        """
+        Make a GET request to `url`, returning a cached response if there is a fresh one.
+
+        `ttl` is how many seconds the response is fresh for, defaulting to the cache's `default_ttl`.
+        `error_ttl` is used instead for responses with any status other than 200, defaulting to `ttl`. Setting it
+        to 0 stops them from being cached, such as for a 404 from a resource which may be about to be created.
+        Any other keyword arguments are passed to `aiohttp.ClientSession.get`, and are part of the cache key.
+        """
+        if ttl is None:
+            ttl = self.default_ttl
+        if error_ttl is None:
+            error_ttl = ttl
+
+        key = self.make_key(url, params, kwargs)
+        cached = await self._lookup(key)
+        if cached and not cached.expired:
+            self.hits += 1
+            return cached
+
+        task = self._in_flight.get(key)
+        if task:
+            log.trace(f"Coalescing a request for {url} with one already in flight.")
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(self._fetch(key, url, ttl, error_ttl, cached, params, kwargs))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            # Mark the exception as retrieved, in case every caller was cancelled before it was raised.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        # Shielded so that one caller being cancelled doesn't cancel the request for the others.
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        key: str,
+        url: str,
+        ttl: float,
+        error_ttl: float,
+        cached: Optional[CachedResponse],
+        params: Optional[dict[str, Any]],
+        kwargs: dict[str, Any]
+    ) -> CachedResponse:
+        """Fetch a response, revalidating `cached` if it can be, and cache it if it's cacheable."""
+        kwargs = kwargs.copy()
+        headers = dict(kwargs.pop("headers", None) or {})
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        async with self.http_session.get(url, params=params, headers=headers, **kwargs) as resp:
+            if cached and resp.status == 304:
+                log.trace(f"Revalidated the cached response for {url}.")
+                self.revalidations += 1
+                ttl = ttl if cached.status == 200 else error_ttl
+                response = dataclasses.replace(cached, expires_at=time.time() + ttl)
+                await self._save(key, response)
+                return response
+
+            ttl = ttl if resp.status == 200 else error_ttl
+            response = CachedResponse(
+                url=str(resp.url),
+                status=resp.status,
+                body=await resp.read(),
+                content_type=resp.content_type,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+                expires_at=time.time() + ttl,
+            )
+            cache_control = resp.headers.get("Cache-Control", "")
+
+        if ttl > 0 and response.status in CACHEABLE_STATUSES and "no-store" not in cache_control:
+            await self._save(key, response)
+
+        return response
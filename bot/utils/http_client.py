@@ -0,0 +1,172 @@
+import asyncio
+import logging
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+
+import aiohttp
+
+from bot import constants
+
+log = logging.getLogger(__name__)
+
+
+class HostLimitedResponse(aiohttp.ClientResponse):
+    """A response which gives its host's slot in a `HostLimiter` back once it's released or closed."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.release_slot: Optional[Callable[[], None]] = None
+
+    def _release_slot(self) -> None:
+        if self.release_slot:
+            release_slot, self.release_slot = self.release_slot, None
+            release_slot()
+
+    def release(self) -> Any:
+        """Release the connection, and the host's slot along with it."""
+        try:
+            return super().release()
+        finally:
+            self._release_slot()
+
+    def close(self) -> None:
+        """Close the connection, and release the host's slot."""
+        try:
+            super().close()
+        finally:
+            self._release_slot()
+
+
+class HostLimiter:
+    """
+    Limits how many requests can be in flight to each of a set of hosts at once.
+
+    This stops a slow API from taking up every connection in the pool, leaving none for everything else.
+    A slot is taken when a request starts and given back once its response is released, which is after its body
+    has been read when the response is used as a context manager. Sessions need to use `HostLimitedResponse`
+    as their response class for that, otherwise the slot is given back as soon as the response headers arrive.
+    Requests to hosts without a limit are only bound by the connector's own limits.
+    """
+
+    def __init__(self, limits: dict[str, int]):
+        self.limits = limits
+        self._slots = {host: asyncio.Semaphore(limit) for host, limit in limits.items()}
+
+        self.requests = Counter()
+        self.throttled = Counter()
+        self.in_flight = Counter()
+
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_start.append(self._on_request_start)
+        self.trace_config.on_request_end.append(self._on_request_end)
+        self.trace_config.on_request_exception.append(self._on_request_exception)
+
+    async def _on_request_start(
+        self,
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams
+    ) -> None:
+        # Some versions of aiohttp send this again for each redirect, which shouldn't take another slot.
+        if getattr(context, "limited_host", None):
+            return
+
+        host = params.url.host
+        self.requests[host] += 1
+        if host not in self._slots:
+            return
+
+        slots = self._slots[host]
+        if slots.locked():
+            log.trace(f"Waiting for a free slot to make a request to {host}.")
+            self.throttled[host] += 1
+
+        await slots.acquire()
+        self.in_flight[host] += 1
+        context.limited_host = host
+
+    async def _on_request_end(
+        self,
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestEndParams
+    ) -> None:
+        if host := getattr(context, "limited_host", None):
+            context.limited_host = None
+            if isinstance(params.response, HostLimitedResponse):
+                # The body is still to be read, so the slot is kept until the response is released
+                params.response.release_slot = lambda: self._release(host)
+            else:
+                self._release(host)
+
+    async def _on_request_exception(
+        self,
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        _params: aiohttp.TraceRequestExceptionParams
+    ) -> None:
+        if host := getattr(context, "limited_host", None):
+            context.limited_host = None
+            self._release(host)
+
+    def _release(self, host: str) -> None:
+        self.in_flight[host] -= 1
+        self._slots[host].release()
+
+
+def create_http_session(limiter: Optional[HostLimiter] = None) -> aiohttp.ClientSession:
+    """
+    Create an HTTP session configured with the connection limits and timeouts from `HTTPClient`.
+
+    If a `limiter` is given, requests made with the session are also limited by it, until their responses
+    are released.
+    """
+    config = constants.HTTPClient
+    connector = aiohttp.TCPConnector(
+        limit=config.limit,
+        limit_per_host=config.limit_per_host,
+        keepalive_timeout=config.keepalive_timeout,
+        ttl_dns_cache=config.dns_cache_ttl,
+    )
+    timeout = aiohttp.ClientTimeout(total=config.total_timeout, connect=config.connect_timeout)
+    if limiter:
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            trace_configs=[limiter.trace_config],
+            response_class=HostLimitedResponse,
+        )
+
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+def pool_stats(session: aiohttp.ClientSession, limiter: Optional[HostLimiter] = None) -> dict[str, Any]:
+    """Return how much of the connection pool of `session` is in use, along with the counters of `limiter`."""
+    connector = session.connector
+    # The connector doesn't expose these publicly, but they've been stable across aiohttp releases.
+    in_use_per_host = Counter()
+    for key, connections in connector._acquired_per_host.items():
+        in_use_per_host[key.host] += len(connections)
+    idle = sum(len(connections) for connections in connector._conns.values())
+
+    stats = {
+        "limit": connector.limit,
+        "limit_per_host": connector.limit_per_host,
+        "in_use": len(connector._acquired),
+        "idle": idle,
+        "in_use_per_host": dict(in_use_per_host.most_common()),
+    }
+
+    if limiter:
+        stats["requests_per_host"] = dict(limiter.requests.most_common())
+        stats["limited_hosts"] = {
+            host: {
+                "limit": limit,
+                "in_flight": limiter.in_flight[host],
+                "throttled": limiter.throttled[host],
+            }
+            for host, limit in limiter.limits.items()
+        }
+
+    return stats
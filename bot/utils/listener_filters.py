@@ -0,0 +1,99 @@
+import logging
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any, Callable, Optional
+
+import discord
+
+from bot.constants import Month
+from bot.utils import resolve_current_month
+
+log = logging.getLogger(__name__)
+
+# For each event which can be filtered, how to get the channel ID, the user and the guild from its arguments
+EVENT_CONTEXT: dict[str, Callable[..., tuple[int, discord.abc.User, Optional[discord.Guild]]]] = {
+    "on_message": lambda message: (message.channel.id, message.author, message.guild),
+    "on_message_edit": lambda _, after: (after.channel.id, after.author, after.guild),
+    "on_message_delete": lambda message: (message.channel.id, message.author, message.guild),
+    "on_reaction_add": lambda reaction, user: (reaction.message.channel.id, user, reaction.message.guild),
+    "on_reaction_remove": lambda reaction, user: (reaction.message.channel.id, user, reaction.message.guild),
+}
+
+
+class ListenerFilter:
+    """The events a listener wants to be called for, checked before the listener's coroutine is created."""
+
+    __slots__ = ("channels", "months", "ignore_bots", "ignore_dms")
+
+    def __init__(
+        self,
+        channels: Optional[Iterable[int]],
+        months: Optional[Iterable[Month]],
+        ignore_bots: bool,
+        ignore_dms: bool
+    ):
+        self.channels = frozenset(channels) if channels is not None else None
+        self.months = frozenset(months) if months is not None else None
+        self.ignore_bots = ignore_bots
+        self.ignore_dms = ignore_dms
+
+    def allows(self, event_name: str, args: tuple) -> bool:
+        """Whether the listener should be called for the event with these arguments."""
+        get_context = EVENT_CONTEXT.get(event_name)
+        if get_context is None:
+            # Only the month can be checked without knowing what the arguments are
+            return self.months is None or resolve_current_month() in self.months
+
+        channel_id, user, guild = get_context(*args)
+        return (
+            (self.channels is None or channel_id in self.channels)
+            and not (self.ignore_bots and user.bot)
+            and not (self.ignore_dms and guild is None)
+            and (self.months is None or resolve_current_month() in self.months)
+        )
+
+
+def listener_filter(
+    *,
+    channels: Optional[Iterable[int]] = None,
+    months: Optional[Iterable[Month]] = None,
+    ignore_bots: bool = False,
+    ignore_dms: bool = False
+) -> Callable:
+    """
+    Only call the decorated listener for events in `channels`, during `months`, and optionally not from bots or DMs.
+
+    Unlike checking these in the listener itself, or guarding it with `in_month`, events which don't pass are
+    dropped by the bot before the listener's coroutine is ever created. The channel, bot and DM filters apply to
+    the events in `EVENT_CONTEXT`, and only the month is checked for any other event.
+    """
+    def decorator(listener: Callable) -> Callable:
+        listener.__listener_filter__ = ListenerFilter(channels, months, ignore_bots, ignore_dms)
+        return listener
+    return decorator
+
+
+class ListenerStats:
+    """Counts how many times each listener was dispatched to, and how many of those were skipped by its filter."""
+
+    def __init__(self):
+        self.dispatched = Counter()
+        self.skipped = Counter()
+
+    def record(self, listener: str, skipped: bool) -> None:
+        """Count a dispatch to `listener`."""
+        self.dispatched[listener] += 1
+        if skipped:
+            self.skipped[listener] += 1
+
+    @property
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """How often each listener was dispatched to and skipped, from most dispatched to least."""
+        return {
+            listener: {
+                "dispatched": dispatched,
+                "skipped": self.skipped[listener],
+                "skip_rate": f"{self.skipped[listener] / dispatched:.1%}",
+            }
+            for listener, dispatched in self.dispatched.most_common()
+        }
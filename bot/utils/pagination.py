@@ -8,6 +8,7 @@ from discord.abc import User
 from discord.ext.commands import Context, Paginator
 
 from bot.constants import Emojis
+from bot.utils.ui_updates import wait_for_edit
 
 FIRST_EMOJI = "\u23EE"   # [:track_previous:]
 LEFT_EMOJI = "\u2B05"    # [:arrow_left:]
@@ -187,14 +188,16 @@ class LinePaginator(Paginator):
 
         log.debug("Adding emoji reactions to message...")
 
-        for emoji in PAGINATION_EMOJI:
-            # Add all the applicable emoji to the message
-            log.trace(f"Adding reaction: {repr(emoji)}")
-            await message.add_reaction(emoji)
+        # Add all the applicable emoji to the message
+        await ctx.bot.ui_updates.add_reactions(message, PAGINATION_EMOJI)
+
+        last_edit = None
 
         while True:
             try:
-                reaction, user = await ctx.bot.wait_for("reaction_add", timeout=timeout, check=event_check)
+                reaction, user = await ctx.bot.waiters.wait_for(
+                    "reaction_add", timeout=timeout, check=event_check, message_id=message.id
+                )
                 log.trace(f"Got reaction: {reaction}")
             except asyncio.TimeoutError:
                 log.debug("Timed out waiting for a reaction")
@@ -202,6 +205,7 @@ class LinePaginator(Paginator):
 
             if str(reaction.emoji) == DELETE_EMOJI:  # Note: DELETE_EMOJI is a string and not unicode
                 log.debug("Got delete reaction")
+                await wait_for_edit(last_edit)
                 return await message.delete()
 
             if reaction.emoji == FIRST_EMOJI:
@@ -215,7 +219,7 @@ class LinePaginator(Paginator):
                     embed.set_footer(text=f"{footer_text} (Page {current_page + 1}/{len(paginator.pages)})")
                 else:
                     embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
-                await message.edit(embed=embed)
+                last_edit = ctx.bot.ui_updates.edit(message, embed=embed)
 
             if reaction.emoji == LAST_EMOJI:
                 await message.remove_reaction(reaction.emoji, user)
@@ -228,7 +232,7 @@ class LinePaginator(Paginator):
                     embed.set_footer(text=f"{footer_text} (Page {current_page + 1}/{len(paginator.pages)})")
                 else:
                     embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
-                await message.edit(embed=embed)
+                last_edit = ctx.bot.ui_updates.edit(message, embed=embed)
 
             if reaction.emoji == LEFT_EMOJI:
                 await message.remove_reaction(reaction.emoji, user)
@@ -247,7 +251,7 @@ class LinePaginator(Paginator):
                 else:
                     embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
 
-                await message.edit(embed=embed)
+                last_edit = ctx.bot.ui_updates.edit(message, embed=embed)
 
             if reaction.emoji == RIGHT_EMOJI:
                 await message.remove_reaction(reaction.emoji, user)
@@ -266,9 +270,10 @@ class LinePaginator(Paginator):
                 else:
                     embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
 
-                await message.edit(embed=embed)
+                last_edit = ctx.bot.ui_updates.edit(message, embed=embed)
 
         log.debug("Ending pagination and clearing reactions...")
+        await wait_for_edit(last_edit)
         await message.clear_reactions()
 
 
@@ -363,13 +368,15 @@ class ImagePaginator(Paginator):
         embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
         message = await ctx.send(embed=embed)
 
-        for emoji in PAGINATION_EMOJI:
-            await message.add_reaction(emoji)
+        await ctx.bot.ui_updates.add_reactions(message, PAGINATION_EMOJI)
 
+        last_edit = None
         while True:
             # Start waiting for reactions
             try:
-                reaction, user = await ctx.bot.wait_for("reaction_add", timeout=timeout, check=check_event)
+                reaction, user = await ctx.bot.waiters.wait_for(
+                    "reaction_add", timeout=timeout, check=check_event, message_id=message.id
+                )
             except asyncio.TimeoutError:
                 log.debug("Timed out waiting for a reaction")
                 break  # We're done, no reactions for the last 5 minutes
@@ -380,6 +387,7 @@ class ImagePaginator(Paginator):
             # Delete reaction press - [:trashcan:]
             if str(reaction.emoji) == DELETE_EMOJI:  # Note: DELETE_EMOJI is a string and not unicode
                 log.debug("Got delete reaction")
+                await wait_for_edit(last_edit)
                 return await message.delete()
 
             # First reaction press - [:track_previous:]
@@ -427,7 +435,8 @@ class ImagePaginator(Paginator):
             embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
             log.debug(f"Got {reaction_type} page reaction - changing to page {current_page + 1}/{len(paginator.pages)}")
 
-            await message.edit(embed=embed)
+            last_edit = ctx.bot.ui_updates.edit(message, embed=embed)
 
         log.debug("Ending pagination and clearing reactions...")
+        await wait_for_edit(last_edit)
         await message.clear_reactions()
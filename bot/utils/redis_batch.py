@@ -0,0 +1,224 @@
+import asyncio
+import logging
+from collections.abc import ItemsView
+from typing import Optional, Union
+
+from async_rediscache import RedisCache
+from async_rediscache.types.base import RedisKeyType, RedisValueType
+from botcore.utils import scheduling
+from redis import RedisError
+
+from bot import constants
+
+log = logging.getLogger(__name__)
+
+# A buffered write, which is one of ("set", value), ("increment", amount) or ("delete", None)
+PendingWrite = tuple[str, Optional[RedisValueType]]
+
+
+def _merge(previous: Optional[PendingWrite], new: PendingWrite) -> PendingWrite:
+    """Combine two writes to the same key into one, as if `new` was made after `previous`."""
+    op, value = new
+    if previous is None or op != "increment":
+        return new
+
+    previous_op, previous_value = previous
+    if previous_op == "delete":
+        # Incrementing a key which doesn't exist starts it from 0
+        return "set", value
+    return previous_op, previous_value + value
+
+
+def _apply(value: Optional[RedisValueType], pending: Optional[PendingWrite]) -> Optional[RedisValueType]:
+    """Return what `value` will be once the `pending` write to it is flushed."""
+    if pending is None:
+        return value
+
+    op, pending_value = pending
+    if op == "set":
+        return pending_value
+    if op == "delete":
+        return None
+    return (value or 0) + pending_value
+
+
+class _CacheInternals:
+    """
+    The private parts of a `RedisCache` needed to write to it in a pipeline, in the same format it does.
+
+    They're all reached through here so that an async-rediscache upgrade which changes them fails loudly,
+    as soon as a `BatchedRedisCache` is created, rather than partway through a flush.
+    """
+
+    REQUIRED = (
+        "_load_script",
+        "_key_to_typestring",
+        "_value_to_typestring",
+        "_dict_to_typestring",
+        "_maybe_value_from_typestring",
+    )
+
+    def __init__(self, cache: RedisCache):
+        missing = [name for name in self.REQUIRED if not callable(getattr(cache, name, None))]
+        if missing:
+            raise RuntimeError(
+                f"This version of async-rediscache's RedisCache is missing {', '.join(missing)}, "
+                "which batched writes depend on."
+            )
+        self.cache = cache
+
+    def key(self, key: RedisKeyType) -> str:
+        """Return `key` as the typestring it's stored under."""
+        return self.cache._key_to_typestring(key)
+
+    def value(self, value: RedisValueType) -> str:
+        """Return `value` as the typestring it's stored as."""
+        return self.cache._value_to_typestring(value)
+
+    def mapping(self, mapping: dict[RedisKeyType, RedisValueType]) -> dict[str, str]:
+        """Return `mapping` with its keys and values as typestrings."""
+        return self.cache._dict_to_typestring(mapping)
+
+    async def increment_script(self) -> str:
+        """Load the cache's increment script, returning its digest."""
+        return await self.cache._load_script("rediscache_increment.lua")
+
+    def increment_result(self, result: Optional[Union[bytes, str]]) -> RedisValueType:
+        """
+        Return the new value from the increment script's `result`.
+
+        The script reports a failure by returning it as a string rather than erroring, so it's raised here as
+        the `TypeError` or `ValueError` that `RedisCache.increment` would raise.
+        """
+        return self.cache._maybe_value_from_typestring(result)
+
+
+class BatchedRedisCache:
+    """
+    Buffers writes to a `RedisCache`, flushing them together in a single pipeline after a short window.
+
+    Writes to the same key within the window are merged, so a burst of increments becomes a single one.
+    Reads made through this class take buffered writes into account, but reads made on the cache itself
+    won't see them until they're flushed. `close` should be called when the owner is unloaded, so that
+    nothing still buffered is lost.
+    """
+
+    def __init__(self, cache: RedisCache, window: float = constants.RedisConfig.batch_window):
+        self.cache = cache
+        self.window = window
+        self._internals = _CacheInternals(cache)
+
+        self._pending: dict[RedisKeyType, PendingWrite] = {}
+        # Held while flushing, so that reads never see a write both in Redis and in the buffer, or in neither.
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def _buffer(self, key: RedisKeyType, write: PendingWrite) -> None:
+        self._pending[key] = _merge(self._pending.get(key), write)
+
+        if not self._flush_task or self._flush_task.done():
+            self._flush_task = scheduling.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        # Keep going while there are writes left, which were either buffered during a flush or failed to flush.
+        while self._pending:
+            await asyncio.sleep(self.window)
+            # Shielded so that `close` cancelling this task can't interrupt a flush halfway through.
+            await asyncio.shield(self.flush())
+
+    async def set(self, key: RedisKeyType, value: RedisValueType) -> None:
+        """Set `key` to `value`."""
+        self._buffer(key, ("set", value))
+
+    async def delete(self, key: RedisKeyType) -> None:
+        """Delete `key`, if it exists."""
+        self._buffer(key, ("delete", None))
+
+    async def increment(self, key: RedisKeyType, amount: float = 1) -> None:
+        """Increment the value of `key` by `amount`, treating a missing key as 0."""
+        if type(amount) not in (int, float):
+            raise TypeError("the increment amount must be an `int` or `float`.")
+
+        self._buffer(key, ("increment", amount))
+
+    async def decrement(self, key: RedisKeyType, amount: float = 1) -> None:
+        """Decrement the value of `key` by `amount`, treating a missing key as 0."""
+        await self.increment(key, -amount)
+
+    async def get(self, key: RedisKeyType, default: Optional[RedisValueType] = None) -> Optional[RedisValueType]:
+        """Get the value of `key`, or `default` if it isn't set."""
+        pending = self._pending.get(key)
+        if pending and pending[0] != "increment":
+            value = _apply(None, pending)
+        else:
+            async with self._lock:
+                value = _apply(await self.cache.get(key), self._pending.get(key))
+
+        return default if value is None else value
+
+    async def contains(self, key: RedisKeyType) -> bool:
+        """Return whether `key` is set."""
+        return await self.get(key) is not None
+
+    async def items(self) -> ItemsView:
+        """Get every key and value in one round-trip, such as for building a leaderboard."""
+        async with self._lock:
+            items = dict(await self.cache.items())
+            for key, pending in self._pending.items():
+                value = _apply(items.get(key), pending)
+                if value is None:
+                    items.pop(key, None)
+                else:
+                    items[key] = value
+
+        return items.items()
+
+    async def flush(self) -> None:
+        """Write everything that's buffered to Redis in a single pipeline."""
+        async with self._lock:
+            if not self._pending:
+                return
+
+            pending, self._pending = self._pending, {}
+            try:
+                await self._execute(pending)
+            except RedisError:
+                log.exception(f"Failed to flush {len(pending)} writes to {self.cache.namespace}, retrying later.")
+                for key, write in pending.items():
+                    self._pending[key] = _merge(write, self._pending[key]) if key in self._pending else write
+            else:
+                log.trace(f"Flushed {len(pending)} writes to {self.cache.namespace}.")
+
+    async def _execute(self, pending: dict[RedisKeyType, PendingWrite]) -> None:
+        # The cache stores keys and values as typestrings, so increments have to go through its own script
+        # rather than HINCRBY, to stay compatible with what's already stored.
+        cache, internals = self.cache, self._internals
+        sets = {key: value for key, (op, value) in pending.items() if op == "set"}
+        deletes = [internals.key(key) for key, (op, _) in pending.items() if op == "delete"]
+        increments = {key: value for key, (op, value) in pending.items() if op == "increment"}
+
+        if increments:
+            increment_script = await internals.increment_script()
+
+        async with cache.redis_session.client.pipeline(transaction=False) as pipeline:
+            if sets:
+                pipeline.hset(cache.namespace, mapping=internals.mapping(sets))
+            if deletes:
+                pipeline.hdel(cache.namespace, *deletes)
+            for key, amount in increments.items():
+                pipeline.evalsha(increment_script, 2, cache.namespace, internals.key(key), internals.value(amount))
+            results = await pipeline.execute()
+
+        # The increments were queued last, so their results are at the end.
+        # A failed one can't succeed on a retry, as the stored value is the problem, so it's only logged.
+        for key, result in zip(increments, results[len(results) - len(increments):]):
+            try:
+                internals.increment_result(result)
+            except (TypeError, ValueError) as e:
+                log.error(f"Failed to increment {key!r} in {cache.namespace}: {e}")
+
+    async def close(self) -> None:
+        """Stop waiting for the window to pass, and flush anything that's buffered straight away."""
+        if self._flush_task:
+            self._flush_task.cancel()
+        await self.flush()
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import time
+from collections.abc import Container
+from datetime import datetime, timezone
+from typing import Optional
+
+from bot.constants import Client, Month
+
+log = logging.getLogger(__name__)
+
+
+def _month_start(year: int, month: int) -> float:
+    """Return the timestamp of the start of `month` in `year`, in UTC, wrapping months past December."""
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=timezone.utc).timestamp()
+
+
+class SeasonClock:
+    """
+    Keeps track of the current month, which is only worked out again once the month has ended.
+
+    Seasonal commands, listeners and tasks all read the cached month, rather than each getting the date.
+    Tasks waiting for a season sleep until its first month starts, rather than checking the month periodically.
+    """
+
+    def __init__(self, month_override: Optional[int] = Client.month_override):
+        self.month_override = Month(month_override) if month_override is not None else None
+
+        self._month: Optional[Month] = None
+        self._year = 0
+        # The timestamp at which the cached month ends
+        self._rollover = 0.0
+
+    @property
+    def current_month(self) -> Month:
+        """The current month, or the configured override if there is one."""
+        if self.month_override is not None:
+            return self.month_override
+
+        now = time.time()
+        if now >= self._rollover:
+            today = datetime.fromtimestamp(now, timezone.utc)
+            self._month, self._year = Month(today.month), today.year
+            self._rollover = _month_start(today.year, today.month + 1)
+            log.debug(f"Season clock rolled over to {self._month!s}")
+
+        return self._month
+
+    def seconds_until(self, months: Container[Month]) -> Optional[float]:
+        """
+        Return how long it is until one of `months` starts, which is 0 if it's already one of them.
+
+        None is returned if none of `months` will ever come, because the month is overridden to another.
+        """
+        current = self.current_month
+        if current in months:
+            return 0
+        if self.month_override is not None:
+            return None
+
+        for offset in range(1, 12):
+            if Month((current - 1 + offset) % 12 + 1) in months:
+                return max(_month_start(self._year, current + offset) - time.time(), 0)
+
+        # `months` is empty
+        return None
+
+    async def wait_for(self, months: Container[Month]) -> None:
+        """Sleep until it's one of `months`, returning straight away if it already is."""
+        while (delay := self.seconds_until(months)) != 0:
+            if delay is None:
+                # Nothing can change the override, so this waits forever
+                await asyncio.Future()
+            await asyncio.sleep(delay)
+
+
+season_clock = SeasonClock()
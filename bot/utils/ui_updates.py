@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from typing import Any, Optional, Union
+
+import discord
+from botcore.utils import scheduling
+
+log = logging.getLogger(__name__)
+
+# How long to wait for more edits to a message before sending them as one, in seconds
+EDIT_WINDOW = 0.25
+
+# How far apart reactions added in the same channel are spaced, in seconds, to stay within Discord's rate limit
+REACTION_INTERVAL = 0.25
+
+
+async def wait_for_edit(edit: Optional[asyncio.Future]) -> None:
+    """
+    Wait until `edit`, returned by `UIUpdateScheduler.edit`, has been sent or has failed.
+
+    Errors aren't raised, as they've already been logged. This should be awaited before deleting the message or
+    clearing its reactions, so that the edit doesn't land afterwards.
+    """
+    if edit is not None:
+        await asyncio.wait((edit,))
+
+
+class _PendingEdit:
+    """An edit to a message which is waiting to be sent, made up of every change requested within the window."""
+
+    __slots__ = ("message", "fields", "future")
+
+    def __init__(self, message: discord.Message, future: asyncio.Future):
+        self.message = message
+        self.fields: dict[str, Any] = {}
+        self.future = future
+
+
+class UIUpdateScheduler:
+    """
+    Sends the message edits and reactions that games and paginators make to update what they display.
+
+    Edits to a message made within `EDIT_WINDOW` of each other are combined, so only the latest state is sent.
+    Reactions are added in order and spaced out per channel, so that several games setting up at once in the same
+    channel don't run into the rate limit.
+    """
+
+    def __init__(self, edit_window: float = EDIT_WINDOW, reaction_interval: float = REACTION_INTERVAL):
+        self.edit_window = edit_window
+        self.reaction_interval = reaction_interval
+
+        self._edits: dict[int, _PendingEdit] = {}
+        # The time each channel can next have a reaction added to one of its messages
+        self._next_reaction: dict[int, float] = {}
+
+        self.edits_requested = 0
+        self.edits_sent = 0
+        self.reactions_sent = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Counters for how many edits were requested and sent, and how many reactions were added."""
+        return {
+            "edits_requested": self.edits_requested,
+            "edits_sent": self.edits_sent,
+            "edits_pending": len(self._edits),
+            "reactions_sent": self.reactions_sent,
+        }
+
+    def edit(self, message: discord.Message, **fields: Any) -> asyncio.Future:
+        """
+        Edit `message` with the given fields once the window has passed, combined with any other edits made to it.
+
+        The returned future is done once the edit has been sent, and only needs to be awaited when something
+        depends on the edit having been made, such as deleting the message or sending a message which should come
+        after it. Any error sending it is logged whether or not it's awaited, and the future is cancelled if the
+        edit is.
+        """
+        self.edits_requested += 1
+
+        pending = self._edits.get(message.id)
+        if pending is None:
+            future = asyncio.get_running_loop().create_future()
+            future.add_done_callback(self._log_error)
+            pending = self._edits[message.id] = _PendingEdit(message, future)
+            scheduling.create_task(self._send_edit(message.id))
+
+        pending.message = message
+        pending.fields.update(fields)
+        return pending.future
+
+    async def _send_edit(self, message_id: int) -> None:
+        try:
+            await asyncio.sleep(self.edit_window)
+        except asyncio.CancelledError:
+            self._edits.pop(message_id).future.cancel()
+            raise
+
+        # Edits requested from here on are sent separately, after this one
+        pending = self._edits.pop(message_id)
+
+        try:
+            edited = await pending.message.edit(**pending.fields)
+        except asyncio.CancelledError:
+            pending.future.cancel()
+            raise
+        except Exception as e:
+            pending.future.set_exception(e)
+        else:
+            self.edits_sent += 1
+            pending.future.set_result(edited)
+
+    @staticmethod
+    def _log_error(future: asyncio.Future) -> None:
+        if not future.cancelled() and (error := future.exception()):
+            log.warning(f"Failed to edit a message: {error}")
+
+    async def add_reactions(self, message: discord.Message, emojis: Iterable[Union[str, discord.Emoji]]) -> None:
+        """Add each of `emojis` to `message` in order, spaced out with other reactions added in the same channel."""
+        channel_id = message.channel.id
+        for emoji in emojis:
+            # The slot is claimed before waiting for it, so concurrent callers each get their own
+            now = time.monotonic()
+            slot = max(now, self._next_reaction.get(channel_id, 0))
+            self._next_reaction[channel_id] = slot + self.reaction_interval
+
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            await message.add_reaction(emoji)
+            self.reactions_sent += 1
+
+        if self._next_reaction.get(channel_id, 0) < time.monotonic():
+            self._next_reaction.pop(channel_id, None)
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from typing import Any, Awaitable, Callable, Optional
+
+import discord
+from botcore.utils import scheduling
+from discord.ext import commands
+
+log = logging.getLogger(__name__)
+
+# The IDs each supported event can be matched on, taken from the event's arguments
+EVENT_KEYS: dict[str, Callable[..., dict[str, int]]] = {
+    "message": lambda message: {
+        "message_id": message.id,
+        "channel_id": message.channel.id,
+        "user_id": message.author.id,
+    },
+    "message_delete": lambda message: {
+        "message_id": message.id,
+        "channel_id": message.channel.id,
+        "user_id": message.author.id,
+    },
+    "reaction_add": lambda reaction, user: {
+        "message_id": reaction.message.id,
+        "channel_id": reaction.message.channel.id,
+        "user_id": user.id,
+    },
+}
+
+# Listeners are indexed by whichever of their IDs is likely to match the fewest events
+INDEX_ORDER = ("message_id", "user_id", "channel_id")
+
+
+class Listener:
+    """A listener for an event, matching only events with the given IDs which also pass its `check`."""
+
+    __slots__ = ("event", "ids", "check", "callback", "future")
+
+    def __init__(
+        self,
+        event: str,
+        ids: dict[str, int],
+        check: Optional[Callable[..., bool]],
+        callback: Optional[Callable[..., Awaitable[None]]] = None,
+        future: Optional[asyncio.Future] = None
+    ):
+        self.event = event
+        self.ids = ids
+        self.check = check
+        self.callback = callback
+        self.future = future
+
+    @property
+    def index_key(self) -> Optional[tuple[str, str, int]]:
+        """The key this listener is indexed under, or None if it has no IDs to match on."""
+        for name in INDEX_ORDER:
+            if name in self.ids:
+                return self.event, name, self.ids[name]
+        return None
+
+
+class WaiterRegistry:
+    """
+    Routes message and reaction events to the listeners waiting on them, indexed by message, user and channel ID.
+
+    Unlike `Bot.wait_for`, which runs every waiter's check against every event, an event is only checked against
+    listeners indexed under one of its IDs. Listeners without any IDs to match on are still checked against every
+    event of their type, so giving at least one ID is what makes this cheaper.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self._index: defaultdict[tuple[str, str, int], dict[Listener, None]] = defaultdict(dict)
+        self._unindexed: defaultdict[str, dict[Listener, None]] = defaultdict(dict)
+
+        self.dispatched = Counter()
+        self.checked = Counter()
+        self.matched = Counter()
+
+        bot.add_listener(self.on_message)
+        bot.add_listener(self.on_message_delete)
+        bot.add_listener(self.on_reaction_add)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Counters for how many listeners there are, and how many were looked at for each type of event."""
+        waiting = Counter()
+        for (event, _, _), listeners in self._index.items():
+            waiting[event] += len(listeners)
+        for event, listeners in self._unindexed.items():
+            waiting[event] += len(listeners)
+
+        return {
+            "waiting": dict(waiting),
+            "unindexed": {event: len(listeners) for event, listeners in self._unindexed.items()},
+            "dispatched": dict(self.dispatched),
+            "checked": dict(self.checked),
+            "matched": dict(self.matched),
+        }
+
+    def _add(self, listener: Listener) -> None:
+        if listener.event not in EVENT_KEYS:
+            raise ValueError(f"Can't listen for {listener.event!r}, expected one of {', '.join(EVENT_KEYS)}.")
+        if unknown := set(listener.ids) - set(INDEX_ORDER):
+            raise ValueError(f"Can't match on {', '.join(unknown)}, expected any of {', '.join(INDEX_ORDER)}.")
+
+        if key := listener.index_key:
+            self._index[key][listener] = None
+        else:
+            self._unindexed[listener.event][listener] = None
+
+    def remove(self, listener: Listener) -> None:
+        """Stop a listener from receiving any more events."""
+        if key := listener.index_key:
+            bucket = self._index.get(key, {})
+            bucket.pop(listener, None)
+            if not bucket:
+                self._index.pop(key, None)
+        else:
+            self._unindexed[listener.event].pop(listener, None)
+
+    def subscribe(
+        self,
+        event: str,
+        callback: Callable[..., Awaitable[None]],
+        *,
+        check: Optional[Callable[..., bool]] = None,
+        **ids: int
+    ) -> Listener:
+        """
+        Call `callback` with the arguments of every `event` which matches the given IDs and passes `check`.
+
+        The IDs can be any of `message_id`, `channel_id` and `user_id`. The returned listener should be passed
+        to `remove` once the callback is no longer needed.
+        """
+        listener = Listener(event, ids, check, callback=callback)
+        self._add(listener)
+        return listener
+
+    async def wait_for(
+        self,
+        event: str,
+        *,
+        check: Optional[Callable[..., bool]] = None,
+        timeout: Optional[float] = None,
+        **ids: int
+    ) -> Any:
+        """
+        Wait for the next `event` which matches the given IDs and passes `check`, like `Bot.wait_for`.
+
+        The IDs can be any of `message_id`, `channel_id` and `user_id`. An `asyncio.TimeoutError` is raised if no
+        matching event happens within `timeout` seconds.
+        """
+        future = asyncio.get_running_loop().create_future()
+        listener = Listener(event, ids, check, future=future)
+        self._add(listener)
+        try:
+            args = await asyncio.wait_for(future, timeout)
+        finally:
+            self.remove(listener)
+
+        return args[0] if len(args) == 1 else args
+
+    def _dispatch(self, event: str, *args) -> None:
+        self.dispatched[event] += 1
+        ids = EVENT_KEYS[event](*args)
+
+        candidates = dict(self._unindexed.get(event, {}))
+        for name, value in ids.items():
+            candidates.update(self._index.get((event, name, value), {}))
+
+        for listener in candidates:
+            self.checked[event] += 1
+            if listener.future and listener.future.done():
+                continue
+            if any(ids[name] != value for name, value in listener.ids.items()):
+                continue
+
+            try:
+                if listener.check and not listener.check(*args):
+                    continue
+            except Exception as e:
+                if listener.future:
+                    listener.future.set_exception(e)
+                else:
+                    log.exception(f"Error checking a listener for {event}.")
+                continue
+
+            self.matched[event] += 1
+            if listener.future:
+                listener.future.set_result(args)
+            else:
+                scheduling.create_task(listener.callback(*args))
+
+    async def on_message(self, message: discord.Message) -> None:
+        """Route messages to their listeners."""
+        self._dispatch("message", message)
+
+    async def on_message_delete(self, message: discord.Message) -> None:
+        """Route deleted messages to their listeners."""
+        self._dispatch("message_delete", message)
+
+    async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User) -> None:
+        """Route added reactions to their listeners."""
+        self._dispatch("reaction_add", reaction, user)